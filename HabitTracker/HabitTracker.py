@@ -8,6 +8,11 @@ from model.HabitModel import HabitModel
 from controller.HabitController import HabitController
 from controller.ReportController import ReportController
 from view.ConsoleView import ConsoleView
+from view.CommandLineView import CLI_COMMANDS, positive_int
+from utils.LogSetup import get_logger, setup_logging, LOG_LEVEL_ENV
+from utils.Profiler import get_profiler, configure_profiler, PROFILE_DIR
+
+logger = get_logger(__name__)
 
 # --- CONFIGURAÇÃO E PERSISTÊNCIA (Arquivos Locais) ---
 USER_FILE = "usuarios.json"
@@ -98,9 +103,17 @@ def run_main_menu(console_view, report_controller):
         print("6. Gerar Relatórios Padrão (Diário, Semanal, Mensal) (R3)")
         print("7. Gerar Relatório Personalizado por Período (R3)")
         print("8. Exportar Relatório em PDF")
-        print("9. Sair")
+        print("9. Compactar Dados")
+        print("10. Ver Hábitos Arquivados")
+        print("11. Exportar Dados (CSV/NDJSON/HTML)")
+        print("12. Ver Métricas de Desempenho")
+        print("13. Sair")
         
-        choice = input("Escolha uma opção (1-9): ")
+        choice = input("Escolha uma opção (1-13): ")
+
+        if choice == '13':
+            print("Saindo do Habit Tracker. Volte sempre!")
+            break
 
         if choice == '1':
             habits = console_view.habit_controller.handle_read_habits_request()
@@ -120,8 +133,13 @@ def run_main_menu(console_view, report_controller):
         elif choice == '8':
             console_view.handle_export_pdf_input()
         elif choice == '9':
-            print("Saindo do Habit Tracker. Volte sempre!")
-            break
+            console_view.handle_vacuum_input()
+        elif choice == '10':
+            console_view.handle_archived_habits_input()
+        elif choice == '11':
+            console_view.handle_export_data_input(report_controller)
+        elif choice == '12':
+            console_view.handle_metrics_input()
         else:
             console_view.show_error("Opção inválida. Tente novamente.")
 
@@ -145,8 +163,6 @@ def run_app_gui():
     
     user_model = UserModel()
     
-    print(f"[HabitTracker.py] Usuários cadastrados: {list(user_model.users.keys())}")
-    
     login_window = LoginWindow(user_model)
     authenticated = login_window.run()
     
@@ -154,26 +170,142 @@ def run_app_gui():
         print("❌ Login cancelado.")
         return
     
-    print(f"[SUCESSO] Usuário autenticado: {user_model.get_logged_in_username()}")
-    print(f"   ID: {user_model.get_logged_in_user_id()}")
+    logger.info("Usuário autenticado: %s (ID: %s)",
+                user_model.get_logged_in_username(), user_model.get_logged_in_user_id())
     
     report_view, habit_controller, report_controller = setup_architecture(user_model, view_type='gui')
     
-    # DEBUG: Verificar hábitos carregados
-    habits = habit_controller.handle_read_habits_request()
-    print(f"[INFO] Hábitos carregados: {len(habits)}")
-    for i, h in enumerate(habits):
-        print(f"   {i+1}. {h.get('name')} (ID: {h.get('id')})")
-    
     main_window = MainWindow(habit_controller, user_model)
-    main_window.run()
+    # Alterações de outros processos (console, servidor, sincronização) aparecem na janela aberta
+    watcher = habit_controller.model.watch_external_changes()
+    try:
+        main_window.run()
+    finally:
+        watcher.stop()
+
+
+def run_vacuum(argv):
+    """Função de entrada para o subcomando 'vacuum' (compactação dos dados)."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="HabitTracker.py vacuum",
+        description="Remove registros falsos do histórico e arquiva hábitos inativos antigos."
+    )
+    parser.add_argument(
+        "--archive-days", type=int, default=None,
+        help="Arquiva hábitos inativos há mais de N dias (padrão: não arquivar)"
+    )
+    args = parser.parse_args(argv)
+
+    user_model = UserModel()
+    habit_model = HabitModel(user_model)
+    stats = habit_model.vacuum(args.archive_days)
+    ConsoleView(None, user_model).display_vacuum_stats(stats)
+
+
+def run_export_all(argv):
+    """Função de entrada para o subcomando 'export-all' (PDFs em lote)."""
+    import argparse
+    from view.PDFBatchExporter import PDFBatchExporter
+
+    parser = argparse.ArgumentParser(
+        prog="HabitTracker.py export-all",
+        description="Exporta relatórios PDF de todos os hábitos (de todos os usuários ou de um só)."
+    )
+    parser.add_argument("--out", default="relatorios_pdf", help="Diretório de saída")
+    parser.add_argument("--user", default=None, help="Exporta apenas os hábitos deste usuário")
+    parser.add_argument("--merged", action="store_true", help="Gera um único PDF por usuário")
+    parser.add_argument("--full-history", action="store_true",
+                        help="Inclui o histórico completo em cada PDF (uma tabela por mês)")
+    parser.add_argument("--workers", type=positive_int, default=None, help="Número de processos (padrão: núcleos)")
+    args = parser.parse_args(argv)
+
+    user_model = UserModel()
+    habit_model = HabitModel(user_model)
+    habits_by_user = habit_model.data
+    if args.user is not None:
+        habits_by_user = {args.user: habit_model.data.get(args.user, [])}
+
+    stats = PDFBatchExporter(args.workers).export_all(habits_by_user, args.out, merged=args.merged,
+                                                      full_history=args.full_history)
+    ConsoleView(None, user_model).display_batch_export_stats(stats)
+
+
+def run_app_server(argv):
+    """Função de entrada para o subcomando 'serve' (API HTTP/JSON para vários clientes)."""
+    import argparse
+    import asyncio
+    from view.APIServer import (APIServer, DEFAULT_HOST, DEFAULT_PORT, PIPELINE_LIMIT, KEEPALIVE_TIMEOUT,
+                                MODEL_WORKERS)
+
+    parser = argparse.ArgumentParser(
+        prog="HabitTracker.py serve",
+        description="Serve os hábitos e relatórios por HTTP/JSON (autenticação HTTP Basic)."
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Endereço (padrão: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Porta (padrão: {DEFAULT_PORT})")
+    parser.add_argument("--report-workers", type=int, default=None,
+                        help="Processos para relatórios (padrão: núcleos; 0 = sem pool)")
+    parser.add_argument("--model-workers", type=int, default=MODEL_WORKERS,
+                        help="Threads para as operações sobre os hábitos")
+    parser.add_argument("--pipeline-limit", type=int, default=PIPELINE_LIMIT,
+                        help="Requisições em processamento por conexão")
+    parser.add_argument("--keepalive-timeout", type=float, default=KEEPALIVE_TIMEOUT,
+                        help="Segundos de espera por uma nova requisição na mesma conexão")
+    args = parser.parse_args(argv)
+
+    user_model = UserModel()
+    habit_model = HabitModel(user_model)
+    habit_controller = HabitController(habit_model)
+    server = APIServer(habit_controller, user_model, args.host, args.port, args.report_workers,
+                       args.model_workers, args.pipeline_limit, args.keepalive_timeout)
+
+    async def serve():
+        await server.start()
+        print(f"🌐 API do Habit Tracker em http://{args.host}:{server.port} (Ctrl+C para encerrar)")
+        await server.serve_forever()
+
+    # Leituras refletem as gravações de outros processos sem esperar a próxima escrita
+    watcher = habit_model.watch_external_changes()
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        print("Servidor encerrado.")
+    finally:
+        watcher.stop()
+
+
+def run_app_cli(argv):
+    """Função de entrada dos comandos não interativos (habit, report, export, token, batch)."""
+    from view.CommandLineView import run_cli
+    return run_cli(argv)
 
 
 if __name__ == "__main__":
     # Permite escolher qual interface usar
     import sys
     
-    if len(sys.argv) > 1 and sys.argv[1] == '--gui':
+    args = sys.argv[1:]
+    # --profile[=DIR]: perfila cada ação (o mesmo que HABITTRACKER_PROFILE=DIR)
+    for arg in list(args):
+        if arg == '--profile' or arg.startswith('--profile='):
+            args.remove(arg)
+            configure_profiler(arg.partition('=')[2] or PROFILE_DIR)
+    
+    # Nível em HABITTRACKER_LOG_LEVEL (padrão: WARNING; INFO ao perfilar, para mostrar as funções mais caras)
+    profiling = get_profiler().enabled and LOG_LEVEL_ENV not in os.environ
+    setup_logging("INFO" if profiling else None)
+    
+    if args and args[0] == '--gui':
         run_app_gui()
+    elif args and args[0] == 'vacuum':
+        run_vacuum(args[1:])
+    elif args and args[0] == 'export-all':
+        run_export_all(args[1:])
+    elif args and args[0] == 'serve':
+        run_app_server(args[1:])
+    elif args and args[0] in CLI_COMMANDS:
+        sys.exit(run_app_cli(args))
     else:
         run_app_console()
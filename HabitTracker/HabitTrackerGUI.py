@@ -3,6 +3,8 @@ Ponto de entrada simplificado para a interface gráfica.
 Apenas chama a função run_app_gui() do HabitTracker.py
 """
 from HabitTracker import run_app_gui
+from utils.LogSetup import setup_logging
 
 if __name__ == "__main__":
+    setup_logging()
     run_app_gui()
\ No newline at end of file
@@ -1,51 +1,101 @@
+import logging
+
+from utils.LogSetup import get_logger
+from utils.Metrics import timed
+from utils.Profiler import profiled
+
+logger = get_logger(__name__)
+
+
 class HabitController:
     """Controller: Intermediário entre View e HabitModel."""
     
     def __init__(self, model):
         self.model = model
 
+    @profiled()
+    @timed()
     def handle_create_habit_request(self, name, description="", frequency="daily"):
         """Lida com a solicitação de criação de hábito."""
-        self._log_action(f"Criando hábito '{name}'")
+        self._log_action("Criando hábito '%s'", name)
         return self.model.create_habit(name, description, frequency)
 
-    def handle_read_habits_request(self):
+    @profiled()
+    @timed()
+    def handle_read_habits_request(self, include_archived=False):
         """Lida com a solicitação de leitura de hábitos."""
-        self._log_action("Buscando hábitos...")
-        habits = self.model.get_all_habits()
-        self._log_action(f"Retornando {len(habits)} hábitos")
+        habits = self.model.get_all_habits(include_archived)
+        logger.debug("Retornando %d hábitos", len(habits))
         return habits
 
-    def handle_update_habit_request(self, habit_id, name=None, description=None, active=None, frequency=None, color=None):
+    @profiled()
+    @timed()
+    def handle_read_archived_habits_request(self):
+        """Lida com a solicitação de leitura dos hábitos arquivados."""
+        logger.debug("Buscando hábitos arquivados")
+        return self.model.get_archived_habits()
+
+    @profiled()
+    @timed()
+    def handle_restore_habit_request(self, habit_id):
+        """Lida com a solicitação de restaurar um hábito arquivado."""
+        self._log_action("Restaurando hábito arquivado ID=%s", habit_id)
+        return self.model.restore_archived_habit(habit_id)
+
+    @profiled()
+    @timed()
+    def handle_update_habit_request(self, habit_id, name=None, description=None, active=None, frequency=None, color=None,
+                                    retention=None):
         """Lida com a solicitação de atualização de hábito."""
-        self._log_action(f"Atualizando hábito ID={habit_id}")
+        self._log_action("Atualizando hábito ID=%s", habit_id)
         self._log_details({
             'Nome': name,
             'Descrição': description,
             'Ativo': active,
             'Frequência': frequency,
-            'Cor': color
+            'Cor': color,
+            'Retenção': retention
         })
-        return self.model.update_habit(habit_id, name, description, active, frequency, color)
+        return self.model.update_habit(habit_id, name, description, active, frequency, color, retention)
 
+    @profiled()
+    @timed()
     def handle_delete_habit_request(self, habit_id):
         """Lida com a solicitação de exclusão de hábito."""
-        self._log_action(f"Deletando hábito ID={habit_id}")
+        self._log_action("Deletando hábito ID=%s", habit_id)
         return self.model.delete_habit(habit_id)
 
+    @profiled()
+    @timed()
     def handle_mark_done_request(self, habit_id, date=None):
         """Lida com a solicitação de marcar hábito como concluído."""
-        self._log_action(f"Marcando hábito ID={habit_id} como concluído em {date}")
+        self._log_action("Marcando hábito ID=%s como concluído em %s", habit_id, date)
         result = self.model.mark_habit_done(habit_id, date)
-        self._log_action(f"Resultado do model = {result}")
+        logger.debug("Resultado do model = %s", result)
         return result
+
+    @profiled()
+    @timed()
+    def handle_unmark_done_request(self, habit_id, date):
+        """Lida com a solicitação de desmarcar a conclusão de um hábito."""
+        self._log_action("Desmarcando hábito ID=%s em %s", habit_id, date)
+        return self.model.unmark_habit_done(habit_id, date)
+
+    @profiled()
+    @timed()
+    def handle_vacuum_request(self, archive_after_days=None):
+        """Lida com a solicitação de compactação dos dados de hábitos."""
+        self._log_action("Compactando dados (arquivar inativos há %s dias)", archive_after_days)
+        return self.model.vacuum(archive_after_days)
     
-    def _log_action(self, message):
-        """Método auxiliar para logging centralizado."""
-        print(f"[CONTROLLER] {message}")
+    def _log_action(self, message, *args):
+        """Método auxiliar para logging centralizado (formatação preguiçosa, como no logging)."""
+        logger.info(message, *args)
     
     def _log_details(self, details):
-        """Método auxiliar para logging de detalhes."""
+        """Método auxiliar para logging de detalhes (só monta as linhas em nível DEBUG)."""
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
         for key, value in details.items():
             if value is not None:
-                print(f"   - {key}: {value}")
\ No newline at end of file
+                logger.debug("   - %s: %s", key, value)
\ No newline at end of file
@@ -1,10 +1,16 @@
 from abc import ABC, abstractmethod
 
+from utils.LogSetup import get_logger
+from utils.Metrics import timed
+from utils.Profiler import profiled
+
+logger = get_logger(__name__)
+
 class Observer(ABC):
     """Observador (Observer): O ReportController implementará esta interface."""
     @abstractmethod
-    def update(self, subject):
-        """Recebe a notificação de atualização do sujeito."""
+    def update(self, subject, event=None):
+        """Recebe a notificação de atualização do sujeito (e o evento que a causou)."""
         pass
 
 
@@ -15,15 +21,19 @@ class ReportController(Observer):
         self.view = view
         self.model.attach(self)  # Registra-se como observador
 
-    def update(self, subject):
+    def update(self, subject, event=None):
         """Implementação do Observer: Chamado quando o HabitModel muda."""
-        print("\n[Sistema]: [SUCESSO] Notificação recebida do HabitModel")
+        logger.debug("Notificação recebida do HabitModel")
         # Gerar e exibir relatórios automaticamente apenas quando a view for o ConsoleView
         try:
             view_name = self.view.__class__.__name__
         except Exception:
             view_name = None
 
+        if (event or {}).get('external'):
+            # Alteração de outro processo: não interrompe o menu do console nem
+            # refaz os relatórios na thread do watcher (a GUI atualiza os cards)
+            return
         if view_name == 'ConsoleView':
             # Exibe menu de relatórios para o usuário escolher
             self.view.show_report_menu(self)
@@ -45,62 +55,94 @@ class ReportController(Observer):
                     # Silenciar erros da view para não quebrar a notificação
                     pass
 
-    def generate_and_display_all_reports(self):
-        """Gera e envia todos os dados de relatório para a View."""
-        from model.ReportFactory import ReportFactory
+    @profiled()
+    @timed()
+    def generate_report_data(self):
+        """
+        Gera os dados dos relatórios padrão (diário, semanal e mensal).
         
-        raw_data = self.model.get_all_habits()
+        Returns:
+            Dicionário {tipo: dados} ou None se não houver hábitos
+        """
+        return self.build_report_data(self.model.get_all_habits())
+
+    @staticmethod
+    def build_report_data(raw_data):
+        """
+        Relatórios padrão a partir de uma lista de hábitos.
+        Não usa o model: pode rodar em outro processo (ex.: servidor HTTP).
+        """
+        from model.ReportFactory import ReportFactory
         
         if not raw_data:
-            print("⚠️ Nenhum hábito cadastrado ainda.")
-            return
+            return None
 
         daily_report = ReportFactory.create_report("daily", raw_data)
         weekly_report = ReportFactory.create_report("weekly", raw_data)
         monthly_report = ReportFactory.create_report("monthly", raw_data)
 
-        report_data = {
+        return {
             "daily": daily_report.generate_visualization_data(),
             "weekly": weekly_report.generate_visualization_data(),
             "monthly": monthly_report.generate_visualization_data(),
         }
 
+    def generate_and_display_all_reports(self):
+        """Gera e envia todos os dados de relatório para a View."""
+        report_data = self.generate_report_data()
+        
+        if report_data is None:
+            print("⚠️ Nenhum hábito cadastrado ainda.")
+            return
+
         self.view.render_reports(report_data)
         self._display_console_reports(report_data)
     
-    def generate_custom_report(self, start_date, end_date):
+    @profiled()
+    @timed()
+    def generate_custom_report(self, start_date, end_date, include_archived=False):
         """
         Gera um relatório customizado para um período específico.
         
         Args:
             start_date: Data inicial (formato: 'YYYY-MM-DD')
             end_date: Data final (formato: 'YYYY-MM-DD')
+            include_archived: Inclui hábitos do arquivo frio (carregado sob demanda)
         
         Returns:
             Tupla (sucesso, mensagem, dados_relatorio)
         """
+        raw_data = self.model.get_all_habits(include_archived)
+        return self.build_custom_report(raw_data, start_date, end_date, include_archived)
+
+    @staticmethod
+    def build_custom_report(raw_data, start_date, end_date, include_archived=False):
+        """
+        Relatório personalizado a partir de uma lista de hábitos (mesmo retorno
+        de generate_custom_report). Não usa o model: pode rodar em outro processo.
+        """
         from model.ReportFactory import ReportFactory
         
         try:
-            raw_data = self.model.get_all_habits()
-            
             if not raw_data:
                 return False, "⚠️ Nenhum hábito cadastrado ainda.", None
             
             # Criar e gerar o relatório customizado
-            custom_report = ReportFactory.create_report("custom", raw_data, start_date, end_date)
+            custom_report = ReportFactory.create_report(
+                "custom", raw_data, start_date, end_date, include_inactive=include_archived
+            )
             report_data = custom_report.generate_visualization_data()
             
-            print(f"[SUCESSO] Relatório personalizado gerado: {start_date} até {end_date}")
+            logger.info("Relatório personalizado gerado: %s até %s", start_date, end_date)
             return True, f"Relatório gerado com sucesso para o período {start_date} a {end_date}!", report_data
             
         except ValueError as e:
             error_msg = f"❌ Erro ao gerar relatório: {str(e)}"
-            print(error_msg)
+            logger.warning("Erro ao gerar relatório: %s", e)
             return False, error_msg, None
         except Exception as e:
             error_msg = f"❌ Erro inesperado: {str(e)}"
-            print(error_msg)
+            logger.exception("Erro inesperado ao gerar relatório personalizado")
             return False, error_msg, None
     
     def _display_console_reports(self, report_data):
@@ -0,0 +1,77 @@
+import contextlib
+import threading
+
+from model.Storage import get_default_storage
+
+HABIT_ARCHIVE_FILE = "habitos_arquivados.json.gz"
+
+
+class HabitArchive:
+    """
+    Armazenamento frio (cold storage) de hábitos inativos.
+    Os hábitos ficam em um JSON compactado com gzip, carregado apenas sob
+    demanda (visualização do arquivo ou relatórios que incluem arquivados).
+    Thread-safe; como no HabitModel, as listas entregues aos leitores nunca
+    são alteradas (cada escrita publica uma lista nova), e as escritas
+    travam o arquivo e o releem se outro processo o alterou.
+    """
+
+    def __init__(self, filepath=HABIT_ARCHIVE_FILE, storage=None):
+        self.filepath = filepath
+        self.storage = storage if storage is not None else get_default_storage()
+        self._data = None
+        self._version = None
+        self._lock = threading.Lock()
+
+    def is_loaded(self):
+        """Indica se o arquivo já foi lido do disco."""
+        return self._data is not None
+
+    def _load(self):
+        """Carrega o arquivo compactado na primeira utilização."""
+        if self._data is None:
+            self._version = self.storage.version(self.filepath)
+            self._data = self.storage.load(self.filepath, {})
+        return self._data
+
+    def _save(self):
+        """Grava o arquivo compactado."""
+        self._version = self.storage.save(self.filepath, self._data, ensure_ascii=False, separators=(',', ':'))
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """Escrita exclusiva sobre a versão mais recente do arquivo (relido se outro processo gravou)."""
+        with self._lock, self.storage.lock(self.filepath):
+            if self._data is not None and self.storage.version(self.filepath) != self._version:
+                self._data = None
+            yield self._load()
+
+    def get_habits(self, username):
+        """Retorna os hábitos arquivados do usuário."""
+        with self._lock:
+            return list(self._load().get(username, []))
+
+    def add_habits(self, archived):
+        """
+        Adiciona hábitos ao arquivo.
+
+        Args:
+            archived: Dicionário {username: [hábitos]}
+        """
+        if not archived:
+            return
+        with self._transaction() as data:
+            for username, habits in archived.items():
+                data[username] = data.get(username, []) + list(habits)
+            self._save()
+
+    def remove_habit(self, username, habit_id):
+        """Remove e retorna um hábito do arquivo (ou None se não existir)."""
+        with self._transaction() as data:
+            habits = data.get(username, [])
+            for habit in habits:
+                if habit.get('id') == habit_id:
+                    data[username] = [h for h in habits if h is not habit]
+                    self._save()
+                    return habit
+        return None
@@ -1,25 +1,24 @@
-import json
+import contextlib
+import logging
+import threading
+import time
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 from abc import ABC, abstractmethod
+from model.HabitArchive import HabitArchive
+from model.Storage import get_default_storage
+from model.StorageWatcher import StorageWatcher, POLL_INTERVAL
+from utils.LogSetup import get_logger
+from model.HistoryRollup import (
+    ROLLUP_HORIZON_DAYS, RETENTION_MODES, RETENTION_SUMMARY,
+    rollup_horizon_month, rollup_habit_history
+)
 
-HABIT_DATA_FILE = "habitos_registros.json"
+logger = get_logger(__name__)
 
-def load_data(filepath, default_value):
-    """Carrega dados de um arquivo JSON."""
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return default_value
-    except json.JSONDecodeError:
-        print(f" Aviso: Arquivo {filepath} corrompido.")
-        return default_value
-
-def save_data(filepath, data):
-    """Salva dados em um arquivo JSON."""
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+HABIT_DATA_FILE = "habitos_registros.json"
+# Hábitos inativos há mais dias que isso vão para o arquivo frio (None = nunca)
+ARCHIVE_AFTER_DAYS = 90
 
 class Subject(ABC):
     """Sujeito (Subject): O HabitModel implementará esta interface."""
@@ -35,31 +34,214 @@ class Subject(ABC):
             self._observers.remove(observer)
 
     @abstractmethod
-    def notify(self):
+    def notify(self, event=None):
         pass
 
 class HabitModel(Subject):
-    """Model: Gerencia hábitos e implementa Subject (Observer Pattern)."""
+    """
+    Model: Gerencia hábitos e implementa Subject (Observer Pattern).
+
+    Thread-safe. As escritas são serializadas: todas gravam o mesmo arquivo
+    inteiro, então cada uma roda dentro de _transaction (uma por vez, entre
+    threads e entre processos). As leituras não esperam por elas: as
+    escritas são copy-on-write (a lista de hábitos do usuário e os hábitos
+    alterados são substituídos por cópias, nunca alterados no lugar), então
+    a lista devolvida por get_all_habits é um snapshot imutável, que
+    relatórios e exportações percorrem sem trava enquanto novos registros
+    acontecem (quem a recebe não deve alterá-la).
+
+    Outros processos podem usar o mesmo arquivo: cada escrita trava o arquivo
+    (Storage.lock) e, se a versão dele mudou desde a última leitura, relê os
+    dados antes de aplicar a alteração, em vez de sobrescrever a do outro.
+    A releitura troca só as listas dos usuários que mudaram e notifica cada
+    diferença (hábito criado, registro marcado...) como um evento externo;
+    watch_external_changes faz isso assim que o arquivo muda.
+    """
     
-    def __init__(self, user_model):
+    def __init__(self, user_model, archive_after_days=ARCHIVE_AFTER_DAYS,
+                 rollup_horizon_days=ROLLUP_HORIZON_DAYS, storage=None):
         super().__init__()
         self.user_model = user_model
-        self.data = load_data(HABIT_DATA_FILE, {})
-        self._migrate_data_add_color()
+        # Onde os dados são guardados (arquivos por padrão, memória nos testes)
+        self.storage = storage if storage is not None else get_default_storage()
+        self.data = {}
+        self._version = None
+        self.last_event = None
+        # Diferenças trazidas pela última releitura, notificadas fora das travas
+        self._external_events = []
+        # Uma escrita por vez (cada gravação leva o estado mais recente do arquivo inteiro)
+        self._save_lock = threading.Lock()
+        self.archive = HabitArchive(storage=self.storage)
+        self.archive_after_days = archive_after_days
+        self.rollup_horizon_days = rollup_horizon_days
+        with self._transaction():
+            self._migrate_data_add_color()
+            self._move_cold_habits()
+            self._apply_rollups()
     
     def _migrate_data_add_color(self):
         """Migra dados antigos para adicionar a chave 'color' se não existir."""
+        changed = False
         for username in self.data:
             for habit in self.data[username]:
                 if 'color' not in habit:
                     habit['color'] = 'blue'
-        if self.data:  # Only save if there's data to save
-            save_data(HABIT_DATA_FILE, self.data)
+                    changed = True
+        if changed:
+            self._save()
+
+    def _load(self):
+        """Lê os dados do armazenamento, guardando a versão lida."""
+        self._version = self.storage.version(HABIT_DATA_FILE)
+        self.data = self.storage.load(HABIT_DATA_FILE, {})
+
+    def _save(self):
+        """Grava os dados de hábitos no armazenamento (sempre dentro de _transaction)."""
+        # Cópia rasa: as listas publicadas não mudam mais, só são substituídas
+        self._version = self.storage.save(HABIT_DATA_FILE, dict(self.data), indent=4, ensure_ascii=False)
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """
+        Bloco que lê e grava o arquivo com exclusividade (threads e processos).
+        Se outro processo gravou desde a última leitura, os dados são relidos
+        antes: a alteração do bloco é aplicada sobre o estado mais recente.
+        """
+        with self._save_lock, self.storage.lock(HABIT_DATA_FILE):
+            if self._version is None:
+                self._load()
+            elif self.storage.version(HABIT_DATA_FILE) != self._version:
+                logger.info("%s foi alterado por outro processo; relendo", HABIT_DATA_FILE)
+                self._reload()
+            yield
+
+    def _reload(self):
+        """
+        Relê o arquivo e troca apenas as listas dos usuários que mudaram (as
+        demais continuam as mesmas); as diferenças vão para `_external_events`.
+        """
+        self._version = self.storage.version(HABIT_DATA_FILE)
+        fresh = self.storage.load(HABIT_DATA_FILE, {})
+        for username in list(self.data.keys() | fresh.keys()):
+            habits = fresh.get(username, [])
+            if habits == self.data.get(username, []):
+                continue
+            self._external_events.extend(
+                (event_type, username, habit_id, date)
+                for event_type, habit_id, date in _diff_habits(self.data.get(username, []), habits)
+            )
+            if username in fresh:
+                self.data[username] = habits
+            else:
+                del self.data[username]
+
+    def reload_external_changes(self):
+        """
+        Aplica as alterações feitas no arquivo por outro processo (se houver) e
+        notifica os observers de cada uma, com `event['external']` verdadeiro.
+
+        Returns:
+            Lista de eventos (tipo, usuário, ID do hábito, data) notificados
+        """
+        with self._transaction():
+            pass
+        return self._emit_external_changes()
+
+    def watch_external_changes(self, poll_interval=POLL_INTERVAL):
+        """Inicia um StorageWatcher que chama reload_external_changes quando o arquivo muda."""
+        return StorageWatcher(self.storage, [HABIT_DATA_FILE], lambda name: self.reload_external_changes(),
+                              poll_interval).start()
+
+    def _replace_habit(self, username, index, habit):
+        """Publica uma nova versão do hábito em uma nova lista do usuário."""
+        habits = list(self.data[username])
+        habits[index] = habit
+        self.data[username] = habits
+
+    def _move_cold_habits(self):
+        """Move para o arquivo frio os hábitos inativos há mais de `archive_after_days` dias."""
+        if self.archive_after_days is None:
+            return 0
+        archived = self._split_cold_habits(self.archive_after_days)
+        if archived:
+            self.archive.add_habits(archived)
+            self._save()
+        return sum(len(h) for h in archived.values())
+
+    def _split_cold_habits(self, days):
+        """Retira de `self.data` os hábitos inativos antigos e os retorna por usuário."""
+        cutoff = datetime.now() - timedelta(days=days)
+        archived = {}
+        for username, habits in self.data.items():
+            cold = [h for h in habits if not h.get('active', True) and _last_activity(h) < cutoff]
+            if cold:
+                archived[username] = cold
+                cold_ids = {id(h) for h in cold}
+                self.data[username] = [h for h in habits if id(h) not in cold_ids]
+        return archived
+
+    def _horizon_month(self):
+        """Primeiro mês ('YYYY-MM') mantido com detalhe diário garantido."""
+        return rollup_horizon_month(self.rollup_horizon_days)
+
+    def _apply_rollups(self):
+        """Gera os resumos mensais do histórico anterior ao horizonte configurado."""
+        horizon_month = self._horizon_month()
+        changed = False
+        for habits in self.data.values():
+            for habit in habits:
+                if rollup_habit_history(habit, horizon_month):
+                    changed = True
+        if changed:
+            self._save()
+        return changed
+
+    def _refresh_rollup(self, habit, date):
+        """Recalcula o resumo do mês de `date` após uma alteração no histórico."""
+        horizon_month = self._horizon_month()
+        if date[:7] < horizon_month and 'rollups' in habit:
+            habit['rollups'].pop(date[:7], None)
+            rollup_habit_history(habit, horizon_month)
+
+    def _is_summarized(self, habit, date):
+        """Indica se a data já foi resumida e não tem mais detalhe diário."""
+        return habit.get('retention') == RETENTION_SUMMARY and date[:7] < self._horizon_month()
 
-    def notify(self):
+    def notify(self, event=None):
         """Notifica todos os observers sobre mudanças."""
-        for observer in self._observers:
-            observer.update(self)
+        for observer in list(self._observers):
+            observer.update(self, event)
+
+    def _emit_change(self, event_type, habit_id=None, date=None, username=None, external=False):
+        """
+        Notifica os observers com o evento de mudança (`update(subject, event)`).
+
+        Cada notificação recebe o seu próprio dicionário: o watcher, a thread do
+        Tk e a API emitem ao mesmo tempo, então o observer deve usar o `event`
+        recebido, e não `last_event` (que guarda só o último, para consulta).
+        """
+        if not external:
+            # Alterações de outro processo relidas antes desta vêm primeiro
+            self._emit_external_changes()
+        event = {
+            'type': event_type,
+            'username': username or self.user_model.get_logged_in_username(),
+            'habit_id': habit_id,
+            'date': date,
+            'external': external
+        }
+        self.last_event = event
+        self.notify(event)
+
+    def _emit_external_changes(self):
+        """Notifica as diferenças pendentes da última releitura do arquivo."""
+        if not self._external_events:
+            return []
+        with self._save_lock:
+            events, self._external_events = self._external_events, []
+        for event_type, username, habit_id, date in events:
+            self._emit_change(event_type, habit_id, date, username=username, external=True)
+        return events
 
     def create_habit(self, name, description="", frequency="daily"):
         """
@@ -85,9 +267,6 @@ class HabitModel(Subject):
         if frequency not in valid_frequencies:
             return False, f"Frequência inválida. Use: {', '.join(valid_frequencies)}"
 
-        if username not in self.data:
-            self.data[username] = []
-
         habit = {
             "id": str(uuid.uuid4()),
             "name": name.strip(),
@@ -99,100 +278,325 @@ class HabitModel(Subject):
             "history": {}
         }
 
-        self.data[username].append(habit)
-        save_data(HABIT_DATA_FILE, self.data)
-        self.notify()
+        with self._transaction():
+            self.data[username] = self.data.get(username, []) + [habit]
+            self._save()
+        self._emit_change('create', habit['id'])
         return True, f"Hábito '{name}' criado com sucesso!"
 
-    def get_all_habits(self):
-        """Retorna todos os hábitos do usuário logado (R1 - Read)."""
+    def get_all_habits(self, include_archived=False):
+        """
+        Retorna todos os hábitos do usuário logado (R1 - Read).
+        Com include_archived=True, carrega também os hábitos do arquivo frio.
+        """
         username = self.user_model.get_logged_in_username()
         if not username:
-            print("[AVISO] Nenhum usuario logado!")
+            logger.warning("Nenhum usuário logado ao buscar hábitos")
             return []
         
-        habits = self.data.get(username, [])
-        print(f"[INFO] Model: Buscando habitos para '{username}': {len(habits)} encontrados")
+        habits = list(self.data.get(username, []))
+        if include_archived:
+            habits = habits + self.archive.get_habits(username)
+        logger.debug("Buscando hábitos de '%s': %d encontrados", username, len(habits))
         return habits
 
-    def update_habit(self, habit_id, name=None, description=None, active=None, frequency=None, color=None):
-        """Atualiza um hábito existente (R1 - Update)."""
+    def get_archived_habits(self):
+        """Retorna os hábitos arquivados do usuário logado (carregados sob demanda)."""
+        username = self.user_model.get_logged_in_username()
+        if not username:
+            return []
+        return self.archive.get_habits(username)
+
+    def restore_archived_habit(self, habit_id):
+        """Traz um hábito do arquivo frio de volta para os dados principais."""
+        username = self.user_model.get_logged_in_username()
+        if not username:
+            return False, "Nenhum usuário logado."
+
+        with self._transaction():
+            habit = self.archive.remove_habit(username, habit_id)
+            if habit is None:
+                return False, "Hábito não encontrado no arquivo."
+
+            # Volta ativo: senão o próximo início o arquivaria de novo
+            habit['active'] = True
+            habit.pop('deactivated_at', None)
+            self.data[username] = self.data.get(username, []) + [habit]
+            self._save()
+        self._emit_change('restore', habit_id)
+        return True, f"Hábito '{habit['name']}' restaurado do arquivo!"
+
+    def update_habit(self, habit_id, name=None, description=None, active=None, frequency=None, color=None,
+                     retention=None):
+        """
+        Atualiza um hábito existente (R1 - Update).
+        `retention` ('full' ou 'summary') define se o histórico antigo mantém o
+        detalhe diário ou apenas os resumos mensais.
+        """
         username = self.user_model.get_logged_in_username()
-        if not username or username not in self.data:
+        if not username:
             return False, "Usuário não encontrado."
 
-        for habit in self.data[username]:
-            if habit['id'] == habit_id:
-                if name is not None:
-                    habit['name'] = name
-                if description is not None:
-                    habit['description'] = description
-                if active is not None:
-                    habit['active'] = active
-                if frequency is not None:
-                    habit['frequency'] = frequency
-                if color is not None:
-                    habit['color'] = color
-                
-                save_data(HABIT_DATA_FILE, self.data)
-                self.notify()
-                print(f"[INFO] Model: Habito '{habit['name']}' atualizado com sucesso!")
-                return True, f"Hábito '{habit['name']}' atualizado!"
-
-        return False, "Hábito não encontrado."
+        if retention is not None and retention not in RETENTION_MODES:
+            return False, f"Retenção inválida. Use: {', '.join(RETENTION_MODES)}"
+
+        with self._transaction():
+            # Verificado já com a trava: outro processo pode ter criado os hábitos do usuário
+            if username not in self.data:
+                return False, "Usuário não encontrado."
+            index = _find_habit(self.data[username], habit_id)
+            if index is None:
+                return False, "Hábito não encontrado."
+
+            habit = _copy_for_write(self.data[username][index])
+            if name is not None:
+                habit['name'] = name
+            if description is not None:
+                habit['description'] = description
+            if active is not None:
+                if habit.get('active', True) and not active:
+                    habit['deactivated_at'] = datetime.now().isoformat()
+                elif active:
+                    habit.pop('deactivated_at', None)
+                habit['active'] = active
+            if frequency is not None:
+                habit['frequency'] = frequency
+            if color is not None:
+                habit['color'] = color
+            if retention is not None:
+                habit['retention'] = retention
+                rollup_habit_history(habit, self._horizon_month())
+
+            self._replace_habit(username, index, habit)
+            self._save()
+        self._emit_change('update', habit_id)
+        logger.info("Hábito '%s' atualizado", habit['name'])
+        return True, f"Hábito '{habit['name']}' atualizado!"
 
     def delete_habit(self, habit_id):
         """Deleta um hábito (R1 - Delete)."""
         username = self.user_model.get_logged_in_username()
-        if not username or username not in self.data:
+        if not username:
             return False, "Usuário não encontrado."
 
-        initial_count = len(self.data[username])
-        self.data[username] = [h for h in self.data[username] if h['id'] != habit_id]
-
-        if len(self.data[username]) < initial_count:
-            save_data(HABIT_DATA_FILE, self.data)
-            self.notify()
-            return True, "Hábito deletado com sucesso!"
-
-        return False, "Hábito não encontrado."
+        with self._transaction():
+            if username not in self.data:
+                return False, "Usuário não encontrado."
+            habits = self.data[username]
+            remaining = [h for h in habits if h['id'] != habit_id]
+            if len(remaining) == len(habits):
+                return False, "Hábito não encontrado."
+            self.data[username] = remaining
+            self._save()
+        self._emit_change('delete', habit_id)
+        return True, "Hábito deletado com sucesso!"
 
     def mark_habit_done(self, habit_id, date=None):
         """Marca um hábito como concluído em uma data (R2)."""
         if date is None:
             date = datetime.now().strftime('%Y-%m-%d')
 
-        print(f"[INFO] Model: Marcando habito {habit_id} em {date}")
-        
+        logger.debug("Marcando hábito %s em %s", habit_id, date)
+
+        username = self.user_model.get_logged_in_username()
+        if not username:
+            logger.warning("Usuário não encontrado ao marcar hábito (%s)", username)
+            return False, "Usuário não encontrado."
+
+        with self._transaction():
+            if username not in self.data:
+                logger.warning("Usuário não encontrado ao marcar hábito (%s)", username)
+                return False, "Usuário não encontrado."
+            index = _find_habit(self.data[username], habit_id)
+            if index is None:
+                logger.warning("Hábito %s não encontrado", habit_id)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Hábitos disponíveis: %s", [h.get('id') for h in self.data.get(username, [])])
+                return False, "Hábito não encontrado."
+
+            habit = self.data[username][index]
+            # Verificar se já foi marcado
+            if habit.get('history', {}).get(date):
+                logger.debug("Hábito %s já marcado em %s", habit_id, date)
+                return False, f"Hábito '{habit['name']}' já foi marcado como concluído em {date}!"
+
+            if self._is_summarized(habit, date):
+                return False, f"O histórico de '{habit['name']}' em {date[:7]} está resumido e não pode ser alterado."
+
+            # Marcar como concluído (em uma cópia: quem lê o snapshot anterior não vê a mudança pela metade)
+            habit = _copy_for_write(habit)
+            habit['history'][date] = True
+            self._refresh_rollup(habit, date)
+            self._replace_habit(username, index, habit)
+
+            # Salvar dados
+            self._save()
+        logger.info("Hábito '%s' marcado em %s", habit['name'], date)
+        logger.debug("Histórico de '%s': %d registros", habit['name'], len(habit['history']))
+
+        # Notificar observers
+        self._emit_change('mark', habit_id, date)
+
+        return True, f"Hábito '{habit['name']}' marcado como concluído em {date}!"
+
+    def unmark_habit_done(self, habit_id, date):
+        """
+        Desmarca a conclusão de um hábito em uma data (R2).
+        Remove a entrada do histórico em vez de gravar False, para que
+        relatórios e o PDF não contem o dia como registrado.
+        """
         username = self.user_model.get_logged_in_username()
-        if not username or username not in self.data:
-            print(f"[AVISO] Model: Usuario nao encontrado ({username})")
+        if not username:
             return False, "Usuário não encontrado."
 
-        for habit in self.data[username]:
-            if habit.get('id') == habit_id:
-                # Verificar se já foi marcado
-                if date in habit.get('history', {}) and habit['history'][date]:
-                    print(f"[INFO] Model: Habito ja marcado em {date}")
-                    return False, f"Hábito '{habit['name']}' já foi marcado como concluído em {date}!"
-
-                # Garantir que 'history' existe
-                if 'history' not in habit:
-                    habit['history'] = {}
-                
-                # Marcar como concluído
-                habit['history'][date] = True
-                
-                # Salvar dados
-                save_data(HABIT_DATA_FILE, self.data)
-                print(f"[INFO] Model: Habito '{habit['name']}' marcado em {date}")
-                print(f"   History atualizado: {habit['history']}")
-                
-                # Notificar observers
-                self.notify()
-                
-                return True, f"Hábito '{habit['name']}' marcado como concluído em {date}!"
-
-        print(f"[AVISO] Model: Habito {habit_id} nao encontrado")
-        print(f"   Habitos disponiveis: {[h.get('id') for h in self.data.get(username, [])]}")
-        return False, "Hábito não encontrado."
\ No newline at end of file
+        with self._transaction():
+            if username not in self.data:
+                return False, "Usuário não encontrado."
+            index = _find_habit(self.data[username], habit_id)
+            if index is None:
+                return False, "Hábito não encontrado."
+
+            habit = self.data[username][index]
+            if not habit.get('history', {}).get(date, False):
+                return False, f"Hábito '{habit['name']}' não está marcado em {date}."
+
+            habit = _copy_for_write(habit)
+            del habit['history'][date]
+            self._refresh_rollup(habit, date)
+            self._replace_habit(username, index, habit)
+            self._save()
+        logger.info("Hábito '%s' desmarcado em %s", habit['name'], date)
+        self._emit_change('unmark', habit_id, date)
+        return True, f"Hábito '{habit['name']}' desmarcado em {date}!"
+
+    def vacuum(self, archive_after_days=None):
+        """
+        Compacta os dados de hábitos em memória e no arquivo.
+
+        Remove entradas falsas do histórico (registros antigos de desmarcação)
+        e, opcionalmente, move hábitos inativos há mais de `archive_after_days`
+        dias para o arquivo frio (HabitArchive). Opera sobre `self.data`, então pode
+        ser executado com a aplicação aberta.
+
+        Args:
+            archive_after_days: Dias de inatividade para arquivar (None = não arquivar)
+
+        Returns:
+            Dicionário com estatísticas da compactação
+        """
+        bytes_before = self.storage.size(HABIT_DATA_FILE)
+        load_before = _measure_load_time(self.storage, HABIT_DATA_FILE)
+
+        # Altera todos os usuários de uma vez (como toda escrita, dentro da transação)
+        with self._transaction():
+            entries_removed = 0
+            for username, habits in list(self.data.items()):
+                compacted = []
+                for habit in habits:
+                    dead = [date for date, done in habit.get('history', {}).items() if not done]
+                    if dead:
+                        habit = _copy_for_write(habit)
+                        for date in dead:
+                            del habit['history'][date]
+                        entries_removed += len(dead)
+                    compacted.append(habit)
+                self.data[username] = compacted
+
+            archived = {}
+            if archive_after_days is not None:
+                archived = self._split_cold_habits(archive_after_days)
+                self.archive.add_habits(archived)
+            habits_archived = sum(len(h) for h in archived.values())
+
+            self._save()
+        bytes_after = self.storage.size(HABIT_DATA_FILE)
+        load_after = _measure_load_time(self.storage, HABIT_DATA_FILE)
+
+        if entries_removed or habits_archived:
+            self._emit_change('vacuum')
+
+        return {
+            'entries_removed': entries_removed,
+            'habits_archived': habits_archived,
+            'bytes_before': bytes_before,
+            'bytes_after': bytes_after,
+            'bytes_reclaimed': bytes_before - bytes_after,
+            'load_seconds_before': load_before,
+            'load_seconds_after': load_after
+        }
+
+
+def _find_habit(habits, habit_id):
+    """Posição do hábito na lista (None se não existir)."""
+    for index, habit in enumerate(habits):
+        if habit.get('id') == habit_id:
+            return index
+    return None
+
+
+def _copy_for_write(habit):
+    """
+    Cópia do hábito para alteração (copy-on-write). Histórico e resumos são
+    copiados porque as escritas os alteram; os resumos de cada mês só são
+    substituídos, nunca alterados, então a cópia rasa basta.
+    """
+    copy = dict(habit)
+    copy['history'] = dict(habit.get('history', {}))
+    if 'rollups' in habit:
+        copy['rollups'] = dict(habit['rollups'])
+    return copy
+
+
+def _diff_habits(old_habits, new_habits):
+    """
+    Diferenças entre duas versões da lista de hábitos de um usuário.
+
+    Returns:
+        Lista de (tipo, ID do hábito, data): 'create', 'delete', 'mark' e
+        'unmark' (uma por data) e 'update' (demais campos)
+    """
+    old_by_id = {habit['id']: habit for habit in old_habits}
+    new_by_id = {habit['id']: habit for habit in new_habits}
+    events = [('delete', habit_id, None) for habit_id in old_by_id if habit_id not in new_by_id]
+    for habit_id, habit in new_by_id.items():
+        previous = old_by_id.get(habit_id)
+        if previous is None:
+            events.append(('create', habit_id, None))
+            continue
+        if previous == habit:
+            continue
+        old_history, new_history = previous.get('history', {}), habit.get('history', {})
+        changes = [('mark', habit_id, date) for date in sorted(new_history)
+                   if new_history[date] and not old_history.get(date)]
+        changes += [('unmark', habit_id, date) for date in sorted(old_history)
+                    if old_history[date] and not new_history.get(date)]
+        fields = {key for key in previous.keys() | habit.keys() if key not in ('history', 'rollups')}
+        if not changes or any(previous.get(key) != habit.get(key) for key in fields):
+            changes.append(('update', habit_id, None))
+        events.extend(changes)
+    return events
+
+
+def _measure_load_time(storage, name, repeat=3):
+    """Melhor tempo (em segundos) de leitura e parse do documento JSON."""
+    best = 0.0
+    for i in range(repeat):
+        start = time.perf_counter()
+        storage.load(name, {})
+        elapsed = time.perf_counter() - start
+        best = elapsed if i == 0 else min(best, elapsed)
+    return best
+
+
+def _last_activity(habit):
+    """Data mais recente de atividade do hábito (desativação, histórico ou criação)."""
+    candidates = []
+    for key in ('deactivated_at', 'created_at'):
+        if habit.get(key):
+            candidates.append(habit[key][:10])
+    done_dates = [date for date, done in habit.get('history', {}).items() if done]
+    if done_dates:
+        candidates.append(max(done_dates))
+    if not candidates:
+        return datetime.min
+    return datetime.strptime(max(candidates), '%Y-%m-%d')
@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta
+
+# Histórico mais antigo que isso é resumido por mês
+ROLLUP_HORIZON_DAYS = 365
+
+RETENTION_FULL = 'full'
+RETENTION_SUMMARY = 'summary'
+RETENTION_MODES = (RETENTION_FULL, RETENTION_SUMMARY)
+
+
+def rollup_horizon_month(horizon_days=ROLLUP_HORIZON_DAYS, today=None):
+    """
+    Retorna o primeiro mês ('YYYY-MM') que NÃO é resumido.
+    Meses anteriores a ele terminam antes do horizonte e podem virar resumo.
+    """
+    today = today or datetime.now()
+    horizon = today - timedelta(days=horizon_days)
+    return horizon.strftime('%Y-%m')
+
+
+def build_month_rollup(dates):
+    """
+    Gera o resumo de um mês a partir das datas concluídas.
+
+    Args:
+        dates: Datas 'YYYY-MM-DD' concluídas dentro do mesmo mês
+
+    Returns:
+        Dicionário com count, longest_streak, first e last
+    """
+    ordered = sorted(dates)
+    longest = 0
+    current = 0
+    previous = None
+    for date_str in ordered:
+        day = datetime.strptime(date_str, '%Y-%m-%d')
+        if previous is not None and (day - previous).days == 1:
+            current += 1
+        else:
+            current = 1
+        longest = max(longest, current)
+        previous = day
+
+    return {
+        'count': len(ordered),
+        'longest_streak': longest,
+        'first': ordered[0] if ordered else None,
+        'last': ordered[-1] if ordered else None
+    }
+
+
+def rollup_habit_history(habit, horizon_month):
+    """
+    Atualiza os resumos mensais (habit['rollups']) de meses anteriores a `horizon_month`.
+
+    Em retenção 'full' os resumos são um cache derivado do histórico diário e só
+    meses ainda sem resumo são calculados. Em retenção 'summary' os dias já
+    resumidos são removidos do histórico para limitar o tamanho do arquivo.
+
+    Returns:
+        True se o hábito foi alterado
+    """
+    history = habit.get('history', {})
+    rollups = habit.setdefault('rollups', {})
+    summary_only = habit.get('retention', RETENTION_FULL) == RETENTION_SUMMARY
+
+    by_month = {}
+    for date_str, done in history.items():
+        month = date_str[:7]
+        if month < horizon_month and done:
+            by_month.setdefault(month, []).append(date_str)
+
+    changed = False
+    for month, dates in by_month.items():
+        if month in rollups and not summary_only:
+            continue
+        if month in rollups and not _covered_by_history(rollups[month], dates):
+            # Retenção resumida: só os dias de fora do resumo são somados a ele
+            existing = rollups[month]
+            first, last = existing.get('first') or '', existing.get('last') or ''
+            extra = [d for d in dates if not first <= d <= last]
+            if not extra:
+                continue
+            rollups[month] = _merge_rollups(existing, build_month_rollup(extra))
+        else:
+            # Sem resumo, ou resumo que ainda é o cache do histórico diário (ex.:
+            # retenção que acabou de virar 'summary'): refeito a partir dos dias
+            rollups[month] = build_month_rollup(dates)
+        changed = True
+
+    if summary_only:
+        old_dates = [d for d in history if d[:7] < horizon_month]
+        for date_str in old_dates:
+            del history[date_str]
+        changed = changed or bool(old_dates)
+
+    if not rollups:
+        del habit['rollups']
+    return changed
+
+
+def _covered_by_history(rollup, dates):
+    """Indica se os dias do histórico contêm tudo o que o resumo conta (resumo = cache)."""
+    present = set(dates)
+    return (len(present) >= rollup.get('count', 0)
+            and rollup.get('first') in present and rollup.get('last') in present)
+
+
+def _merge_rollups(existing, extra):
+    """Combina dois resumos do mesmo mês."""
+    firsts = [d for d in (existing.get('first'), extra.get('first')) if d]
+    lasts = [d for d in (existing.get('last'), extra.get('last')) if d]
+    return {
+        'count': existing.get('count', 0) + extra.get('count', 0),
+        'longest_streak': max(existing.get('longest_streak', 0), extra.get('longest_streak', 0)),
+        'first': min(firsts) if firsts else None,
+        'last': max(lasts) if lasts else None
+    }
+
+
+def summarized_months(habit):
+    """Meses cujo detalhe diário foi descartado (retenção 'summary')."""
+    if habit.get('retention', RETENTION_FULL) != RETENTION_SUMMARY:
+        return set()
+    return set(habit.get('rollups', {}))
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 from collections import defaultdict
+from model.HistoryRollup import summarized_months
 
 # --- PADRÃO FACTORY METHOD (Para criação de relatórios) ---
 
@@ -257,8 +258,9 @@ class MonthlyReport(Report):
 
 class CustomReport(Report):
     """Produto Concreto: Relatório por Período Personalizado."""
-    def __init__(self, raw_data, start_date, end_date):
+    def __init__(self, raw_data, start_date, end_date, include_inactive=False):
         self.habits = raw_data
+        self.include_inactive = include_inactive
         self.start_date = datetime.strptime(start_date, '%Y-%m-%d')
         self.end_date = datetime.strptime(end_date, '%Y-%m-%d')
         
@@ -276,8 +278,11 @@ class CustomReport(Report):
         max_count = 0
         best_day = ""
         
-        # Contar hábitos ativos
-        active_habits = [h for h in self.habits if h.get('active', True)]
+        # Contar hábitos ativos (ou todos, quando inclui inativos/arquivados)
+        active_habits = [h for h in self.habits if self.include_inactive or h.get('active', True)]
+        
+        # Meses cujo detalhe diário foi trocado por resumo mensal (lidos via rollups)
+        skipped_months = [summarized_months(h) for h in active_habits]
         
         # Processar cada dia no intervalo
         current = self.start_date
@@ -286,7 +291,9 @@ class CustomReport(Report):
             day_completed = 0
             day_total = len(active_habits)
             
-            for habit in active_habits:
+            for habit, skip in zip(active_habits, skipped_months):
+                if skip and current_date[:7] in skip:
+                    continue
                 if habit.get('history', {}).get(current_date, False):
                     day_completed += 1
                     total_completed += 1
@@ -310,6 +317,12 @@ class CustomReport(Report):
             
             current += timedelta(days=1)
         
+        # Somar os meses resumidos
+        monthly_rollups = self._collect_rollups(active_habits, skipped_months)
+        for month_data in monthly_rollups.values():
+            total_completed += month_data['completed']
+            max_streak = max(max_streak, month_data['longest_streak'])
+        
         # Calcular estatísticas finais
         total_days = (self.end_date - self.start_date).days + 1
         avg_per_day = round(total_completed / total_days, 1) if total_days > 0 else 0
@@ -327,15 +340,53 @@ class CustomReport(Report):
             'completion_rate': completion_rate,
             'best_day': best_day,
             'best_day_count': max_count,
-            'daily_data': dict(daily_data)
+            'daily_data': dict(daily_data),
+            'monthly_rollups': monthly_rollups
         }
+    
+    def _collect_rollups(self, habits, skipped_months):
+        """
+        Soma os resumos mensais dos meses sem detalhe diário que tocam o intervalo.
+        Meses parcialmente cobertos cujas conclusões não cabem no intervalo são
+        estimados proporcionalmente e marcados com 'estimated'.
+        """
+        start = self.start_date.strftime('%Y-%m-%d')
+        end = self.end_date.strftime('%Y-%m-%d')
+        result = {}
+        
+        for habit, months in zip(habits, skipped_months):
+            rollups = habit.get('rollups', {})
+            for month in months:
+                first_day = datetime.strptime(month + '-01', '%Y-%m-%d')
+                last_day = (first_day + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+                overlap_start = max(first_day, self.start_date)
+                overlap_end = min(last_day, self.end_date)
+                if overlap_start > overlap_end:
+                    continue
+                
+                rollup = rollups[month]
+                count = rollup.get('count', 0)
+                estimated = False
+                inside = rollup.get('first') and start <= rollup['first'] and rollup['last'] <= end
+                if not inside and (overlap_start, overlap_end) != (first_day, last_day):
+                    overlap_days = (overlap_end - overlap_start).days + 1
+                    count = round(count * overlap_days / last_day.day)
+                    estimated = True
+                
+                entry = result.setdefault(month, {'completed': 0, 'longest_streak': 0, 'estimated': False})
+                entry['completed'] += count
+                if not estimated:
+                    entry['longest_streak'] = max(entry['longest_streak'], rollup.get('longest_streak', 0))
+                entry['estimated'] = entry['estimated'] or estimated
+        
+        return result
 
 
 class ReportFactory:
     """Criador (Creator): Factory que cria diferentes tipos de relatórios."""
     
     @staticmethod
-    def create_report(report_type, raw_data, start_date=None, end_date=None):
+    def create_report(report_type, raw_data, start_date=None, end_date=None, include_inactive=False):
         """
         Factory Method: Cria o relatório apropriado com base no tipo.
         
@@ -344,6 +395,7 @@ class ReportFactory:
             raw_data: Dados brutos dos hábitos
             start_date: Data inicial para relatório customizado (formato: 'YYYY-MM-DD')
             end_date: Data final para relatório customizado (formato: 'YYYY-MM-DD')
+            include_inactive: Considera hábitos inativos no relatório customizado
         
         Returns:
             Um objeto Report (DailyReport, WeeklyReport, MonthlyReport ou CustomReport)
@@ -360,6 +412,6 @@ class ReportFactory:
         elif report_type == "custom":
             if start_date is None or end_date is None:
                 raise ValueError("start_date e end_date são obrigatórios para relatório customizado.")
-            return CustomReport(raw_data, start_date, end_date)
+            return CustomReport(raw_data, start_date, end_date, include_inactive)
         else:
             raise ValueError(f"Tipo de relatório inválido: {report_type}")
\ No newline at end of file
@@ -0,0 +1,213 @@
+"""
+Storage - Onde os Models guardam seus dados.
+
+Os Models persistem documentos JSON identificados por nome (ex.:
+'habitos_registros.json'). O backend decide onde eles ficam:
+
+- JSONFileStorage: arquivos em um diretório (padrão: o diretório atual ou
+  o definido na variável de ambiente HABITTRACKER_DATA_DIR). Nomes
+  terminados em '.gz' são gravados compactados com gzip.
+- InMemoryStorage: documentos em memória, usado pelos testes para que cada
+  teste tenha dados próprios e nada seja lido ou gravado em disco.
+
+Cada UserModel/HabitModel recebe um backend no construtor; sem ele, usa o
+backend padrão (get_default_storage).
+
+Vários processos (console, GUI, servidor) podem usar o mesmo diretório:
+lock(name) é uma trava exclusiva entre processos (flock em um arquivo
+'<nome>.lock' ao lado do documento) e version(name) identifica a última
+gravação (mtime, tamanho e inode). Quem vai gravar pega a trava, compara a
+versão com a que leu e, se outro processo gravou no meio tempo, relê o
+documento e reaplica sua alteração sobre ele em vez de sobrescrevê-lo. As
+gravações são atômicas (arquivo temporário + replace): um leitor nunca vê
+um arquivo pela metade.
+"""
+
+import contextlib
+import gzip
+import json
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from utils.LogSetup import get_logger
+from utils.Metrics import MetricsRegistry, file_size
+
+logger = get_logger(__name__)
+
+DATA_DIR_ENV = "HABITTRACKER_DATA_DIR"
+
+
+class JSONFileStorage:
+    """Documentos JSON gravados como arquivos em um diretório."""
+
+    def __init__(self, directory=None):
+        self.directory = directory or os.environ.get(DATA_DIR_ENV) or "."
+
+    def path(self, name):
+        """Caminho do arquivo de um documento."""
+        return os.path.join(self.directory, name)
+
+    def load(self, name, default_value):
+        """Carrega um documento (ou `default_value` se não existir ou estiver corrompido)."""
+        path = self.path(name)
+        try:
+            # Arquivo inexistente não conta como leitura (nem como erro)
+            with _open(path, 'r') as f, MetricsRegistry.get_instance().timer("JSONFileStorage.load"):
+                return json.load(f)
+        except FileNotFoundError:
+            return default_value
+        except (OSError, json.JSONDecodeError):
+            logger.warning("Arquivo %s corrompido", path)
+            return default_value
+
+    def save(self, name, data, **dump_options):
+        """
+        Grava um documento. `dump_options` vão para json.dump (ex.: indent).
+
+        Returns:
+            Versão do documento gravado (ver version)
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(name)
+        # Temporário no mesmo diretório (replace atômico), com a mesma extensão (.gz)
+        temp_path = os.path.join(self.directory, f".{os.getpid()}.{threading.get_ident()}.{name}")
+        with MetricsRegistry.get_instance().timer("JSONFileStorage.save") as timer:
+            try:
+                with _open(temp_path, 'w') as f:
+                    json.dump(data, f, **dump_options)
+                os.replace(temp_path, path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            timer.bytes_written = file_size(path)
+        return self.version(name)
+
+    def exists(self, name):
+        return os.path.exists(self.path(name))
+
+    def size(self, name):
+        """Tamanho do documento em bytes (0 se não existir)."""
+        return file_size(self.path(name))
+
+    def version(self, name):
+        """
+        Identifica a última gravação do documento (None se não existir).
+        Cada gravação cria um arquivo novo (replace), então o inode muda mesmo
+        quando mtime e tamanho coincidem.
+        """
+        try:
+            stat = os.stat(self.path(name))
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    @contextlib.contextmanager
+    def lock(self, name):
+        """Trava exclusiva do documento entre processos (e entre threads)."""
+        os.makedirs(self.directory, exist_ok=True)
+        # O arquivo de trava é separado: o documento é substituído a cada gravação
+        with open(self.path(name) + ".lock", 'a+b') as lock_file:
+            with MetricsRegistry.get_instance().timer("JSONFileStorage.lock_wait"):
+                _lock_file(lock_file)
+            try:
+                yield
+            finally:
+                _unlock_file(lock_file)
+
+
+class InMemoryStorage:
+    """
+    Documentos guardados em memória.
+    Cada documento é mantido serializado, como no disco: quem carrega recebe
+    uma cópia nova e dados que não viram JSON falham na gravação.
+    """
+
+    def __init__(self, documents=None):
+        self._documents = {}
+        self._versions = {}
+        self._lock = threading.RLock()
+        for name, data in (documents or {}).items():
+            self.save(name, data)
+
+    def load(self, name, default_value):
+        if name not in self._documents:
+            return default_value
+        return json.loads(self._documents[name])
+
+    def save(self, name, data, **dump_options):
+        with self._lock:
+            self._documents[name] = json.dumps(data, **dump_options)
+            self._versions[name] = self._versions.get(name, 0) + 1
+            return self._versions[name]
+
+    def version(self, name):
+        """Contador de gravações do documento (None se não existir)."""
+        return self._versions.get(name) if name in self._documents else None
+
+    @contextlib.contextmanager
+    def lock(self, name):
+        """Trava entre threads (não há outros processos)."""
+        with self._lock:
+            yield
+
+    def exists(self, name):
+        return name in self._documents
+
+    def size(self, name):
+        return len(self._documents.get(name, '').encode('utf-8'))
+
+
+def _open(path, mode):
+    """Abre o arquivo em modo texto UTF-8, com gzip para nomes terminados em '.gz'."""
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def _lock_file(lock_file):
+    """Bloqueia até obter a trava exclusiva do arquivo."""
+    if fcntl is not None:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+    else:
+        lock_file.seek(0)
+        while True:
+            try:
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                # LK_LOCK desiste após ~10 s; continua esperando
+                continue
+
+
+def _unlock_file(lock_file):
+    if fcntl is not None:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    else:
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+_default_storage = None
+
+
+def get_default_storage():
+    """
+    Backend usado pelos Models criados sem um `storage` explícito.
+    Sem configuração, arquivos no diretório de HABITTRACKER_DATA_DIR (lido a cada chamada).
+    """
+    if _default_storage is not None:
+        return _default_storage
+    return JSONFileStorage()
+
+
+def set_default_storage(storage):
+    """Troca o backend padrão (None volta aos arquivos). Retorna o anterior."""
+    global _default_storage
+    previous, _default_storage = _default_storage, storage
+    return previous
@@ -0,0 +1,160 @@
+"""
+StorageWatcher - Percebe quando outro processo altera os documentos do Storage.
+
+Uma thread em segundo plano compara a versão de cada documento observado
+(Storage.version) com a última vista e chama `on_change(nome)` quando ela
+muda. No Linux, com arquivos (JSONFileStorage), a thread dorme no inotify do
+diretório (via ctypes, sem dependências) e acorda assim que um arquivo é
+gravado ou substituído; nos demais casos (outros sistemas, InMemoryStorage,
+diretório inexistente) consulta as versões a cada `poll_interval` segundos.
+
+As gravações do próprio processo também mudam a versão: quem recebe o aviso
+deve comparar com a versão que já conhece (ver HabitModel.reload_external_changes).
+"""
+
+import os
+import select
+import struct
+import threading
+
+from utils.LogSetup import get_logger
+
+logger = get_logger(__name__)
+
+# Intervalo da consulta por versão (sem inotify) e da verificação de segurança (com inotify)
+POLL_INTERVAL = 1.0
+# Espera após o primeiro evento, para tratar uma rajada de gravações de uma vez
+DEBOUNCE_SECONDS = 0.05
+
+# inotify(7)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class StorageWatcher:
+    """Observa documentos de um Storage e avisa quando outro processo os altera."""
+
+    def __init__(self, storage, names, on_change, poll_interval=POLL_INTERVAL):
+        """
+        Args:
+            storage: Backend observado (JSONFileStorage, InMemoryStorage...)
+            names: Nomes dos documentos observados
+            on_change: Função chamada com o nome do documento alterado (na thread do watcher)
+            poll_interval: Segundos entre as consultas sem inotify
+        """
+        self.storage = storage
+        self.names = list(names)
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self._seen = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self._inotify_fd = None
+        self._wakeup = None
+
+    @property
+    def uses_inotify(self):
+        return self._inotify_fd is not None
+
+    def start(self):
+        """Começa a observar (as versões atuais são a referência)."""
+        if self._thread is not None:
+            return self
+        self._seen = {name: self.storage.version(name) for name in self.names}
+        self._stop.clear()
+        self._inotify_fd = _open_inotify(getattr(self.storage, 'directory', None))
+        if self._inotify_fd is not None:
+            self._wakeup = os.pipe()
+        logger.debug("Observando %s (%s)", ", ".join(self.names),
+                     "inotify" if self.uses_inotify else f"consulta a cada {self.poll_interval} s")
+        self._thread = threading.Thread(target=self._run, name="habittracker-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Para de observar e espera a thread terminar."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        if self._wakeup is not None:
+            os.write(self._wakeup[1], b'x')
+        self._thread.join()
+        self._thread = None
+        for fd in ([self._inotify_fd] if self._inotify_fd is not None else []) + list(self._wakeup or ()):
+            os.close(fd)
+        self._inotify_fd = self._wakeup = None
+
+    def check(self):
+        """Compara as versões com as últimas vistas e avisa cada documento alterado."""
+        for name in self.names:
+            version = self.storage.version(name)
+            if version == self._seen.get(name):
+                continue
+            self._seen[name] = version
+            try:
+                self.on_change(name)
+            except Exception:
+                logger.exception("Erro ao tratar a alteração de %s", name)
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self.uses_inotify:
+                self._wait_inotify()
+            else:
+                self._stop.wait(self.poll_interval)
+            if not self._stop.is_set():
+                self.check()
+
+    def _wait_inotify(self):
+        """Dorme até um evento de um documento observado (ou até o intervalo de segurança)."""
+        # Sem evento, ainda verifica de tempos em tempos (ex.: diretório recriado)
+        timeout = max(self.poll_interval, 1.0) * 30
+        readable, _, _ = select.select([self._inotify_fd, self._wakeup[0]], [], [], timeout)
+        if self._inotify_fd not in readable or not self._read_events():
+            return
+        # Rajada de gravações (temporário + replace, vários arquivos): uma verificação só
+        self._stop.wait(DEBOUNCE_SECONDS)
+        self._read_events()
+
+    def _read_events(self):
+        """Consome os eventos pendentes. Returns: True se algum foi de um documento observado."""
+        try:
+            buffer = os.read(self._inotify_fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+        relevant = False
+        offset = 0
+        while offset < len(buffer):
+            _, _, _, length = _EVENT_HEADER.unpack_from(buffer, offset)
+            offset += _EVENT_HEADER.size
+            name = buffer[offset:offset + length].rstrip(b'\0').decode('utf-8', 'replace')
+            offset += length
+            relevant = relevant or name in self.names
+        return relevant
+
+
+def _open_inotify(directory):
+    """Descritor inotify observando `directory` (None se indisponível)."""
+    if directory is None or not os.path.isdir(directory):
+        return None
+    # ctypes só é importado quando um watcher começa (não atrasa a CLI)
+    import ctypes
+    try:
+        # Símbolos do próprio processo (a libc já está carregada)
+        libc = ctypes.CDLL(None, use_errno=True)
+        init, add_watch = libc.inotify_init1, libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+
+    fd = init(os.O_NONBLOCK | os.O_CLOEXEC)
+    if fd < 0:
+        return None
+    if add_watch(fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE) < 0:
+        logger.debug("inotify indisponível para %s: %s", directory, os.strerror(ctypes.get_errno()))
+        os.close(fd)
+        return None
+    return fd
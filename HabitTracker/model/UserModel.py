@@ -1,30 +1,78 @@
-import json
+import contextlib
+import contextvars
+import hashlib
+import secrets
+import threading
+import time
 import uuid
-from typing import Tuple, Dict, Any
+from collections import OrderedDict
+from typing import Tuple, Dict, Any, Iterator
 from datetime import datetime
+from model.Storage import get_default_storage
 
 USER_FILE = "usuarios.json"
+# Sessões sem uso por mais tempo que isso expiram (segundos)
+SESSION_IDLE_TIMEOUT = 30 * 60
 
-def load_data(filepath: str, default_value):
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return default_value
-    except json.JSONDecodeError:
-        print(f"Aviso: Arquivo {filepath} corrompido. Usando valor padrão.")
-        return default_value
+# Usuário ativo no contexto atual (thread ou tarefa asyncio), definido por
+# acting_as()/use_session(). Fora deles vale o logged_in_user_id do Model.
+_NO_CONTEXT = object()
+_active_user_id = contextvars.ContextVar("habittracker_active_user_id", default=_NO_CONTEXT)
 
-def save_data(filepath: str, data) -> None:
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=4)
+
+class Session:
+    """Sessão de um usuário autenticado (mantida só em memória)."""
+
+    __slots__ = ('token', 'user_id', 'created_at', 'last_seen')
+
+    def __init__(self, token: str, user_id: str, now: float) -> None:
+        self.token = token
+        self.user_id = user_id
+        self.created_at = now
+        self.last_seen = now
 
 
 class UserModel:
-    """Model de Usuário: Gerencia dados de usuários (R4, R5)."""
-    def __init__(self) -> None:
-        self.users: Dict[str, Dict[str, Any]] = load_data(USER_FILE, {})
+    """
+    Model de Usuário: Gerencia dados de usuários (R4, R5).
+
+    Console e GUI usam um usuário logado por processo (authenticate /
+    logged_in_user_id). Para vários usuários ao mesmo tempo sobre as mesmas
+    instâncias (ex.: servidor HTTP), cada login abre uma sessão com token
+    (open_session) e cada operação roda dentro de use_session(token): o
+    HabitModel enxerga o usuário da sessão na thread/tarefa atual.
+
+    Scripts e tarefas agendadas (CLI) usam tokens de API persistentes
+    (create_api_token): só o hash SHA-256 de cada token é gravado.
+    """
+    def __init__(self, storage=None, session_idle_timeout: float = SESSION_IDLE_TIMEOUT) -> None:
+        # Onde os usuários são guardados (arquivos por padrão, memória nos testes)
+        self.storage = storage if storage is not None else get_default_storage()
+        self.users: Dict[str, Dict[str, Any]] = {}
+        # Índice username -> ID: login sem percorrer todos os usuários
+        self._ids_by_username: Dict[str, str] = {}
+        self._version = None
+        self._load_users()
         self.logged_in_user_id: str | None = None
+        # Sessões por token, da usada há mais tempo para a mais recente
+        self.session_idle_timeout = session_idle_timeout
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._sessions_lock = threading.Lock()
+        # Criação de usuários (verificação do nome + gravação) por uma thread de cada vez
+        self._users_lock = threading.Lock()
+
+    def _load_users(self) -> None:
+        """Lê os usuários do armazenamento (e a versão lida)."""
+        self._version = self.storage.version(USER_FILE)
+        self.users = self.storage.load(USER_FILE, {})
+        self._ids_by_username = {user['username']: user_id for user_id, user in self.users.items()}
+        self._ids_by_token_hash = {token_hash: user_id for user_id, user in self.users.items()
+                                   for token_hash in user.get('api_tokens', ())}
+
+    def _refresh_users(self) -> None:
+        """Relê os usuários se outro processo gravou o arquivo desde a última leitura."""
+        if self.storage.version(USER_FILE) != self._version:
+            self._load_users()
 
     def _generate_user_id(self) -> str:
         """Gera um ID de usuário único usando UUID."""
@@ -51,17 +99,21 @@ class UserModel:
         if len(password) < 4:
             return False, "Erro: Senha deve ter pelo menos 4 caracteres."
         
-        if any(user['username'] == username for user in self.users.values()):
-            return False, f"Erro: Usuário '{username}' já existe."
-
-        user_id = self._generate_user_id()
-        self.users[user_id] = {
-            'username': username, 
-            'password': password, 
-            'id': user_id,
-            'created_at': datetime.now().isoformat()
-        }
-        save_data(USER_FILE, self.users)
+        # Trava também entre processos; relê antes para não sobrescrever usuários criados por outro
+        with self._users_lock, self.storage.lock(USER_FILE):
+            self._refresh_users()
+            if username in self._ids_by_username:
+                return False, f"Erro: Usuário '{username}' já existe."
+
+            user_id = self._generate_user_id()
+            self.users[user_id] = {
+                'username': username, 
+                'password': password, 
+                'id': user_id,
+                'created_at': datetime.now().isoformat()
+            }
+            self._ids_by_username[username] = user_id
+            self._version = self.storage.save(USER_FILE, self.users, indent=4)
         return True, f"Usuário '{username}' criado com sucesso."
 
     def authenticate(self, username: str, password: str) -> Tuple[bool, str]:
@@ -78,15 +130,172 @@ class UserModel:
         if not username or not password:
             return False, "Erro: Nome de usuário e senha são obrigatórios."
         
-        for user_id, user_data in self.users.items():
-            if user_data['username'] == username and user_data['password'] == password:
-                self.logged_in_user_id = user_id
-                return True, f"Usuário '{username}' logado com sucesso."
-        return False, "Erro: Credenciais inválidas."
+        user_id = self.check_credentials(username, password)
+        if user_id is None:
+            return False, "Erro: Credenciais inválidas."
+        self.logged_in_user_id = user_id
+        return True, f"Usuário '{username}' logado com sucesso."
+
+    def check_credentials(self, username: str, password: str) -> str | None:
+        """Retorna o ID do usuário se as credenciais conferem (sem alterar o usuário logado)."""
+        user_id = self._ids_by_username.get(username)
+        if user_id is None:
+            # Usuário criado por outro processo (console, GUI ou servidor)?
+            with self._users_lock:
+                self._refresh_users()
+            user_id = self._ids_by_username.get(username)
+        if user_id is None or not password:
+            return None
+        if not secrets.compare_digest(self.users[user_id]['password'].encode('utf-8'), password.encode('utf-8')):
+            return None
+        return user_id
+
+    # --- Tokens de API (persistentes) ---
+
+    def create_api_token(self, username: str, password: str) -> Tuple[bool, str, str | None]:
+        """
+        Cria um token de API para o usuário (válido até ser revogado).
+        O token só é mostrado agora: o arquivo de usuários guarda apenas o hash.
+
+        Returns:
+            Tupla (sucesso, mensagem, token)
+        """
+        user_id = self.check_credentials(username, password)
+        if user_id is None:
+            return False, "Erro: Credenciais inválidas.", None
+
+        token = secrets.token_urlsafe(32)
+        token_hash = _hash_token(token)
+        with self._users_lock, self.storage.lock(USER_FILE):
+            self._refresh_users()
+            self.users[user_id].setdefault('api_tokens', []).append(token_hash)
+            self._ids_by_token_hash[token_hash] = user_id
+            self._version = self.storage.save(USER_FILE, self.users, indent=4)
+        return True, f"Token de API de '{username}' criado.", token
+
+    def revoke_api_tokens(self, username: str, password: str) -> Tuple[bool, str]:
+        """Revoga todos os tokens de API do usuário."""
+        user_id = self.check_credentials(username, password)
+        if user_id is None:
+            return False, "Erro: Credenciais inválidas."
+
+        with self._users_lock, self.storage.lock(USER_FILE):
+            self._refresh_users()
+            revoked = self.users[user_id].pop('api_tokens', [])
+            for token_hash in revoked:
+                self._ids_by_token_hash.pop(token_hash, None)
+            self._version = self.storage.save(USER_FILE, self.users, indent=4)
+        return True, f"{len(revoked)} token(s) de API de '{username}' revogado(s)."
+
+    def check_api_token(self, token: str | None) -> str | None:
+        """Retorna o ID do usuário dono do token de API (None se inválido)."""
+        if not token:
+            return None
+        token_hash = _hash_token(token)
+        user_id = self._ids_by_token_hash.get(token_hash)
+        if user_id is None:
+            # Token criado por outro processo?
+            with self._users_lock:
+                self._refresh_users()
+            user_id = self._ids_by_token_hash.get(token_hash)
+        return user_id
+
+    def authenticate_token(self, token: str | None) -> Tuple[bool, str]:
+        """Autentica o processo com um token de API (como authenticate)."""
+        user_id = self.check_api_token(token)
+        if user_id is None:
+            return False, "Erro: Token inválido ou revogado."
+        self.logged_in_user_id = user_id
+        return True, f"Usuário '{self.users[user_id]['username']}' logado com sucesso."
+
+    # --- Sessões ---
+
+    def open_session(self, username: str, password: str) -> Tuple[bool, str, str | None]:
+        """
+        Autentica e abre uma sessão, sem alterar o usuário logado do processo.
+
+        Returns:
+            Tupla (sucesso, mensagem, token)
+        """
+        if not username or not password:
+            return False, "Erro: Nome de usuário e senha são obrigatórios.", None
+
+        user_id = self.check_credentials(username, password)
+        if user_id is None:
+            return False, "Erro: Credenciais inválidas.", None
+
+        token = secrets.token_urlsafe(32)
+        now = time.monotonic()
+        with self._sessions_lock:
+            self._expire_sessions(now)
+            self._sessions[token] = Session(token, user_id, now)
+        return True, f"Sessão de '{username}' aberta.", token
+
+    def validate_session(self, token: str | None) -> str | None:
+        """
+        Retorna o ID do usuário da sessão (None se inválida ou expirada).
+        O(1): busca pelo token e renova o prazo da sessão.
+        """
+        if not token:
+            return None
+        now = time.monotonic()
+        with self._sessions_lock:
+            session = self._sessions.get(token)
+            if session is None:
+                return None
+            if now - session.last_seen > self.session_idle_timeout:
+                del self._sessions[token]
+                return None
+            session.last_seen = now
+            self._sessions.move_to_end(token)
+            return session.user_id
+
+    def close_session(self, token: str) -> Tuple[bool, str]:
+        """Encerra a sessão (logout)."""
+        with self._sessions_lock:
+            if self._sessions.pop(token, None) is None:
+                return False, "Sessão não encontrada."
+        return True, "Sessão encerrada."
+
+    def active_sessions(self) -> int:
+        """Quantidade de sessões ainda válidas."""
+        with self._sessions_lock:
+            self._expire_sessions(time.monotonic())
+            return len(self._sessions)
+
+    def _expire_sessions(self, now: float) -> None:
+        """Remove as sessões ociosas; como estão em ordem de uso, para na primeira válida."""
+        while self._sessions:
+            token, session = next(iter(self._sessions.items()))
+            if now - session.last_seen <= self.session_idle_timeout:
+                break
+            del self._sessions[token]
+
+    @contextlib.contextmanager
+    def acting_as(self, user_id: str | None) -> Iterator[str | None]:
+        """Dentro do bloco, a thread/tarefa atual opera como `user_id` (None = ninguém)."""
+        reset_token = _active_user_id.set(user_id)
+        try:
+            yield user_id
+        finally:
+            _active_user_id.reset(reset_token)
+
+    @contextlib.contextmanager
+    def use_session(self, token: str | None) -> Iterator[str | None]:
+        """
+        Dentro do bloco, a thread/tarefa atual opera como o usuário da sessão.
+        Com token inválido ou expirado o bloco roda sem usuário (os Models respondem
+        "Nenhum usuário logado"); o valor do `with` é o ID do usuário ou None.
+        """
+        with self.acting_as(self.validate_session(token)) as user_id:
+            yield user_id
 
     def get_logged_in_user_id(self) -> str | None:
-        """Retorna o ID do usuário logado."""
-        return self.logged_in_user_id
+        """Retorna o ID do usuário logado (o da sessão ativa no contexto, se houver)."""
+        user_id = _active_user_id.get()
+        if user_id is _NO_CONTEXT:
+            return self.logged_in_user_id
+        return user_id
 
     def get_logged_in_username(self) -> str | None:
         """
@@ -96,4 +305,9 @@ class UserModel:
         user_id = self.get_logged_in_user_id()
         if user_id and user_id in self.users:
             return self.users[user_id]['username']
-        return None
\ No newline at end of file
+        return None
+
+
+def _hash_token(token: str) -> str:
+    """Hash gravado no lugar do token de API."""
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
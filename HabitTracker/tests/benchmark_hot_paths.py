@@ -0,0 +1,120 @@
+"""
+Benchmarks (pytest-benchmark) dos caminhos críticos: geração de relatórios,
+persistência do HabitModel, autenticação e exportação de PDF, em dados
+sintéticos pequenos, médios e grandes.
+
+Não faz parte da suíte funcional. Para executar e salvar os resultados:
+    python tests/run_benchmarks.py
+"""
+import contextlib
+import io
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from model.HabitModel import HabitModel
+from model.ReportFactory import ReportFactory
+from model.Storage import JSONFileStorage
+from model.UserModel import UserModel
+from tools.generate_dataset import DatasetGenerator, DEFAULT_PASSWORD
+from view.PDFExporter import PDFExporter
+
+# Data final fixa: os mesmos dados em todas as execuções
+END_DATE = datetime(2025, 6, 30)
+
+DATASET_SIZES = {
+    'small': dict(users=1, habits=5, years=0.25),
+    'medium': dict(users=10, habits=10, years=1),
+    'large': dict(users=50, habits=20, years=3),
+}
+
+
+@pytest.fixture(scope="module", params=list(DATASET_SIZES))
+def dataset(request, tmp_path_factory):
+    """Gera o conjunto de dados sintético de um tamanho em um diretório próprio."""
+    size = request.param
+    directory = tmp_path_factory.mktemp(f"dataset_{size}")
+    generator = DatasetGenerator(seed=2025, end_date=END_DATE, **DATASET_SIZES[size])
+    generator.write_json(directory)
+
+    habits_by_user = dict(generator.iter_habits())
+    return {
+        'size': size,
+        'dir': directory,
+        'habits': [habit for habits in habits_by_user.values() for habit in habits],
+        'first_user': generator.username(0),
+        'last_user': generator.username(generator.users - 1),
+    }
+
+
+@pytest.fixture
+def logged_model(dataset):
+    """HabitModel carregado dos arquivos do conjunto de dados, com o primeiro usuário logado."""
+    storage = JSONFileStorage(dataset['dir'])
+    with contextlib.redirect_stdout(io.StringIO()):
+        user_model = UserModel(storage=storage)
+        user_model.authenticate(dataset['first_user'], DEFAULT_PASSWORD)
+        habit_model = HabitModel(user_model, storage=storage)
+    return habit_model
+
+
+def _report(report_type, habits, *args):
+    return ReportFactory.create_report(report_type, habits, *args).generate_visualization_data()
+
+
+def test_daily_report(benchmark, dataset):
+    benchmark(_report, 'daily', dataset['habits'])
+
+
+def test_weekly_report(benchmark, dataset):
+    benchmark(_report, 'weekly', dataset['habits'])
+
+
+def test_monthly_report(benchmark, dataset):
+    benchmark(_report, 'monthly', dataset['habits'])
+
+
+def test_custom_report(benchmark, dataset):
+    start = (END_DATE - timedelta(days=364)).strftime('%Y-%m-%d')
+    benchmark(_report, 'custom', dataset['habits'], start, END_DATE.strftime('%Y-%m-%d'))
+
+
+def test_create_habit(benchmark, logged_model):
+    # Cada criação regrava o arquivo inteiro: poucas rodadas bastam
+    with contextlib.redirect_stdout(io.StringIO()):
+        benchmark.pedantic(logged_model.create_habit, args=("Benchmark",), rounds=5, iterations=1)
+
+
+def test_mark_habit_done(benchmark, logged_model):
+    habit_id = logged_model.get_all_habits()[0]['id']
+    date = END_DATE.strftime('%Y-%m-%d')
+
+    def unmark():
+        # Fora da medição: garante que a marcação realmente grave o arquivo
+        logged_model.unmark_habit_done(habit_id, date)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        success, _ = benchmark.pedantic(logged_model.mark_habit_done, args=(habit_id, date),
+                                        setup=unmark, rounds=5, iterations=1)
+    assert success
+
+
+def test_authenticate(benchmark, dataset):
+    user_model = UserModel(storage=JSONFileStorage(dataset['dir']))
+    # Último usuário: pior caso da busca
+    success, _ = benchmark(user_model.authenticate, dataset['last_user'], DEFAULT_PASSWORD)
+    assert success
+
+
+def test_export_habit_report(benchmark, dataset, tmp_path):
+    habit = max(dataset['habits'], key=lambda h: len(h['history']))
+    exporter = PDFExporter.get_instance()
+    filename = str(tmp_path / "benchmark.pdf")
+    with contextlib.redirect_stdout(io.StringIO()):
+        benchmark.pedantic(exporter.export_habit_report, args=(habit, filename),
+                           kwargs={'use_cache': False}, rounds=5, iterations=1)
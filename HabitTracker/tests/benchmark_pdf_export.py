@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark do tempo de renderização por PDF do PDFExporter.
+Executa 1, 100 e 1000 exportações no mesmo processo (reaproveitando o Singleton).
+
+Uso: python tests/benchmark_pdf_export.py [--sizes 1 100 1000]
+     python tests/benchmark_pdf_export.py --full-history --years 5
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from view.PDFCache import PDFCache
+from view.PDFExporter import PDFExporter
+
+
+def sample_habit(days=400):
+    """Hábito de exemplo com histórico alternado (um dia sim, outro não)."""
+    today = datetime.now()
+    return {
+        "id": "benchmark",
+        "name": "Beber água",
+        "description": "Beber 2L por dia",
+        "frequency": "daily",
+        "active": True,
+        "created_at": (today - timedelta(days=days)).isoformat(),
+        "history": {(today - timedelta(days=i)).strftime('%Y-%m-%d'): True for i in range(0, days, 2)}
+    }
+
+
+def run(sizes):
+    exporter = PDFExporter.get_instance()
+    habit = sample_habit()
+
+    print(f"{'Exportações':>12} | {'Total (s)':>10} | {'Por PDF (ms)':>12}")
+    print("-" * 40)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "benchmark.pdf")
+        for size in sizes:
+            start = time.perf_counter()
+            # Silenciar as mensagens de progresso do exportador
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _ in range(size):
+                    exporter.export_habit_report(habit, filename, use_cache=False)
+            total = time.perf_counter() - start
+            print(f"{size:>12} | {total:>10.3f} | {total / size * 1000:>12.2f}")
+
+        # Reexportação do mesmo hábito servida pelo cache de PDFs
+        cache = PDFCache(os.path.join(tmp_dir, "cache"))
+        original_cache, exporter.cache = exporter.cache, cache
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                exporter.export_habit_report(habit, filename)
+                start = time.perf_counter()
+                for _ in range(100):
+                    exporter.export_habit_report(habit, filename)
+            total = time.perf_counter() - start
+        finally:
+            exporter.cache = original_cache
+        print(f"{'cache (100)':>12} | {total:>10.3f} | {total / 100 * 1000:>12.2f}")
+
+
+def run_full_history(years):
+    """Mede tempo e pico de memória da exportação com histórico completo."""
+    exporter = PDFExporter.get_instance()
+
+    print(f"{'Anos':>6} | {'Páginas':>8} | {'Tempo (s)':>10} | {'Pico (MB)':>10}")
+    print("-" * 44)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "benchmark_full.pdf")
+        for n in years:
+            habit = sample_habit(days=365 * n)
+            tracemalloc.start()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                pages = exporter.export_habit_report(habit, filename, full_history=True, use_cache=False)
+            total = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{n:>6} | {pages:>8} | {total:>10.3f} | {peak / 1024 / 1024:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de exportação de PDF")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 1000])
+    parser.add_argument("--full-history", action="store_true",
+                        help="Mede a exportação do histórico completo (tempo e pico de memória)")
+    parser.add_argument("--years", type=int, nargs="+", default=[1, 5, 10])
+    args = parser.parse_args()
+    if args.full_history:
+        run_full_history(args.years)
+    else:
+        run(args.sizes)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
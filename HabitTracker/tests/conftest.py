@@ -1,7 +1,9 @@
 import pytest
-import json
 import os
+import sys
 from datetime import datetime
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from model.Storage import InMemoryStorage, set_default_storage
 
 def pytest_configure(config):
     """Registrar marcas customizadas"""
@@ -12,32 +14,41 @@ def pytest_configure(config):
         "markers", "visualization: Testes de visualizacao"
     )
     config.addinivalue_line(
-        "markers", "report: Testes de geracao de relatorios"
+        "markers", "reports: Testes de geracao de relatorios"
     )
+    config.addinivalue_line(
+        "markers", "storage: Testes de armazenamento e dados compartilhados"
+    )
+    config.addinivalue_line(
+        "markers", "observability: Testes de logging, metricas e perfis"
+    )
+    config.addinivalue_line(
+        "markers", "api: Testes da API HTTP e de sessoes concorrentes"
+    )
+    config.addinivalue_line(
+        "markers", "cli: Testes da linha de comando"
+    )
+    config.addinivalue_line(
+        "markers", "pdf: Testes da exportacao de PDF"
+    )
+
+@pytest.fixture(autouse=True)
+def storage():
+    """
+    Armazenamento em memória próprio de cada teste.
+    Os Models criados sem `storage` (inclusive no setup_method) usam este
+    backend: nenhum teste lê ou grava os arquivos JSON do diretório de
+    trabalho, e os testes podem rodar em paralelo (pytest -n auto).
+    """
+    memory = InMemoryStorage()
+    previous = set_default_storage(memory)
+    yield memory
+    set_default_storage(previous)
 
 @pytest.fixture
-def clean_json_files():
-    """Limpa os arquivos JSON antes de cada teste"""
-    test_files = ['usuarios.json', 'habitos_registros.json']
-    
-    # Backup dos arquivos originais
-    backups = {}
-    for file in test_files:
-        if os.path.exists(file):
-            with open(file, 'r', encoding='utf-8') as f:
-                backups[file] = f.read()
-    
-    # Limpa os arquivos para teste
-    for file in test_files:
-        with open(file, 'w', encoding='utf-8') as f:
-            json.dump({} if 'usuarios' in file else [], f)
-    
-    yield
-    
-    # Restaura os arquivos originais
-    for file, content in backups.items():
-        with open(file, 'w', encoding='utf-8') as f:
-            f.write(content)
+def clean_json_files(storage):
+    """Dados vazios no início do teste (o armazenamento em memória já começa vazio)"""
+    return storage
 
 @pytest.fixture
 def sample_habit_data():
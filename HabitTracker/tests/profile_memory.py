@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Perfil de memória (tracemalloc) do carregamento, dos relatórios e da
+exportação de PDF em conjuntos de dados sintéticos de tamanho crescente.
+
+Para cada etapa registra o pico (maior alocação durante a etapa) e a memória
+retida (o que continua alocado enquanto o resultado existe), em bytes e em
+bytes por hábito-dia. Salva a tabela em test_reports/memory_<data>_<hora>.json
+e termina com código 1 se alguma etapa passar do orçamento por hábito-dia.
+
+Uso:
+    python tests/profile_memory.py                       # todos os tamanhos
+    python tests/profile_memory.py --sizes small medium
+    python tests/profile_memory.py --budget-scale 0.5    # orçamentos mais rígidos
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from model.HabitModel import HabitModel
+from model.ReportFactory import ReportFactory
+from model.Storage import JSONFileStorage
+from model.UserModel import UserModel
+from tools.generate_dataset import DatasetGenerator, DEFAULT_PASSWORD
+from view.PDFExporter import PDFExporter
+
+REPORTS_DIR = "test_reports"
+
+DATASET_SIZES = {
+    'small': dict(users=5, habits=5, years=1),
+    'medium': dict(users=20, habits=10, years=2),
+    'large': dict(users=50, habits=10, years=5),
+}
+
+# Orçamento de pico por hábito-dia (bytes). Um hábito-dia é um dia entre a
+# criação do hábito e o fim do conjunto de dados, marcado ou não.
+BUDGETS = {
+    'load': 80,
+    'daily': 8,
+    'weekly': 8,
+    'monthly': 8,
+    'custom': 48,
+    # O PDF tem um custo fixo (fontes, estilos, gráficos) que pesa mais em históricos curtos
+    'pdf': 4000,
+    'pdf_full': 4000,
+}
+
+
+def measure(step):
+    """
+    Executa `step()` medindo a memória alocada em relação ao início.
+
+    Returns:
+        Tupla (resultado, pico em bytes, retido em bytes)
+    """
+    gc.collect()
+    baseline = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    result = step()
+    current, peak = tracemalloc.get_traced_memory()
+    return result, peak - baseline, current - baseline
+
+
+def habit_days(habits, end_date):
+    """Soma, para cada hábito, dos dias desde a criação até `end_date`."""
+    total = 0
+    for habit in habits:
+        created = datetime.fromisoformat(habit['created_at'])
+        total += max((end_date - created).days, 0) + 1
+    return total
+
+
+def profile_dataset(size, directory):
+    """Gera o conjunto de dados `size` em `directory` e mede cada etapa."""
+    generator = DatasetGenerator(seed=2025, **DATASET_SIZES[size])
+    stats = generator.write_json(directory)
+    storage = JSONFileStorage(directory)
+    results = []
+
+    def record(step_name, unit_days, peak, retained):
+        results.append({
+            'size': size,
+            'step': step_name,
+            'habit_days': unit_days,
+            'peak_bytes': peak,
+            'retained_bytes': retained,
+            'peak_per_habit_day': peak / unit_days if unit_days else 0.0,
+            'budget_per_habit_day': BUDGETS[step_name],
+        })
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        model, peak, retained = measure(lambda: HabitModel(_logged_user(storage, generator), storage=storage))
+        habits = [habit for user_habits in model.data.values() for habit in user_habits]
+        days = habit_days(habits, generator.end_date)
+        record('load', days, peak, retained)
+
+        first_day = min(habit['created_at'][:10] for habit in habits)
+        last_day = generator.end_date.strftime('%Y-%m-%d')
+        for report_type in ('daily', 'weekly', 'monthly', 'custom'):
+            args = (first_day, last_day) if report_type == 'custom' else ()
+            report = ReportFactory.create_report(report_type, habits, *args)
+            data, peak, retained = measure(report.generate_visualization_data)
+            record(report_type, days, peak, retained)
+            del data
+
+        # PDF do hábito com mais registros (o pior caso do conjunto)
+        exporter = PDFExporter.get_instance()
+        habit = max(habits, key=lambda h: len(h.get('history', {})))
+        days = habit_days([habit], generator.end_date)
+        filename = os.path.join(directory, "profile.pdf")
+        for step_name, full_history in (('pdf', False), ('pdf_full', True)):
+            _, peak, retained = measure(lambda: exporter.export_habit_report(
+                habit, filename, full_history=full_history, use_cache=False))
+            record(step_name, days, peak, retained)
+
+    del model
+    return stats, results
+
+
+def _logged_user(storage, generator):
+    user_model = UserModel(storage=storage)
+    user_model.authenticate(generator.username(0), DEFAULT_PASSWORD)
+    return user_model
+
+
+def print_table(results):
+    print(f"{'Tamanho':<8} | {'Etapa':<9} | {'Hábito-dias':>11} | {'Pico (MB)':>9} | "
+          f"{'Retido (MB)':>11} | {'B/hábito-dia':>12} | {'Orçamento':>9}")
+    print("-" * 89)
+    for row in results:
+        flag = " ❌" if row['peak_per_habit_day'] > row['budget_per_habit_day'] else ""
+        print(f"{row['size']:<8} | {row['step']:<9} | {row['habit_days']:>11} | "
+              f"{row['peak_bytes'] / 1024 / 1024:>9.2f} | {row['retained_bytes'] / 1024 / 1024:>11.2f} | "
+              f"{row['peak_per_habit_day']:>12.1f} | {row['budget_per_habit_day']:>9.0f}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perfil de memória do Habit Tracker")
+    parser.add_argument("--sizes", nargs="+", choices=list(DATASET_SIZES), default=list(DATASET_SIZES),
+                        help="Tamanhos de dados a executar (padrão: todos)")
+    parser.add_argument("--budget-scale", type=float, default=1.0,
+                        help="Multiplica todos os orçamentos por este fator")
+    args = parser.parse_args()
+
+    # Caminhos relativos à raiz do projeto (como em run_all_test.py)
+    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    for step_name in BUDGETS:
+        BUDGETS[step_name] *= args.budget_scale
+
+    # O Singleton é criado fora da medição
+    PDFExporter.get_instance()
+
+    results = []
+    datasets = {}
+    tracemalloc.start()
+    try:
+        for size in args.sizes:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                stats, rows = profile_dataset(size, tmp_dir)
+            datasets[size] = {key: stats[key] for key in ('users', 'habits', 'entries', 'bytes')}
+            results.extend(rows)
+            print(f"[{size}] {stats['habits']} hábitos, {stats['entries']} registros")
+    finally:
+        tracemalloc.stop()
+
+    print()
+    print_table(results)
+
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    output = os.path.join(REPORTS_DIR, f"memory_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'created_at': datetime.now().isoformat(), 'datasets': datasets,
+                   'budgets': BUDGETS, 'results': results}, f, indent=4, ensure_ascii=False)
+    print(f"\n✅ Resultados salvos em: {output}")
+
+    over = [row for row in results if row['peak_per_habit_day'] > row['budget_per_habit_day']]
+    if over:
+        print(f"\n❌ {len(over)} etapa(s) acima do orçamento de memória por hábito-dia")
+        return 1
+    print("\n✅ Todas as etapas dentro do orçamento")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -24,7 +24,12 @@ def main():
     comandos = [
         f"{python_cmd} tests/test_habit_crud.py",
         f"{python_cmd} tests/test_habit_visualization.py -v -s",
-        f"{python_cmd} tests/test_report_generation.py -v -s"
+        f"{python_cmd} tests/test_report_generation.py -v -s",
+        f"{python_cmd} tests/test_storage.py",
+        f"{python_cmd} tests/test_observability.py",
+        f"{python_cmd} tests/test_api_server.py",
+        f"{python_cmd} tests/test_command_line.py",
+        f"{python_cmd} tests/test_pdf_export.py"
     ]
     
     # Executar cada comando em sequência
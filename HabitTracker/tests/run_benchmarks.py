@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Executa os benchmarks (tests/benchmark_hot_paths.py) e salva o resultado em
+test_reports/benchmark_<data>_<hora>.json.
+
+Uso:
+    python tests/run_benchmarks.py                       # executa e salva
+    python tests/run_benchmarks.py --compare latest      # compara com a execução anterior
+    python tests/run_benchmarks.py --compare base.json --threshold 15
+    python tests/run_benchmarks.py --compare base.json --current novo.json   # só compara
+
+No modo de comparação, termina com código 1 se a mediana de algum benchmark
+piorar mais que o limite (em %).
+"""
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+REPORTS_DIR = "test_reports"
+BENCHMARK_FILE = os.path.join("tests", "benchmark_hot_paths.py")
+
+
+def latest_result(exclude=None):
+    """Arquivo de resultado mais recente em test_reports/ (ignorando `exclude`)."""
+    files = sorted(glob.glob(os.path.join(REPORTS_DIR, "benchmark_*.json")))
+    files = [f for f in files if os.path.abspath(f) != os.path.abspath(exclude or '')]
+    return files[-1] if files else None
+
+
+def run_benchmarks(sizes):
+    """Executa o pytest-benchmark e retorna (código de saída, arquivo JSON)."""
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    output = os.path.join(REPORTS_DIR, f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    command = [sys.executable, "-m", "pytest", BENCHMARK_FILE, "-q",
+               f"--benchmark-json={output}", "--benchmark-columns=min,median,mean,rounds"]
+    if sizes:
+        command += ["-k", " or ".join(sizes)]
+
+    print(f"[Executando]: {' '.join(command)}")
+    return subprocess.run(command).returncode, output
+
+
+def load_medians(path):
+    """Mapa {nome do benchmark: mediana em segundos}."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return {bench['name']: bench['stats']['median'] for bench in data.get('benchmarks', [])}
+
+
+def compare(baseline_path, current_path, threshold):
+    """
+    Compara as medianas de duas execuções.
+
+    Returns:
+        Lista de (nome, base, atual, variação %) dos benchmarks que regrediram
+    """
+    baseline = load_medians(baseline_path)
+    current = load_medians(current_path)
+
+    print(f"\n[Comparação]: {baseline_path} -> {current_path} (limite: +{threshold:.0f}%)")
+    print(f"{'Benchmark':<40} | {'Base (ms)':>10} | {'Atual (ms)':>10} | {'Variação':>9}")
+    print("-" * 78)
+
+    regressions = []
+    for name in sorted(current):
+        if name not in baseline:
+            print(f"{name:<40} | {'-':>10} | {current[name] * 1000:>10.3f} | {'novo':>9}")
+            continue
+        change = (current[name] - baseline[name]) / baseline[name] * 100 if baseline[name] else 0.0
+        flag = " ❌" if change > threshold else ""
+        print(f"{name:<40} | {baseline[name] * 1000:>10.3f} | {current[name] * 1000:>10.3f} | "
+              f"{change:>+8.1f}%{flag}")
+        if change > threshold:
+            regressions.append((name, baseline[name], current[name], change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks dos caminhos críticos do Habit Tracker")
+    parser.add_argument("--sizes", nargs="+", choices=["small", "medium", "large"],
+                        help="Tamanhos de dados a executar (padrão: todos)")
+    parser.add_argument("--compare", metavar="BASE",
+                        help="Resultado de referência (arquivo JSON ou 'latest')")
+    parser.add_argument("--current", metavar="ATUAL",
+                        help="Compara este resultado em vez de executar os benchmarks")
+    parser.add_argument("--threshold", type=float, default=20.0,
+                        help="Regressão máxima aceita na mediana, em %% (padrão: 20)")
+    args = parser.parse_args()
+
+    # Arquivos informados são relativos ao diretório de onde o script foi chamado
+    if args.current:
+        args.current = os.path.abspath(args.current)
+    if args.compare and args.compare != 'latest':
+        args.compare = os.path.abspath(args.compare)
+        if not os.path.exists(args.compare):
+            parser.error(f"resultado de referência não encontrado: {args.compare}")
+
+    # Caminhos relativos à raiz do projeto (como em run_all_test.py)
+    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    if args.current:
+        current = args.current
+    else:
+        code, current = run_benchmarks(args.sizes)
+        if code != 0:
+            print(f"\n❌ Benchmarks falharam (código: {code})")
+            return code
+        print(f"\n✅ Resultados salvos em: {current}")
+
+    if not args.compare:
+        return 0
+    baseline = latest_result(exclude=current) if args.compare == 'latest' else args.compare
+    if baseline is None or not os.path.exists(baseline):
+        print("\n⚠️ Nenhum resultado de referência encontrado para comparar.")
+        return 0
+
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(f"\n❌ {len(regressions)} benchmark(s) pioraram mais de {args.threshold:.0f}%")
+        return 1
+    print("\n✅ Nenhuma regressão acima do limite")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
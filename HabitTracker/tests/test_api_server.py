@@ -0,0 +1,184 @@
+import pytest
+import asyncio
+import os
+import sys
+import threading
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from model.HabitModel import HabitModel, HABIT_DATA_FILE
+from model.UserModel import UserModel
+from model.ReportFactory import ReportFactory
+from controller.HabitController import HabitController
+from tools.load_test import HTTPConnection
+from view.APIServer import APIServer
+
+class TestAPIServer:
+    """
+    Testes da API HTTP, das sessões e dos Models sob acesso concorrente (CTA-029 a CTA-031)
+    """
+
+    def setup_method(self):
+        """Configuração antes de cada teste"""
+        self.user_model = UserModel()
+        self.user_model.create_user("test_user", "test_pass")
+        self.user_model.authenticate("test_user", "test_pass")
+
+        self.habit_model = HabitModel(self.user_model)
+        self.habit_controller = HabitController(self.habit_model)
+
+    @pytest.mark.api
+    def test_cta_029_http_api(self):
+        """
+        CTA-029: API HTTP/JSON
+
+        Dado que: O servidor da API está no ar sobre o HabitController
+        Quando: Um cliente autenticado envia requisições em pipeline na mesma conexão
+        Então: As respostas chegam em ordem, os dados mudam no model e os relatórios vêm do pool
+        """
+        print("\n🧪 Executando CTA-029: API HTTP/JSON")
+
+        async def scenario():
+            server = APIServer(self.habit_controller, self.user_model, port=0, report_workers=1)
+            await server.start()
+            try:
+                anonymous = await HTTPConnection.open(server.host, server.port)
+                status, body = await anonymous.request('GET', '/habits')
+                assert status == 401 and not body['success']
+                await anonymous.close()
+
+                client = await HTTPConnection.open(server.host, server.port, ("test_user", "test_pass"))
+                # Três requisições antes de ler qualquer resposta
+                client.send('POST', '/habits', {'name': "Ler", 'frequency': 'daily'})
+                client.send('GET', '/habits')
+                client.send('PUT', '/habits')
+                await client.writer.drain()
+                assert (await client.read_response())[0] == 201
+                status, body = await client.read_response()
+                assert status == 200 and [h['name'] for h in body['habits']] == ["Ler"]
+                assert (await client.read_response())[0] == 405
+
+                habit_id = body['habits'][0]['id']
+                assert (await client.request('POST', f'/habits/{habit_id}/checkins', {'date': '2025-11-14'}))[0] == 201
+                assert (await client.request('POST', f'/habits/{habit_id}/checkins', {'date': '2025-11-14'}))[0] == 400
+                status, body = await client.request('GET', '/reports')
+                assert status == 200 and body['reports']['daily']['total_habits'] == 1
+                status, body = await client.request('GET', '/reports/custom?start=2025-11-10&end=2025-11-16')
+                assert status == 200 and body['report']['total_completed'] == 1
+                assert (await client.request('GET', '/reports/custom'))[0] == 400
+                assert (await client.request('GET', '/nada'))[0] == 404
+                await client.close()
+            finally:
+                await server.close()
+
+        asyncio.run(scenario())
+        assert self.habit_model.data["test_user"][0]['history'] == {'2025-11-14': True}
+
+        print("   ✅ CTA-029 PASSOU")
+
+    @pytest.mark.api
+    def test_cta_030_concurrent_sessions(self):
+        """
+        CTA-030: Várias sessões sobre as mesmas instâncias dos Models
+
+        Dado que: Dois usuários abriram sessões no mesmo UserModel
+        Quando: Cada um cria hábitos em sua própria thread, ao mesmo tempo
+        Então: Cada sessão vê só os próprios hábitos, o login do processo não muda e sessões ociosas expiram
+        """
+        print("\n🧪 Executando CTA-030: Sessões concorrentes")
+
+        self.user_model.create_user("outro", "4321")
+        self.user_model.session_idle_timeout = 0.2
+        _, _, token_a = self.user_model.open_session("test_user", "test_pass")
+        _, _, token_b = self.user_model.open_session("outro", "4321")
+        assert self.user_model.open_session("outro", "errada")[0] is False
+        assert self.user_model.active_sessions() == 2
+
+        barrier = threading.Barrier(2)
+
+        def work(token, prefix):
+            with self.user_model.use_session(token):
+                barrier.wait()
+                for i in range(5):
+                    self.habit_controller.handle_create_habit_request(f"{prefix} {i}")
+
+        threads = [threading.Thread(target=work, args=(token_a, "A")),
+                   threading.Thread(target=work, args=(token_b, "B"))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with self.user_model.use_session(token_b) as user_id:
+            assert user_id == self.user_model._ids_by_username["outro"]
+            assert {h['name'][0] for h in self.habit_controller.handle_read_habits_request()} == {"B"}
+        assert len(self.habit_model.data["test_user"]) == 5
+        # Fora das sessões continua valendo o login do processo
+        assert self.user_model.get_logged_in_username() == "test_user"
+
+        assert self.user_model.close_session(token_a)[0] is True
+        with self.user_model.use_session(token_a) as user_id:
+            assert user_id is None
+            assert self.habit_controller.handle_create_habit_request("Sem sessão")[0] is False
+
+        time.sleep(0.3)
+        assert self.user_model.validate_session(token_b) is None
+        assert self.user_model.active_sessions() == 0
+
+        print("   ✅ CTA-030 PASSOU")
+
+    @pytest.mark.api
+    def test_cta_031_reports_concurrent_with_checkins(self):
+        """
+        CTA-031: Relatórios em paralelo com registros
+
+        Dado que: Um hábito recebe registros de várias threads
+        Quando: Outras threads geram relatórios sobre os snapshots ao mesmo tempo
+        Então: Nenhum leitor falha, o snapshot antigo não muda e nenhum registro se perde
+        """
+        print("\n🧪 Executando CTA-031: Relatórios concorrentes")
+
+        self.habit_controller.handle_create_habit_request("Correr")
+        self.habit_controller.handle_create_habit_request("Ler")
+        before = self.habit_controller.handle_read_habits_request()
+        habit_id = before[0]['id']
+        errors = []
+        writers_done = threading.Event()
+
+        def mark(offset):
+            try:
+                for day in range(offset, 200, 4):
+                    date = f"2025-{day // 28 + 1:02d}-{day % 28 + 1:02d}"
+                    success, message = self.habit_controller.handle_mark_done_request(habit_id, date)
+                    assert success, message
+            except Exception as e:
+                errors.append(e)
+
+        def report():
+            try:
+                while not writers_done.is_set():
+                    habits = self.habit_controller.handle_read_habits_request()
+                    ReportFactory.create_report('custom', habits, "2025-01-01", "2025-12-31") \
+                        .generate_visualization_data()
+            except Exception as e:
+                errors.append(e)
+
+        readers = [threading.Thread(target=report) for _ in range(2)]
+        writers = [threading.Thread(target=mark, args=(offset,)) for offset in range(4)]
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        writers_done.set()
+        for thread in readers:
+            thread.join()
+
+        assert errors == []
+        assert before[0]['history'] == {}, "Snapshot entregue antes dos registros não deveria mudar"
+        assert len(self.habit_controller.handle_read_habits_request()[0]['history']) == 200
+        saved = self.habit_model.storage.load(HABIT_DATA_FILE, {})
+        assert len(saved["test_user"][0]['history']) == 200
+
+        print("   ✅ CTA-031 PASSOU")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,104 @@
+import pytest
+import io
+import json
+import os
+import subprocess
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from model.HabitModel import HabitModel
+from model.UserModel import UserModel
+from model.Storage import DATA_DIR_ENV
+from controller.HabitController import HabitController
+
+class TestCommandLine:
+    """
+    Testes da linha de comando não interativa (CTA-034)
+    """
+
+    def setup_method(self):
+        """Configuração antes de cada teste"""
+        self.user_model = UserModel()
+        self.user_model.create_user("test_user", "test_pass")
+        self.user_model.authenticate("test_user", "test_pass")
+
+        self.habit_model = HabitModel(self.user_model)
+        self.habit_controller = HabitController(self.habit_model)
+
+    @pytest.mark.cli
+    def test_cta_034_command_line(self, tmp_path, monkeypatch):
+        """
+        CTA-034: Linha de comando não interativa
+
+        Dado que: Um token de API criado pela própria linha de comando
+        Quando: Comandos avulsos e um lote lido da entrada padrão usam o token
+        Então: As ações são aplicadas, a saída JSON é válida, erros dão código != 0
+               e nem Tk nem reportlab são importados
+        """
+        print("\n🧪 Executando CTA-034: Linha de comando")
+        from view.CommandLineView import run_cli, EXIT_OK, EXIT_FAILURE, EXIT_AUTH, TOKEN_ENV, PASSWORD_ENV
+
+        def cli(*argv, stdin="", environ=None):
+            out, err = io.StringIO(), io.StringIO()
+            status = run_cli(list(argv), io.StringIO(stdin), out, err, env if environ is None else environ)
+            return status, out.getvalue(), err.getvalue()
+
+        env = {}
+        assert cli("habit", "list")[0] == EXIT_AUTH
+        status, token, _ = cli("token", "create", "--user", "test_user", environ={PASSWORD_ENV: "test_pass"})
+        assert status == EXIT_OK
+        env = {TOKEN_ENV: token.strip()}
+
+        assert cli("habit", "add", "Correr")[0] == EXIT_OK
+        batch = ("habit mark correr --date 2025-03-01 --json\n"
+                 "# comentário\n"
+                 "habit mark Nada\n"
+                 "habit mark Correr --date 2025-03-01 --json\n"
+                 "habit list --json\n")
+        status, out, err = cli("batch", stdin=batch)
+        assert status == EXIT_FAILURE
+        results = [json.loads(line) for line in out.splitlines()]
+        assert [r['success'] for r in results] == [True, False, True]
+        assert results[-1]['habits'][0]['history'] == {"2025-03-01": True}
+        assert "Nada" in err
+
+        # Aspas sem fechamento derrubam só a linha; pedir ajuda não é falha
+        status, out, err = cli("batch", stdin='habit add "Ler\nhabit list --json\n')
+        assert status == EXIT_FAILURE
+        assert "Linha 1:" in err
+        assert len(json.loads(out)['habits']) == 1
+        status, out, err = cli("batch", "--stop-on-error", stdin='habit add "Ler\nhabit list --json\n')
+        assert status == EXIT_FAILURE and out == ""
+        assert cli("batch", stdin="habit list --help\nhabit list --json\n")[0] == EXIT_OK
+
+        # PDF de todos os hábitos em lote; falha de gravação vira "Erro: ..." e não traceback
+        monkeypatch.chdir(tmp_path)  # cache de PDF (.cache_pdf) fora do projeto
+        status, out, err = cli("batch", stdin=f"export pdf --all --workers 1 --out {tmp_path / 'pdfs'} --json\n")
+        assert status == EXIT_OK, err
+        assert [os.path.basename(f) for f in json.loads(out)['files']] == ["relatorio_Correr.pdf"]
+        assert (tmp_path / "pdfs" / "test_user" / "relatorio_Correr.pdf").exists()
+        status, out, err = cli("export", "pdf", "--all", "--workers", "1", "--out", "/proc/habittracker/pdfs")
+        assert status == EXIT_FAILURE and err.startswith("Erro: ")
+
+        status, out, _ = cli("report", "weekly", "--json")
+        assert status == EXIT_OK and json.loads(out)['report'] == "weekly"
+
+        assert cli("token", "revoke", "--user", "test_user", environ={PASSWORD_ENV: "test_pass"})[0] == EXIT_OK
+        assert cli("habit", "list")[0] == EXIT_AUTH
+
+        # Inicialização enxuta: a interface gráfica e o PDF não são carregados
+        code = ("import runpy, sys\n"
+                "sys.argv = ['HabitTracker.py', 'habit', 'list']\n"
+                "try:\n    runpy.run_path('HabitTracker.py', run_name='__main__')\n"
+                "except SystemExit:\n    pass\n"
+                "print(sorted(m for m in ('tkinter', 'reportlab', 'matplotlib') if m in sys.modules))")
+        environ = {k: v for k, v in os.environ.items() if k != TOKEN_ENV}
+        environ[DATA_DIR_ENV] = str(tmp_path)
+        project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run([sys.executable, "-c", code], cwd=project_dir, env=environ,
+                                capture_output=True, text=True)
+        assert result.stdout.strip() == "[]", result.stderr
+
+        print("   ✅ CTA-034 PASSOU")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -1,10 +1,10 @@
 import pytest
-import json
 import os
 import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from model.HabitModel import HabitModel, save_data, HABIT_DATA_FILE
+from model.HabitModel import HabitModel, HABIT_DATA_FILE
 from model.UserModel import UserModel
+from model.HabitArchive import HabitArchive
 from controller.HabitController import HabitController
 
 class TestHabitCRUD:
@@ -73,14 +73,13 @@ class TestHabitCRUD:
         assert 'id' in created_habit
         
         # Verificar persistência no JSON
-        with open('habitos_registros.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            username = self.user_model.get_logged_in_username()
-            user_habits = data.get(username, [])
-            
-            assert len(user_habits) > 0, "Deveria ter hábitos no JSON"
-            json_habit = next((h for h in user_habits if h['name'] == sample_habit_data["name"]), None)
-            assert json_habit is not None, "Hábito não encontrado no JSON"
+        data = self.habit_model.storage.load(HABIT_DATA_FILE, {})
+        username = self.user_model.get_logged_in_username()
+        user_habits = data.get(username, [])
+        
+        assert len(user_habits) > 0, "Deveria ter hábitos no JSON"
+        json_habit = next((h for h in user_habits if h['name'] == sample_habit_data["name"]), None)
+        assert json_habit is not None, "Hábito não encontrado no JSON"
         
         print("   ✅ CTA-001 PASSOU")
     
@@ -187,7 +186,7 @@ class TestHabitCRUD:
         # CORREÇÃO: Limpar explicitamente antes de criar
         username = self.user_model.get_logged_in_username()
         self.habit_model.data[username] = []
-        save_data(HABIT_DATA_FILE, self.habit_model.data)
+        self.habit_model.storage.save(HABIT_DATA_FILE, self.habit_model.data)
         
         # Criar hábito
         success, msg = self.habit_model.create_habit(
@@ -220,5 +219,46 @@ class TestHabitCRUD:
         print(f"   ✅ Hábito '{habit_name}' deletado com sucesso!")
         print("   ✅ CTA-004 PASSOU")
 
+    @pytest.mark.crud
+    def test_cta_020_vacuum_removes_dead_entries(self, clean_json_files):
+        """
+        CTA-020: Compactação (vacuum) dos dados de hábitos
+
+        Dado que: Existem registros False no histórico e um hábito inativo antigo
+        Quando: O teste chama vacuum com limite de arquivamento
+        Então: Os registros falsos são removidos e o hábito inativo é arquivado
+        """
+        print("\n🧪 Executando CTA-020: Compactação de dados")
+
+        username = self.user_model.get_logged_in_username()
+        self.habit_model.data[username] = []
+
+        self.habit_model.create_habit(name="Ativo", frequency="daily")
+        self.habit_model.create_habit(name="Abandonado", frequency="daily")
+        active_habit, old_habit = self.habit_model.get_all_habits()
+
+        # Registros antigos de desmarcação (tombstones)
+        active_habit['history'] = {"2025-11-01": True, "2025-11-02": False, "2025-11-03": False}
+        old_habit['active'] = False
+        old_habit['deactivated_at'] = "2020-01-01T00:00:00"
+        old_habit['created_at'] = "2019-01-01T00:00:00"
+        self.habit_model.storage.save(HABIT_DATA_FILE, self.habit_model.data)
+
+        stats = self.habit_controller.handle_vacuum_request(archive_after_days=90)
+
+        assert stats['entries_removed'] == 2, f"Deveria remover 2 registros: {stats}"
+        assert stats['habits_archived'] == 1, f"Deveria arquivar 1 hábito: {stats}"
+        assert stats['bytes_reclaimed'] > 0, "Arquivo deveria diminuir"
+
+        habits = self.habit_model.get_all_habits()
+        assert [h['name'] for h in habits] == ["Ativo"]
+        assert habits[0]['history'] == {"2025-11-01": True}
+
+        archive = HabitArchive()
+        assert [h['name'] for h in archive.get_habits(username)] == ["Abandonado"]
+
+        print(f"   ✅ {stats['bytes_reclaimed']} bytes recuperados")
+        print("   ✅ CTA-020 PASSOU")
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "-s"])
\ No newline at end of file
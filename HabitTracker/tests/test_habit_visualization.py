@@ -6,6 +6,17 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from model.HabitModel import HabitModel
 from model.UserModel import UserModel
 from controller.HabitController import HabitController
+from controller.ReportController import ReportController
+from model.ReportFactory import ReportFactory
+from model.HabitModel import HABIT_DATA_FILE
+from view.ReportExporters import ReportExporter
+
+
+class SilentReportView:
+    """View mínima para o ReportController (sem interação com console)."""
+    def render_reports(self, report_data):
+        pass
+
 
 class TestHabitVisualization:
     """
@@ -18,11 +29,12 @@ class TestHabitVisualization:
         # Criar UserModel
         self.user_model = UserModel()
         
-        # Usar usuário que JÁ EXISTE no usuarios.json
+        # Criar usuário de teste (cada teste começa com o armazenamento vazio)
         test_username = "teste"
-        test_password = "123"
+        test_password = "1234"
+        self.user_model.create_user(test_username, test_password)
         
-        # Fazer login com usuário existente
+        # Fazer login
         success, msg = self.user_model.authenticate(test_username, test_password)
         
         if not success:
@@ -249,5 +261,235 @@ class TestHabitVisualization:
         print(f"\n✅ CTA-009 passou: Cor do hábito atualizada corretamente para todas as cores disponíveis")
         print(f"   Cores testadas: {available_colors[1:]}")  # Excluir 'white' e 'blue' que já eram padrão
 
+    @pytest.mark.visualization
+    def test_cta_019_unmark_habit_done(self, clean_json_files):
+        """
+        CTA-019: Desmarcar conclusão de hábito
+
+        Dado que: Existe um hábito marcado como concluído em uma data
+        Quando: Desmarco o hábito via HabitController
+        Então: A data é removida do histórico, persistida e os observers são notificados
+        """
+        success, msg = self.habit_model.create_habit(
+            name="Habito para Desmarcar",
+            description="Para testar desmarcacao",
+            frequency="daily"
+        )
+        assert success == True, f"Falha ao criar habito: {msg}"
+
+        habit_id = self.habit_model.get_all_habits()[-1]['id']
+        test_date = "2025-11-10"
+        success, msg = self.habit_controller.handle_mark_done_request(habit_id, test_date)
+        assert success == True, f"Falha ao marcar habito: {msg}"
+
+        events = []
+
+        class EventObserver:
+            def update(self, subject, event=None):
+                events.append(event)
+
+        self.habit_model.attach(EventObserver())
+
+        success, msg = self.habit_controller.handle_unmark_done_request(habit_id, test_date)
+        assert success == True, f"Falha ao desmarcar habito: {msg}"
+
+        # Entrada removida (sem registro False no histórico)
+        habit = [h for h in self.habit_model.get_all_habits() if h['id'] == habit_id][0]
+        assert test_date not in habit['history'], "Data deveria ter sido removida do historico"
+
+        # Persistido no JSON
+        data = self.habit_model.storage.load(HABIT_DATA_FILE, {})
+        username = self.user_model.get_logged_in_username()
+        json_habit = [h for h in data[username] if h['id'] == habit_id][0]
+        assert test_date not in json_habit['history'], "Remocao deveria estar persistida"
+
+        # Evento de mudança emitido
+        assert len(events) == 1, "Observer deveria ser notificado uma vez"
+        assert events[0]['type'] == 'unmark'
+        assert events[0]['habit_id'] == habit_id
+        assert events[0]['date'] == test_date
+
+        # Desmarcar novamente falha sem alterar nada
+        success, msg = self.habit_controller.handle_unmark_done_request(habit_id, test_date)
+        assert success == False, "Nao deveria desmarcar data nao marcada"
+        assert len(events) == 1, "Nenhuma notificacao extra deveria ocorrer"
+
+        print(f"OK: Habito desmarcado corretamente em {test_date}")
+
+    @pytest.mark.visualization
+    def test_cta_021_cold_archive_loaded_on_demand(self, clean_json_files):
+        """
+        CTA-021: Hábitos inativos antigos vão para o arquivo frio
+
+        Dado que: Existe um hábito desativado há mais tempo que o limite configurado
+        Quando: Um novo HabitModel é carregado
+        Então: O hábito sai da lista principal e só aparece quando o arquivo é pedido
+        """
+        success, msg = self.habit_model.create_habit(name="Habito Antigo", frequency="daily")
+        assert success == True, f"Falha ao criar habito: {msg}"
+
+        habit = self.habit_model.get_all_habits()[-1]
+        habit_id = habit['id']
+        habit['history'] = {"2020-01-05": True, "2020-01-06": True}
+        habit['created_at'] = "2020-01-01T00:00:00"
+        self.habit_model.update_habit(habit_id, active=False)
+        # Escritas são copy-on-write: a versão atualizada é outro dicionário
+        habit = self.habit_model.get_all_habits()[-1]
+        habit['deactivated_at'] = "2020-02-01T00:00:00"
+        self.habit_model.storage.save(HABIT_DATA_FILE, self.habit_model.data)
+
+        reloaded = HabitModel(self.user_model, archive_after_days=30)
+
+        hot_ids = [h['id'] for h in reloaded.get_all_habits()]
+        assert habit_id not in hot_ids, "Habito antigo deveria sair da lista principal"
+
+        # Um novo carregamento não lê o arquivo frio até que ele seja pedido
+        lazy = HabitModel(self.user_model, archive_after_days=30)
+        assert not lazy.archive.is_loaded(), "Arquivo frio nao deveria ser lido no carregamento"
+        assert habit_id in [h['id'] for h in lazy.get_archived_habits()]
+
+        all_ids = [h['id'] for h in reloaded.get_all_habits(include_archived=True)]
+        assert habit_id in all_ids, "Habito deveria aparecer ao incluir arquivados"
+
+        # Relatório personalizado que inclui arquivados conta o histórico antigo
+        report_controller = ReportController(reloaded, SilentReportView())
+        success, msg, report = report_controller.generate_custom_report(
+            "2020-01-01", "2020-01-31", include_archived=True
+        )
+        assert success == True, msg
+        assert report['total_completed'] == 2
+
+        # Restaurar traz o hábito de volta
+        success, msg = reloaded.restore_archived_habit(habit_id)
+        assert success == True, msg
+        assert habit_id in [h['id'] for h in reloaded.get_all_habits()]
+
+        # O hábito restaurado volta ativo e não é arquivado de novo no próximo início
+        restarted = HabitModel(self.user_model, archive_after_days=30)
+        restored = next((h for h in restarted.get_all_habits() if h['id'] == habit_id), None)
+        assert restored is not None, "Habito restaurado foi arquivado de novo"
+        assert restored['active'] == True
+        assert 'deactivated_at' not in restored
+        assert habit_id not in [h['id'] for h in restarted.get_archived_habits()]
+
+        print("OK: Arquivo frio carregado sob demanda")
+
+    @pytest.mark.visualization
+    def test_cta_022_history_rollups_summary_retention(self, clean_json_files):
+        """
+        CTA-022: Resumo mensal do histórico antigo
+
+        Dado que: Um hábito tem histórico diário anterior ao horizonte de resumo
+        Quando: O usuário escolhe retenção apenas de resumo
+        Então: Os dias antigos viram resumos mensais e o relatório continua com o mesmo total
+        """
+        success, msg = self.habit_model.create_habit(name="Habito Longo", frequency="daily")
+        assert success == True, f"Falha ao criar habito: {msg}"
+
+        habit = self.habit_model.get_all_habits()[-1]
+        habit_id = habit['id']
+        old_dates = ["2020-03-01", "2020-03-02", "2020-03-03", "2020-03-10", "2020-04-02"]
+        habit['history'] = {date: True for date in old_dates}
+
+        before = ReportFactory.create_report(
+            'custom', [habit], "2020-03-01", "2020-04-30"
+        ).generate_visualization_data()
+
+        success, msg = self.habit_controller.handle_update_habit_request(habit_id, retention='summary')
+        assert success == True, msg
+
+        # O snapshot anterior não muda; a versão resumida é lida de novo
+        assert len(habit['history']) == 5
+        habit = self.habit_model.get_all_habits()[-1]
+        assert habit['history'] == {}, "Dias antigos deveriam sair do historico diario"
+        assert habit['rollups']['2020-03'] == {
+            'count': 4, 'longest_streak': 3, 'first': "2020-03-01", 'last': "2020-03-10"
+        }
+        assert habit['rollups']['2020-04']['count'] == 1
+
+        after = ReportFactory.create_report(
+            'custom', [habit], "2020-03-01", "2020-04-30"
+        ).generate_visualization_data()
+        assert after['total_completed'] == before['total_completed'] == 5
+        assert after['max_streak'] == 3
+        assert set(after['monthly_rollups']) == {'2020-03', '2020-04'}
+
+        # Datas resumidas não podem mais ser marcadas
+        success, msg = self.habit_model.mark_habit_done(habit_id, "2020-03-20")
+        assert success == False, "Data resumida nao deveria ser alterada"
+
+        print("OK: Historico antigo resumido por mes")
+
+    @pytest.mark.visualization
+    def test_cta_035_summary_retention_after_reload(self, clean_json_files):
+        """
+        CTA-035: Retenção resumida depois de recarregar os dados
+
+        Dado que: O carregamento já gerou os resumos (cache) dos meses antigos
+        Quando: O usuário muda a retenção para apenas resumo
+        Então: Os resumos são refeitos a partir dos dias, sem contar nada duas vezes
+        """
+        success, msg = self.habit_model.create_habit(name="Habito Antigo", frequency="daily")
+        assert success == True, msg
+        habit_id = self.habit_model.get_all_habits()[-1]['id']
+        for date in ("2020-03-01", "2020-03-02", "2020-03-05"):
+            success, msg = self.habit_model.mark_habit_done(habit_id, date)
+            assert success == True, msg
+
+        reloaded = HabitModel(self.user_model)
+        assert reloaded.get_all_habits()[-1]['rollups']['2020-03']['count'] == 3
+
+        success, msg = reloaded.update_habit(habit_id, retention='summary')
+        assert success == True, msg
+
+        habit = reloaded.get_all_habits()[-1]
+        assert habit['history'] == {}
+        assert habit['rollups']['2020-03'] == {
+            'count': 3, 'longest_streak': 2, 'first': "2020-03-01", 'last': "2020-03-05"
+        }
+        report = ReportFactory.create_report('custom', [habit], "2020-03-01", "2020-03-31") \
+            .generate_visualization_data()
+        assert report['total_completed'] == 3
+
+        print("OK: Resumo refeito sem contagem dupla")
+
+    @pytest.mark.visualization
+    def test_cta_023_export_report_data(self, clean_json_files, tmp_path):
+        """
+        CTA-023: Exportação dos dados de relatório sem PDF
+
+        Dado que: O usuário tem hábitos com progresso registrado
+        Quando: Exporta os relatórios e o histórico em CSV, NDJSON e HTML
+        Então: Cada formato contém uma linha por valor do relatório / dia do histórico
+        """
+        success, msg = self.habit_model.create_habit(name="Habito <Exportado>", frequency="daily")
+        assert success == True, f"Falha ao criar habito: {msg}"
+        habit = self.habit_model.get_all_habits()[-1]
+        habit['history'] = {"2024-01-01": True, "2024-01-02": False}
+
+        report_data = ReportController(self.habit_model, SilentReportView()).generate_report_data()
+        exporter = ReportExporter()
+
+        csv_rows = exporter.export_reports(report_data, tmp_path / "relatorios.csv", 'csv')
+        ndjson_rows = exporter.export_reports(report_data, tmp_path / "relatorios.ndjson", 'ndjson')
+        assert csv_rows == ndjson_rows > 0
+
+        lines = (tmp_path / "relatorios.ndjson").read_text(encoding='utf-8').splitlines()
+        assert len(lines) == ndjson_rows
+        rows = [json.loads(line) for line in lines]
+        assert {'relatorio': 'daily', 'secao': 'resumo', 'item': '', 'campo': 'total_habits',
+                'valor': report_data['daily']['total_habits']} in rows
+
+        exported = exporter.export_histories([habit], tmp_path / "historico.html", 'html')
+        assert exported == 2
+        html_text = (tmp_path / "historico.html").read_text(encoding='utf-8')
+        assert "Habito &lt;Exportado&gt;" in html_text
+        assert "2024-01-02" in html_text
+
+        with pytest.raises(ValueError):
+            exporter.export_histories([habit], tmp_path / "historico.xml", 'xml')
+
+        print("OK: Dados exportados em CSV, NDJSON e HTML")
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -0,0 +1,160 @@
+import pytest
+import io
+import json
+import logging
+import os
+import sys
+import threading
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from model.HabitModel import HabitModel
+from model.UserModel import UserModel
+from model.Storage import JSONFileStorage
+from controller.HabitController import HabitController
+from utils.LogSetup import LOGGER_NAME, setup_logging, shutdown_logging
+from utils.Metrics import MetricsRegistry
+from utils import Profiler
+from utils.Profiler import ActionProfiler
+from view.ReportExporters import ReportExporter
+
+class TestObservability:
+    """
+    Testes de observabilidade: logging, métricas e perfis (CTA-026 a CTA-028)
+    """
+
+    def setup_method(self):
+        """Configuração antes de cada teste"""
+        self.user_model = UserModel()
+        self.user_model.create_user("test_user", "test_pass")
+        self.user_model.authenticate("test_user", "test_pass")
+
+        self.habit_model = HabitModel(self.user_model)
+        self.habit_controller = HabitController(self.habit_model)
+
+    @pytest.mark.observability
+    def test_cta_026_logging_levels(self, caplog):
+        """
+        CTA-026: Logging com níveis no lugar de print()
+
+        Dado que: O logging está no nível padrão (WARNING)
+        Quando: Um hábito é marcado como concluído
+        Então: Nada é registrado; em DEBUG as mensagens aparecem sem o histórico inteiro
+        """
+        print("\n🧪 Executando CTA-026: Logging com níveis")
+
+        self.habit_model.create_habit("Logado")
+        habit = self.habit_model.get_all_habits()[0]
+        habit['history'] = {f"2024-01-{day:02d}": True for day in range(1, 29)}
+
+        with caplog.at_level(logging.WARNING, logger=LOGGER_NAME):
+            success, msg = self.habit_controller.handle_mark_done_request(habit['id'], "2025-01-01")
+        assert success == True, msg
+        assert caplog.records == [], "Nada deveria ser registrado em WARNING"
+
+        with caplog.at_level(logging.DEBUG, logger=LOGGER_NAME):
+            self.habit_controller.handle_mark_done_request(habit['id'], "2025-01-02")
+        messages = [record.getMessage() for record in caplog.records]
+        assert any("marcado em 2025-01-02" in message for message in messages)
+        assert not any("2024-01-15" in message for message in messages), "Histórico não deveria ser impresso"
+
+        # Handler assíncrono: as mensagens chegam ao destino ao encerrar
+        stream = io.StringIO()
+        setup_logging("INFO", async_queue=True, stream=stream)
+        try:
+            self.habit_model.unmark_habit_done(habit['id'], "2025-01-02")
+        finally:
+            shutdown_logging()
+        assert "desmarcado em 2025-01-02" in stream.getvalue()
+
+        print("   ✅ CTA-026 PASSOU")
+
+    @pytest.mark.observability
+    def test_cta_027_operation_metrics(self, tmp_path, monkeypatch):
+        """
+        CTA-027: Métricas de desempenho por operação
+
+        Dado que: O registro de métricas está vazio
+        Quando: Operações do controller, do armazenamento e de exportação são executadas
+        Então: Contagem, percentis e bytes gravados aparecem no JSON e no formato do Prometheus
+        """
+        print("\n🧪 Executando CTA-027: Métricas de desempenho")
+
+        registry = MetricsRegistry.get_instance()
+        registry.reset()
+
+        for name in ("Um", "Dois", "Três"):
+            self.habit_controller.handle_create_habit_request(name)
+        habits = self.habit_controller.handle_read_habits_request()
+        JSONFileStorage(tmp_path).save("dados.json", {"habitos": habits})
+        ReportExporter().export_histories(habits, tmp_path / "historico.csv", 'csv')
+
+        snapshot = registry.snapshot()
+        create = snapshot['HabitController.handle_create_habit_request']
+        assert create['count'] == 3
+        assert create['errors'] == 0
+        assert 0 <= create['p50_ms'] <= create['p95_ms'] <= create['p99_ms'] <= create['max_ms']
+        assert snapshot['HabitController.handle_read_habits_request']['count'] == 1
+        assert snapshot['JSONFileStorage.save']['bytes_written'] == (tmp_path / "dados.json").stat().st_size
+        assert snapshot['ReportExporter.export_histories']['bytes_written'] == \
+            (tmp_path / "historico.csv").stat().st_size
+
+        json_path, prom_path = registry.dump(tmp_path / "metricas")
+        dumped = json.loads(open(json_path, encoding='utf-8').read())
+        assert dumped['operations']['HabitController.handle_create_habit_request']['count'] == 3
+        prom = open(prom_path, encoding='utf-8').read()
+        assert 'habittracker_operation_seconds_count{operation="HabitController.handle_create_habit_request"} 3' in prom
+        assert 'quantile="0.99"' in prom
+        assert registry.summary_lines(top=1)
+
+        # Primeira chamada concorrente: todas as threads recebem o mesmo registro
+        monkeypatch.setattr(MetricsRegistry, "_instance", None)
+        barrier = threading.Barrier(8)
+        instances = []
+        def first_use():
+            barrier.wait()
+            instances.append(MetricsRegistry.get_instance())
+        threads = [threading.Thread(target=first_use) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len({id(instance) for instance in instances}) == 1
+
+        print("   ✅ CTA-027 PASSOU")
+
+    @pytest.mark.observability
+    def test_cta_028_action_profiles(self, tmp_path, caplog, monkeypatch):
+        """
+        CTA-028: Perfil das ações do usuário
+
+        Dado que: O profiler está ligado com um diretório que guarda 2 perfis
+        Quando: Três ações são perfiladas
+        Então: Só os 2 perfis mais recentes ficam no disco e as funções mais caras vão para o log
+        """
+        print("\n🧪 Executando CTA-028: Perfil das ações")
+
+        profiler = ActionProfiler(tmp_path / "perfis", keep=2, top=5)
+        with caplog.at_level(logging.INFO, logger=LOGGER_NAME):
+            for i in range(3):
+                with profiler.profile(f"menu {i}"):
+                    self.habit_controller.handle_create_habit_request(f"Hábito {i}")
+
+        profiles = sorted(os.listdir(tmp_path / "perfis"))
+        assert len(profiles) == 2
+        assert profiles[0].endswith("_menu_1.prof") and profiles[1].endswith("_menu_2.prof")
+        assert "handle_create_habit_request" in caplog.text
+
+        # Desligado: a ação roda normalmente e nada é gravado
+        with ActionProfiler(None).profile("nada"):
+            self.habit_controller.handle_create_habit_request("Sem perfil")
+        assert len(self.habit_controller.handle_read_habits_request()) == 4
+
+        # Ligado para o processo: cada chamada ao controller vira um perfil próprio
+        monkeypatch.setattr(Profiler, "_profiler", ActionProfiler(tmp_path / "controller"))
+        self.habit_controller.handle_create_habit_request("Perfilado")
+        assert [name.split("_", 3)[-1] for name in os.listdir(tmp_path / "controller")] == \
+            ["HabitController.handle_create_habit_request.prof"]
+
+        print("   ✅ CTA-028 PASSOU")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,347 @@
+import pytest
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from view.CommandLineView import build_parser
+from view.PDFBatchExporter import PDFBatchExporter
+from view.PDFCache import PDFCache
+from view.PDFCharts import completion_bar_chart, streak_timeline, monthly_heatmap, COLOR_DONE
+from view.PDFExporter import PDFExporter
+from view.gui.ExportJobQueue import ExportJob, ExportJobQueue
+from reportlab.graphics import renderPDF
+from reportlab.graphics.shapes import Drawing, Rect
+from reportlab.platypus import Table
+
+
+def _habit(history=None, name="Correr", habit_id="habito-1"):
+    """Hábito mínimo no formato do HabitModel."""
+    return {
+        "id": habit_id,
+        "name": name,
+        "description": "",
+        "frequency": "daily",
+        "active": True,
+        "color": "blue",
+        "created_at": "2024-01-01T00:00:00",
+        "history": dict(history or {})
+    }
+
+
+class FakeRoot:
+    """Substitui a janela do Tk: guarda os callbacks agendados com after()."""
+
+    def __init__(self):
+        self.callbacks = []
+
+    def after(self, ms, callback):
+        self.callbacks.append(callback)
+        return len(self.callbacks)
+
+    def after_cancel(self, poll_id):
+        pass
+
+    def pump(self):
+        """Executa os callbacks já agendados (uma volta do laço de eventos do Tk)."""
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback()
+
+
+def _wait_until(condition, timeout=5):
+    """Espera a thread de trabalho da fila chegar ao estado esperado."""
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "Tempo esgotado esperando a fila de exportação"
+        time.sleep(0.01)
+
+
+class TestPDFExport:
+    """
+    Testes da exportação de PDF: cache em disco, exportação em lote e
+    histórico completo e fila de exportações da GUI e gráficos (CTA-036 a CTA-041)
+    """
+
+    @pytest.fixture
+    def exporter(self, tmp_path, monkeypatch):
+        """Singleton do exportador com o cache em um diretório do teste."""
+        exporter = PDFExporter.get_instance()
+        monkeypatch.setattr(exporter, "cache", PDFCache(str(tmp_path / "cache_pdf")))
+        return exporter
+
+    @pytest.mark.pdf
+    def test_cta_036_pdf_cache_hit_and_key(self, tmp_path):
+        """
+        CTA-036: Cache de PDF por conteúdo
+
+        Dado que: Um PDF foi guardado no cache com a chave do seu conteúdo
+        Quando: O mesmo conteúdo é pedido de novo, ou o histórico/dia de referência muda
+        Então: A mesma chave devolve o PDF e o número de páginas; conteúdo diferente gera outra chave
+        """
+        print("\n🧪 Executando CTA-036: Cache de PDF")
+
+        cache = PDFCache(str(tmp_path / "cache"))
+        today = datetime(2025, 3, 10)
+        key = PDFCache.make_key([_habit({"2025-03-01": True})], 'habit', 1, today)
+
+        source = tmp_path / "gerado.pdf"
+        source.write_bytes(b"%PDF-1.4 conteudo")
+        copy = tmp_path / "copia.pdf"
+        assert cache.fetch(key, str(copy)) is None, "Cache vazio não deveria ter a entrada"
+        assert not copy.exists()
+
+        cache.store(key, str(source), 3)
+        assert cache.fetch(key, str(copy)) == 3
+        assert copy.read_bytes() == source.read_bytes()
+
+        # Mesmo conteúdo, mesma chave; histórico, dia de referência ou variante diferentes mudam a chave
+        assert PDFCache.make_key([_habit({"2025-03-01": True})], 'habit', 1, today) == key
+        assert PDFCache.make_key([_habit({"2025-03-02": True})], 'habit', 1, today) != key
+        assert PDFCache.make_key([_habit({"2025-03-01": True})], 'habit', 1, datetime(2025, 3, 11)) != key
+        assert PDFCache.make_key([_habit({"2025-03-01": True})], 'habit-full', 1, today) != key
+
+        print("   ✅ CTA-036 PASSOU")
+
+    @pytest.mark.pdf
+    def test_cta_037_pdf_cache_eviction(self, tmp_path):
+        """
+        CTA-037: Remoção de entradas do cache de PDF
+
+        Dado que: O cache tem três entradas de mesmo tamanho
+        Quando: O limite de bytes é excedido ou uma entrada passa da idade máxima
+        Então: Sai primeiro a entrada buscada há mais tempo, e as antigas demais são removidas
+        """
+        print("\n🧪 Executando CTA-037: Remoção do cache de PDF")
+
+        cache = PDFCache(str(tmp_path / "cache"))
+        source = tmp_path / "gerado.pdf"
+        source.write_bytes(b"x" * 100)
+        for key in ("a", "b", "c"):
+            cache.store(key, str(source), 1)
+
+        pdf_path = lambda key: tmp_path / "cache" / f"{key}.pdf"
+        now = time.time()
+        for age, key in ((30, "a"), (20, "b"), (10, "c")):
+            os.utime(pdf_path(key), (now - age, now - age))
+
+        # Buscar "a" a torna a mais recente: "b" passa a ser a menos usada
+        assert cache.fetch("a", str(tmp_path / "copia.pdf")) == 1
+        cache.max_bytes = 250
+        assert cache.evict() == 1
+        assert sorted(p.name for p in (tmp_path / "cache").glob("*.pdf")) == ["a.pdf", "c.pdf"]
+        assert not (tmp_path / "cache" / "b.json").exists()
+
+        # Dentro do limite de bytes, só a idade remove
+        cache.max_bytes = 10 * 1024
+        old = now - 40 * 86400
+        os.utime(pdf_path("c"), (old, old))
+        assert cache.evict() == 1
+        assert [p.name for p in (tmp_path / "cache").glob("*.pdf")] == ["a.pdf"]
+        assert cache.fetch("c", str(tmp_path / "copia.pdf")) is None
+
+        print("   ✅ CTA-037 PASSOU")
+
+    @pytest.mark.pdf
+    def test_cta_038_batch_export(self, tmp_path, exporter):
+        """
+        CTA-038: Exportação de PDF em lote
+
+        Dado que: Um usuário tem hábitos com nomes repetidos e um hábito com dados inválidos
+        Quando: Todos são exportados em lote (um PDF por hábito ou um documento por usuário)
+        Então: Cada hábito válido vira um arquivo, a falha é relatada e as estatísticas são preenchidas
+        """
+        print("\n🧪 Executando CTA-038: Exportação em lote")
+
+        history = {"2025-03-01": True, "2025-03-02": True}
+        habits = [_habit(history, "Correr", "aaaaaaaa-1"), _habit(history, "Correr", "bbbbbbbb-2"),
+                  _habit(history, "Ler", "cccccccc-3")]
+        broken = dict(_habit(name="Quebrado", habit_id="dddddddd-4"), history=None)
+
+        batch = PDFBatchExporter(max_workers=1)
+        jobs = batch.build_jobs({"ana": habits}, str(tmp_path / "jobs"))
+        assert [os.path.basename(filename) for _, filename in jobs] == \
+            ["relatorio_Correr.pdf", "relatorio_Correr_bbbbbbbb.pdf", "relatorio_Ler.pdf"]
+
+        stats = batch.export_all({"ana": habits + [broken]}, str(tmp_path / "pdfs"))
+        assert sorted(os.path.basename(f) for f in stats['files']) == \
+            ["relatorio_Correr.pdf", "relatorio_Correr_bbbbbbbb.pdf", "relatorio_Ler.pdf"]
+        assert all(os.path.getsize(f) > 0 for f in stats['files'])
+        assert [name for name, _ in stats['failures']] == ["Quebrado"]
+        assert not any("Quebrado" in f for f in stats['files'])
+        assert stats['pages'] >= 3 and stats['pages_per_second'] > 0 and stats['workers'] == 1
+
+        merged = batch.export_all({"ana": habits, "bia": [habits[2]], "caio": []},
+                                  str(tmp_path / "unico"), merged=True)
+        assert sorted(os.path.basename(f) for f in merged['files']) == ["relatorio_ana.pdf", "relatorio_bia.pdf"]
+        assert merged['failures'] == []
+
+        # Número de processos precisa ser positivo (linha de comando e API)
+        with pytest.raises(ValueError):
+            PDFBatchExporter(max_workers=0)
+        with pytest.raises(SystemExit):
+            build_parser().parse_args(["export", "pdf", "--all", "--workers", "0"])
+
+        print("   ✅ CTA-038 PASSOU")
+
+    @pytest.mark.pdf
+    def test_cta_039_full_history_one_table_per_month(self, tmp_path, exporter):
+        """
+        CTA-039: PDF com o histórico completo
+
+        Dado que: Hábitos diários com 12 e 30 meses de histórico até hoje
+        Quando: O PDF é exportado com full_history=True (sem cache)
+        Então: Cada mês vira uma tabela própria e o número de páginas cresce com os meses
+        """
+        print("\n🧪 Executando CTA-039: Histórico completo em PDF")
+
+        def daily_habit(months):
+            today = datetime.now()
+            start = today - timedelta(days=30 * months)
+            days = (today - start).days
+            history = {(start + timedelta(days=i)).strftime('%Y-%m-%d'): True for i in range(0, days, 2)}
+            return _habit(history, f"Diario {months}")
+
+        def month_count(habit):
+            first = min(habit['history'])
+            today = datetime.now()
+            return (today.year - int(first[:4])) * 12 + today.month - int(first[5:7]) + 1
+
+        long_habit = daily_habit(30)
+        story = exporter._full_history_story(long_habit)
+        flowables = []
+        while len(story):
+            flowables.append(story.pop(0))
+        history_tables = [f for f in flowables
+                          if isinstance(f, Table) and f._cellvalues[0] == PDFExporter.HISTORY_HEADER]
+        assert len(history_tables) == month_count(long_habit)
+        assert max(len(t._cellvalues) for t in history_tables) <= 32, "Cada tabela deveria ter só um mês"
+
+        short_pages = exporter.export_habit_report(daily_habit(12), str(tmp_path / "curto.pdf"),
+                                                   full_history=True, use_cache=False)
+        long_pages = exporter.export_habit_report(long_habit, str(tmp_path / "longo.pdf"),
+                                                  full_history=True, use_cache=False)
+        assert short_pages >= month_count(daily_habit(12))
+        assert long_pages >= month_count(long_habit)
+        assert long_pages > short_pages
+        assert not os.path.exists(tmp_path / "cache_pdf"), "use_cache=False não deveria gravar no cache"
+
+        print("   ✅ CTA-039 PASSOU")
+
+    @pytest.mark.pdf
+    def test_cta_040_export_job_queue(self, tmp_path):
+        """
+        CTA-040: Fila de exportações da GUI
+
+        Dado que: A fila recebe exportações com uma janela falsa que só agenda callbacks
+        Quando: Os jobs rodam, informam progresso, são cancelados ou falham
+        Então: Rodam em ordem, terminam no status certo e a interface é avisada uma vez por mudança
+        """
+        print("\n🧪 Executando CTA-040: Fila de exportações")
+
+        root = FakeRoot()
+        updates = []
+        job_queue = ExportJobQueue(root, on_update=lambda job: updates.append((job.id, job.status, job.progress)))
+        ran = []
+        started = threading.Event()
+        release = threading.Event()
+
+        def blocking_task(progress_callback):
+            ran.append("primeiro")
+            progress_callback(1, 2)
+            started.set()
+            release.wait(5)
+            return "ok"
+
+        partial = tmp_path / "parcial.pdf"
+
+        def partial_task(progress_callback):
+            ran.append("parcial")
+            partial.write_bytes(b"%PDF-1.4 incompleto")
+            progress_callback(1, 4)
+            _wait_until(running.cancel_requested)
+            progress_callback(2, 4)
+
+        def failing_task(progress_callback):
+            ran.append("falha")
+            raise ValueError("disco cheio")
+
+        try:
+            first = job_queue.submit("Primeiro", blocking_task)
+            skipped = job_queue.submit("Cancelado antes", lambda progress_callback: ran.append("pulado"))
+            running = job_queue.submit("Cancelado no meio", partial_task, output=str(partial))
+            failed = job_queue.submit("Falha", failing_task)
+            last = job_queue.submit("Último", lambda progress_callback: ran.append("último") or 42)
+
+            # Progresso do job em execução; o pendente é cancelado sem rodar
+            assert started.wait(5)
+            assert first.status == ExportJob.RUNNING and first.progress == 0.5
+            assert job_queue.cancel(skipped.id)
+            root.pump()
+            assert (first.id, ExportJob.RUNNING, 0.5) in updates
+            assert updates.count((first.id, ExportJob.RUNNING, 0.5)) == 1
+            release.set()
+
+            # Cancelado no meio: o arquivo incompleto é removido
+            _wait_until(lambda: running.progress == 0.25)
+            assert partial.exists()
+            assert job_queue.cancel(running.id)
+            _wait_until(lambda: not job_queue.active_jobs())
+            root.pump()
+
+            assert ran == ["primeiro", "parcial", "falha", "último"]
+            assert first.status == ExportJob.DONE and first.result == "ok" and first.progress == 1.0
+            assert skipped.status == ExportJob.CANCELLED
+            assert running.status == ExportJob.CANCELLED and not partial.exists()
+            assert failed.status == ExportJob.FAILED and failed.error == "disco cheio"
+            assert last.status == ExportJob.DONE and last.result == 42
+            assert not job_queue.cancel(last.id), "Job finalizado não pode ser cancelado"
+
+            # Uma notificação por mudança de estado; sem mudanças, a consulta para
+            assert len(updates) == len(set(updates))
+            for job in (skipped, running, failed):
+                assert updates.count((job.id, job.status, job.progress)) == 1
+            assert updates[-1] == (last.id, ExportJob.DONE, 1.0)
+            count = len(updates)
+            job_queue._poll()
+            assert len(updates) == count and root.callbacks == []
+        finally:
+            release.set()
+            job_queue.shutdown()
+
+        print("   ✅ CTA-040 PASSOU")
+
+    @pytest.mark.pdf
+    def test_cta_041_pdf_charts(self):
+        """
+        CTA-041: Gráficos do relatório PDF
+
+        Dado que: Um hábito sem histórico e outro com vários meses de histórico
+        Quando: Os gráficos de barras, de sequências e o mapa de calor são gerados
+        Então: Cada gráfico é um Drawing com tamanho e pode ser desenhado no PDF
+        """
+        print("\n🧪 Executando CTA-041: Gráficos do PDF")
+
+        today = datetime(2025, 6, 15)
+        start = datetime(2025, 1, 1)
+        history = {(start + timedelta(days=i)).strftime('%Y-%m-%d'): i % 3 != 0
+                   for i in range((today - start).days + 1)}
+
+        for habit in (_habit(), _habit(history)):
+            charts = (completion_bar_chart(habit, today=today), streak_timeline(habit, today=today),
+                      monthly_heatmap(habit, today=today))
+            for chart in charts:
+                assert isinstance(chart, Drawing)
+                assert chart.width > 0 and chart.height > 0
+                assert chart.contents, "Gráfico não deveria estar vazio"
+                assert renderPDF.drawToString(chart).startswith(b"%PDF")
+
+            done_rects = [shape for chart in charts[:2] for shape in chart.contents
+                          if isinstance(shape, Rect) and shape.fillColor == COLOR_DONE]
+            assert bool(done_rects) == bool(habit['history']), "Só dias concluídos geram barras verdes"
+
+        print("   ✅ CTA-041 PASSOU")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
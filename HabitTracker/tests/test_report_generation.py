@@ -5,7 +5,7 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from datetime import datetime, timedelta
 from unittest.mock import patch
-from model.HabitModel import HabitModel, save_data, HABIT_DATA_FILE
+from model.HabitModel import HabitModel, HABIT_DATA_FILE
 from model.UserModel import UserModel
 from model.ReportFactory import ReportFactory
 from controller.ReportController import ReportController
@@ -23,7 +23,7 @@ class TestReportGeneration:
         
         # Credenciais de teste
         test_username = "teste"
-        test_password = "123"
+        test_password = "1234"
         
         # Criar usuário
         success, msg = self.user_model.create_user(test_username, test_password)
@@ -83,7 +83,7 @@ class TestReportGeneration:
         created_habits[2]['history'] = {date_str: True}   # Meditação (concluído)
         
         # Salvar alterações no histórico
-        save_data(HABIT_DATA_FILE, self.habit_model.data)
+        self.habit_model.storage.save(HABIT_DATA_FILE, self.habit_model.data)
         
         print(f"\nHábitos configurados para {date_str}:")
         for i, habit in enumerate(created_habits):
@@ -167,7 +167,7 @@ class TestReportGeneration:
         created_habits[1]['history'] = {date: True for date in h002_days}
         
         # Salvar
-        save_data(HABIT_DATA_FILE, self.habit_model.data)
+        self.habit_model.storage.save(HABIT_DATA_FILE, self.habit_model.data)
         
         print(f"Exercícios concluído em ({len(h001_days)} dias): {h001_days}")
         print(f"Leitura concluído em ({len(h002_days)} dias): {h002_days}")
@@ -268,7 +268,7 @@ class TestReportGeneration:
         total_expected = len(caminhada_days) + len(journaling_days) + len(vitaminas_days)
         
         # Salvar
-        save_data(HABIT_DATA_FILE, self.habit_model.data)
+        self.habit_model.storage.save(HABIT_DATA_FILE, self.habit_model.data)
         
         print(f"\nPadrões configurados:")
         print(f"  Caminhada: {len(caminhada_days)} dias - {caminhada_days}")
@@ -339,7 +339,7 @@ class TestReportGeneration:
         for habit in created_habits:
             habit['history'] = {}
         
-        save_data(HABIT_DATA_FILE, self.habit_model.data)
+        self.habit_model.storage.save(HABIT_DATA_FILE, self.habit_model.data)
         
         print(f"\nCriados {len(created_habits)} hábitos sem histórico")
         
@@ -471,7 +471,7 @@ class TestReportGeneration:
         created_habits[2]['history'] = {date: True for date in yoga_days}
         
         # Salvar
-        save_data(HABIT_DATA_FILE, self.habit_model.data)
+        self.habit_model.storage.save(HABIT_DATA_FILE, self.habit_model.data)
         
         total_expected = len(correr_days) + len(estudar_days) + len(yoga_days)
         
@@ -584,7 +584,7 @@ class TestReportGeneration:
         created_habits[0]['history'] = {"2025-12-01": True, "2025-12-02": True}
         created_habits[1]['history'] = {"2025-12-01": True}
         
-        save_data(HABIT_DATA_FILE, self.habit_model.data)
+        self.habit_model.storage.save(HABIT_DATA_FILE, self.habit_model.data)
         
         # Período SEM dados
         start_date = "2024-01-01"
@@ -657,7 +657,7 @@ class TestReportGeneration:
                     created_habits[1]['history'] = {}
                 created_habits[1]['history'][date] = True
         
-        save_data(HABIT_DATA_FILE, self.habit_model.data)
+        self.habit_model.storage.save(HABIT_DATA_FILE, self.habit_model.data)
         
         # Testar diferentes períodos
         test_periods = [
@@ -735,7 +735,7 @@ class TestReportGeneration:
         created_habits[0]['history'] = {date: True for date in test_dates}
         created_habits[1]['history'] = {test_dates[0]: True, test_dates[2]: True}
         
-        save_data(HABIT_DATA_FILE, self.habit_model.data)
+        self.habit_model.storage.save(HABIT_DATA_FILE, self.habit_model.data)
         
         # Criar view e controller
         console_view = ConsoleView(None, self.user_model)
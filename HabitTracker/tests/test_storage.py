@@ -0,0 +1,216 @@
+import pytest
+import json
+import os
+import sys
+import threading
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from model.HabitModel import HabitModel, HABIT_DATA_FILE
+from model.UserModel import UserModel
+from model.Storage import JSONFileStorage, DATA_DIR_ENV
+from controller.HabitController import HabitController
+from controller.ReportController import ReportController
+from tools.generate_dataset import DatasetGenerator, main as generate_dataset_main
+
+class TestStorage:
+    """
+    Testes de armazenamento: dados sintéticos, diretório de dados e
+    arquivos compartilhados entre processos (CTA-024, CTA-025, CTA-032 e CTA-033)
+    """
+
+    def setup_method(self):
+        """Configuração antes de cada teste"""
+        self.user_model = UserModel()
+        self.user_model.create_user("test_user", "test_pass")
+        self.user_model.authenticate("test_user", "test_pass")
+
+        self.habit_model = HabitModel(self.user_model)
+        self.habit_controller = HabitController(self.habit_model)
+
+    @pytest.mark.storage
+    def test_cta_024_synthetic_dataset_is_deterministic(self, tmp_path):
+        """
+        CTA-024: Geração de dados sintéticos para testes de carga
+
+        Dado que: O gerador recebe a mesma semente e a mesma data final
+        Quando: Os arquivos são gerados duas vezes
+        Então: Os arquivos são idênticos e seguem o layout de usuarios.json/habitos_registros.json
+        """
+        print("\n🧪 Executando CTA-024: Dados sintéticos determinísticos")
+
+        from datetime import datetime
+        options = dict(seed=7, users=3, habits=4, years=1, end_date=datetime(2025, 6, 30))
+        stats = DatasetGenerator(**options).write_json(tmp_path / "a")
+        DatasetGenerator(**options).write_json(tmp_path / "b")
+
+        for name in ("usuarios.json", "habitos_registros.json"):
+            assert (tmp_path / "a" / name).read_bytes() == (tmp_path / "b" / name).read_bytes()
+
+        users = json.loads((tmp_path / "a" / "usuarios.json").read_text(encoding='utf-8'))
+        habits = json.loads((tmp_path / "a" / "habitos_registros.json").read_text(encoding='utf-8'))
+        assert sorted(u['username'] for u in users.values()) == sorted(habits)
+        assert stats['habits'] == 12
+        assert stats['entries'] == sum(len(h['history']) for hs in habits.values() for h in hs) > 0
+        assert all(date <= "2025-06-30" for hs in habits.values() for h in hs for date in h['history'])
+
+        DatasetGenerator(**dict(options, seed=8)).write_json(tmp_path / "c")
+        assert (tmp_path / "c" / "habitos_registros.json").read_bytes() != \
+            (tmp_path / "a" / "habitos_registros.json").read_bytes()
+
+        # Gravação compactada pelo Storage e proteção contra sobrescrever dados existentes
+        gz_stats = DatasetGenerator(**options).write_json(tmp_path / "gz", compress=True)
+        assert JSONFileStorage(tmp_path / "gz").load("habitos_registros.json.gz", {}) == habits
+        assert gz_stats['entries'] == stats['entries']
+        with pytest.raises(SystemExit):
+            generate_dataset_main(["--users", "1", "--out", str(tmp_path / "a")])
+        assert (tmp_path / "a" / "habitos_registros.json").read_bytes() == \
+            (tmp_path / "b" / "habitos_registros.json").read_bytes()
+        with pytest.raises(SystemExit):
+            generate_dataset_main(["--users", "1"])
+
+        print("   ✅ CTA-024 PASSOU")
+
+    @pytest.mark.storage
+    def test_cta_025_storage_directory_per_model(self, tmp_path, monkeypatch):
+        """
+        CTA-025: Diretório de dados configurável
+
+        Dado que: Os Models recebem um armazenamento em arquivos de outro diretório
+        Quando: Usuários e hábitos são criados e os Models são recarregados
+        Então: Os dados ficam nesse diretório, e HABITTRACKER_DATA_DIR define o padrão
+        """
+        print("\n🧪 Executando CTA-025: Diretório de dados configurável")
+
+        storage = JSONFileStorage(tmp_path / "dados")
+        user_model = UserModel(storage=storage)
+        user_model.create_user("outro_usuario", "senha")
+        user_model.authenticate("outro_usuario", "senha")
+        success, msg = HabitModel(user_model, storage=storage).create_habit("Isolado")
+        assert success == True, msg
+
+        assert (tmp_path / "dados" / "usuarios.json").exists()
+        assert (tmp_path / "dados" / "habitos_registros.json").exists()
+
+        reloaded_users = UserModel(storage=JSONFileStorage(tmp_path / "dados"))
+        assert reloaded_users.authenticate("outro_usuario", "senha")[0] == True
+        reloaded = HabitModel(reloaded_users, storage=JSONFileStorage(tmp_path / "dados"))
+        assert [h['name'] for h in reloaded.get_all_habits()] == ["Isolado"]
+
+        # O armazenamento em memória do teste continua vazio
+        assert self.habit_model.storage.load(HABIT_DATA_FILE, {}).get("outro_usuario") is None
+
+        monkeypatch.setenv(DATA_DIR_ENV, str(tmp_path / "env"))
+        assert JSONFileStorage().path("usuarios.json") == str(tmp_path / "env" / "usuarios.json")
+
+        print("   ✅ CTA-025 PASSOU")
+
+    @pytest.mark.storage
+    def test_cta_032_two_processes_share_data_dir(self, tmp_path):
+        """
+        CTA-032: Dois processos sobre o mesmo diretório de dados
+
+        Dado que: Duas instâncias (como console e servidor) leram os mesmos arquivos
+        Quando: Cada uma grava alterações sem saber da outra
+        Então: Nenhuma alteração é sobrescrita e duplicatas são detectadas nos dados atuais
+        """
+        print("\n🧪 Executando CTA-032: Processos concorrentes")
+
+        def open_process():
+            users = UserModel(storage=JSONFileStorage(str(tmp_path)))
+            return users, HabitModel(users, storage=users.storage)
+
+        users_a, habits_a = open_process()
+        users_b, habits_b = open_process()
+        assert users_a.create_user("ana", "senha")[0]
+        assert users_b.create_user("bia", "senha")[0]
+        assert not users_a.create_user("bia", "outra")[0], "Usuário criado pelo outro processo"
+        assert users_b.authenticate("ana", "senha")[0], "Login de usuário criado pelo outro processo"
+        users_a.authenticate("ana", "senha")
+
+        assert habits_a.create_habit("Correr")[0]
+        assert habits_b.create_habit("Ler")[0]
+        names = [h['name'] for h in habits_a.storage.load(HABIT_DATA_FILE, {})["ana"]]
+        assert sorted(names) == ["Correr", "Ler"]
+
+        habit_id = habits_a.get_all_habits()[0]['id']
+        assert habits_a.mark_habit_done(habit_id, "2025-03-01")[0]
+        success, message = habits_b.mark_habit_done(habit_id, "2025-03-01")
+        assert not success, "Registro do outro processo deveria ser visto antes de gravar"
+        assert habits_b.mark_habit_done(habit_id, "2025-03-02")[0]
+
+        fresh_users, fresh_habits = open_process()
+        fresh_users.authenticate("ana", "senha")
+        habit = next(h for h in fresh_habits.get_all_habits() if h['id'] == habit_id)
+        assert sorted(habit['history']) == ["2025-03-01", "2025-03-02"]
+        assert len(fresh_users.users) == 2
+
+        print("   ✅ CTA-032 PASSOU")
+
+    @pytest.mark.storage
+    @pytest.mark.parametrize("backend", ["files", "memory"])
+    def test_cta_033_external_changes_notified(self, tmp_path, backend):
+        """
+        CTA-033: Alterações de outro processo chegam aos observers
+
+        Dado que: Uma instância observa o armazenamento (inotify nos arquivos, consulta na memória)
+        Quando: Outra instância cria e marca hábitos
+        Então: Só a lista do usuário afetado é trocada e cada diferença vira um evento externo
+        """
+        print(f"\n🧪 Executando CTA-033: Alterações externas ({backend})")
+
+        storage = JSONFileStorage(str(tmp_path)) if backend == "files" else self.habit_model.storage
+        users = UserModel(storage=storage)
+        users.create_user("ana", "senha")
+        users.create_user("bia", "senha")
+        users.authenticate("ana", "senha")
+        writer = HabitModel(users, storage=storage)
+        with users.acting_as(users._ids_by_username["bia"]):
+            writer.create_habit("Meditar")
+
+        watched = HabitModel(users, storage=storage)
+        other_user_habits = watched.data["bia"]
+        received = []
+        arrived = threading.Condition()
+
+        class Recorder:
+            def update(self, subject, event=None):
+                with arrived:
+                    received.append(event)
+                    arrived.notify_all()
+
+        def wait_events(count):
+            with arrived:
+                assert arrived.wait_for(lambda: len(received) >= count, 5), f"Eventos recebidos: {received}"
+
+        class CountingView:
+            renders = 0
+            def render_reports(self, report_data):
+                CountingView.renders += 1
+
+        watched.attach(Recorder())
+        ReportController(watched, CountingView())
+        watcher = watched.watch_external_changes(poll_interval=0.05)
+        try:
+            if backend == "files":
+                assert watcher.uses_inotify
+            writer.create_habit("Correr")
+            habit_id = writer.get_all_habits()[0]['id']
+            wait_events(1)
+            # Cada data marcada é um evento, relida junto com a outra ou não
+            writer.mark_habit_done(habit_id, "2025-03-01")
+            writer.mark_habit_done(habit_id, "2025-03-02")
+            wait_events(3)
+        finally:
+            watcher.stop()
+
+        assert [(e['type'], e['date']) for e in received] == \
+            [('create', None), ('mark', '2025-03-01'), ('mark', '2025-03-02')]
+        assert all(e['external'] and e['username'] == "ana" and e['habit_id'] == habit_id for e in received)
+        assert CountingView.renders == 0, "Relatórios não deveriam ser refeitos na thread do watcher"
+        assert watched.data["bia"] is other_user_habits, "Lista de outro usuário não deveria ser relida"
+        assert watched.get_all_habits() == writer.get_all_habits()
+        assert watched.reload_external_changes() == []
+
+        print("   ✅ CTA-033 PASSOU")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
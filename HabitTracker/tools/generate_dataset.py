@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Gerador de dados sintéticos para testes de carga e benchmarks.
+Cria N usuários x M hábitos x Y anos de histórico, de forma determinística
+(mesma semente + mesma data final = mesmos arquivos).
+
+Os arquivos são gravados pelo Storage (JSONFileStorage), no mesmo formato
+que os Models usam; com --gzip, compactados (nomes terminados em '.gz').
+Arquivos existentes só são sobrescritos com --force.
+
+Uso:
+    python tools/generate_dataset.py --users 100 --habits 10 --years 5 --seed 42 --out dados/
+    python tools/generate_dataset.py --out dados/ --frequency-mix daily=0.6,weekly=0.3,monthly=0.1 --completion 0.8
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from model.HabitModel import HABIT_DATA_FILE
+from model.Storage import JSONFileStorage
+from model.UserModel import USER_FILE
+
+HABIT_NAMES = [
+    "Beber água", "Ler 20 páginas", "Meditar", "Caminhar", "Estudar inglês",
+    "Dormir cedo", "Academia", "Escrever diário", "Alongamento", "Cozinhar em casa",
+    "Revisar finanças", "Praticar violão", "Sem redes sociais", "Tomar vitaminas", "Arrumar a casa"
+]
+COLORS = ["blue", "green", "red", "purple", "orange", "teal"]
+DEFAULT_PASSWORD = "senha123"
+
+
+def parse_frequency_mix(text):
+    """Converte 'daily=0.7,weekly=0.2,monthly=0.1' em pesos normalizados."""
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ('daily', 'weekly', 'monthly'):
+            raise ValueError(f"Frequência inválida no mix: {name}")
+        mix[name] = float(weight)
+    total = sum(mix.values())
+    if total <= 0:
+        raise ValueError("O mix de frequências precisa de ao menos um peso positivo.")
+    return {name: weight / total for name, weight in mix.items()}
+
+
+class DatasetGenerator:
+    """
+    Gera usuários e hábitos com histórico realista.
+
+    Hábitos diários seguem uma cadeia de Markov de dois estados: cada hábito
+    tem uma taxa de conclusão própria (em torno de `completion`) e uma
+    "aderência" que controla o tamanho das sequências sem alterar a taxa média.
+    Hábitos semanais/mensais são marcados uma vez por período, com a mesma taxa.
+    """
+
+    def __init__(self, seed=42, users=10, habits=5, years=1, frequency_mix=None,
+                 completion=0.7, stickiness=0.6, inactive_ratio=0.1, end_date=None,
+                 password=DEFAULT_PASSWORD):
+        self.seed = seed
+        self.users = users
+        self.habits = habits
+        self.years = years
+        self.frequency_mix = frequency_mix or {'daily': 0.7, 'weekly': 0.2, 'monthly': 0.1}
+        self.completion = completion
+        self.stickiness = stickiness
+        self.inactive_ratio = inactive_ratio
+        self.end_date = end_date or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.password = password
+
+    def _uuid(self, rng):
+        return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+    def _user_rng(self, index):
+        # Um gerador por usuário: o usuário i é sempre igual, independente de N
+        return random.Random(f"{self.seed}:{index}")
+
+    def username(self, index):
+        return f"usuario{index:05d}"
+
+    def iter_users(self):
+        """Gera (user_id, registro) no formato de usuarios.json."""
+        for index in range(self.users):
+            rng = self._user_rng(index)
+            user_id = self._uuid(rng)
+            created = self.end_date - timedelta(days=365 * self.years + rng.randint(0, 30))
+            yield user_id, {
+                'username': self.username(index),
+                'password': self.password,
+                'id': user_id,
+                'created_at': created.isoformat()
+            }
+
+    def iter_habits(self):
+        """Gera (username, [hábitos]) no formato de habitos_registros.json."""
+        for index in range(self.users):
+            rng = self._user_rng(index)
+            rng.getrandbits(128)  # mesmo estado após o id do usuário
+            yield self.username(index), [self._make_habit(rng, n) for n in range(self.habits)]
+
+    def _make_habit(self, rng, n):
+        frequencies = list(self.frequency_mix)
+        frequency = rng.choices(frequencies, weights=[self.frequency_mix[f] for f in frequencies])[0]
+        start = self.end_date - timedelta(days=int(365 * self.years * rng.uniform(0.5, 1.0)))
+        rate = min(max(rng.gauss(self.completion, 0.15), 0.05), 0.99)
+        active = rng.random() >= self.inactive_ratio
+
+        habit = {
+            "id": self._uuid(rng),
+            "name": f"{rng.choice(HABIT_NAMES)} #{n + 1}",
+            "description": "Gerado automaticamente",
+            "frequency": frequency,
+            "active": active,
+            "color": rng.choice(COLORS),
+            "created_at": start.isoformat(),
+            "history": self._make_history(rng, frequency, start, rate)
+        }
+        if not active:
+            habit["deactivated_at"] = (self.end_date - timedelta(days=rng.randint(0, 180))).isoformat()
+        return habit
+
+    def _make_history(self, rng, frequency, start, rate):
+        history = {}
+        day = start
+        if frequency == 'daily':
+            # P(feito | ontem feito) e P(feito | ontem não) mantêm a taxa média em `rate`
+            p_keep = rate + self.stickiness * (1 - rate)
+            p_start = rate * (1 - self.stickiness)
+            done = rng.random() < rate
+            while day <= self.end_date:
+                if done:
+                    history[day.strftime('%Y-%m-%d')] = True
+                done = rng.random() < (p_keep if done else p_start)
+                day += timedelta(days=1)
+        else:
+            period = 7 if frequency == 'weekly' else 30
+            while day <= self.end_date:
+                if rng.random() < rate:
+                    mark = day + timedelta(days=rng.randrange(period))
+                    if mark <= self.end_date:
+                        history[mark.strftime('%Y-%m-%d')] = True
+                day += timedelta(days=period)
+        return history
+
+    @staticmethod
+    def file_names(compress=False):
+        """Nomes dos documentos gravados (usuários e hábitos)."""
+        suffix = '.gz' if compress else ''
+        return USER_FILE + suffix, HABIT_DATA_FILE + suffix
+
+    def write(self, storage, compress=False):
+        """
+        Grava usuários e hábitos no Storage, no layout atual (com gzip se `compress`).
+
+        Returns:
+            Dicionário com contagens e tamanhos gerados
+        """
+        users_name, habits_name = self.file_names(compress)
+        storage.save(users_name, dict(self.iter_users()), indent=4)
+
+        habits = dict(self.iter_habits())
+        storage.save(habits_name, habits, ensure_ascii=False, separators=(',', ':'))
+
+        path = getattr(storage, 'path', lambda name: name)
+        return {
+            'users': self.users,
+            'habits': sum(len(user_habits) for user_habits in habits.values()),
+            'entries': sum(len(h['history']) for user_habits in habits.values() for h in user_habits),
+            'files': [path(users_name), path(habits_name)],
+            'bytes': storage.size(users_name) + storage.size(habits_name)
+        }
+
+    def write_json(self, out_dir, compress=False):
+        """Grava usuarios.json e habitos_registros.json no diretório `out_dir` (ver write)."""
+        return self.write(JSONFileStorage(str(out_dir)), compress)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera dados sintéticos de usuários e hábitos")
+    parser.add_argument("--users", type=int, default=10, help="Número de usuários")
+    parser.add_argument("--habits", type=int, default=5, help="Hábitos por usuário")
+    parser.add_argument("--years", type=float, default=1, help="Anos de histórico")
+    parser.add_argument("--seed", type=int, default=42, help="Semente (execuções repetíveis)")
+    parser.add_argument("--frequency-mix", default="daily=0.7,weekly=0.2,monthly=0.1",
+                        help="Pesos das frequências (ex.: daily=0.7,weekly=0.2,monthly=0.1)")
+    parser.add_argument("--completion", type=float, default=0.7, help="Taxa média de conclusão (0-1)")
+    parser.add_argument("--stickiness", type=float, default=0.6,
+                        help="Aderência das sequências (0 = dias independentes, perto de 1 = sequências longas)")
+    parser.add_argument("--inactive-ratio", type=float, default=0.1, help="Fração de hábitos inativos")
+    parser.add_argument("--end-date", default=None,
+                        help="Último dia do histórico (YYYY-MM-DD, padrão: hoje). Fixe para saídas idênticas")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD, help="Senha de todos os usuários")
+    parser.add_argument("--out", required=True, help="Diretório de saída")
+    parser.add_argument("--gzip", action="store_true", help="Grava os arquivos compactados (.gz)")
+    parser.add_argument("--force", action="store_true", help="Sobrescreve arquivos existentes")
+    args = parser.parse_args(argv)
+
+    storage = JSONFileStorage(args.out)
+    existing = [name for name in DatasetGenerator.file_names(args.gzip) if storage.exists(name)]
+    if existing and not args.force:
+        parser.error(f"Arquivos já existentes em {args.out}: {', '.join(existing)} (use --force para sobrescrever)")
+
+    try:
+        end_date = datetime.strptime(args.end_date, '%Y-%m-%d') if args.end_date else None
+        generator = DatasetGenerator(
+            seed=args.seed, users=args.users, habits=args.habits, years=args.years,
+            frequency_mix=parse_frequency_mix(args.frequency_mix), completion=args.completion,
+            stickiness=args.stickiness, inactive_ratio=args.inactive_ratio,
+            end_date=end_date, password=args.password
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    start = time.perf_counter()
+    stats = generator.write(storage, args.gzip)
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ {stats['users']} usuários, {stats['habits']} hábitos, {stats['entries']} registros")
+    print(f"   {stats['bytes'] / 1024 / 1024:.2f} MB em {elapsed:.2f} s: {', '.join(stats['files'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Teste de carga local da API HTTP (HabitTracker.py serve).
+
+Abre N conexões keep-alive simultâneas, cada uma com seu próprio usuário
+(criado se não existir) e alguns hábitos, e dispara uma mistura de listagens,
+check-ins e relatórios. Com --pipeline > 1, cada conexão envia várias
+requisições antes de ler as respostas. Ao final mostra vazão, códigos de
+status e latências (p50/p95/p99) por rota.
+
+Uso:
+    python HabitTracker.py serve --port 8080 &
+    python tools/load_test.py --clients 50 --requests 200
+    python tools/load_test.py --clients 10 --pipeline 8 --report-ratio 0.2 --json carga.json
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.Metrics import MetricsRegistry
+
+HABITS_PER_USER = 3
+
+
+class HTTPConnection:
+    """Conexão HTTP/1.1 keep-alive mínima sobre asyncio (sem dependências)."""
+
+    def __init__(self, reader, writer, credentials=None, token=None):
+        """
+        Args:
+            credentials: Tupla (usuário, senha) enviada como HTTP Basic
+            token: Token de sessão enviado como Bearer (tem precedência)
+        """
+        self.reader = reader
+        self.writer = writer
+        self.authorization = None
+        if token:
+            self.authorization = f"Bearer {token}"
+        elif credentials:
+            encoded = base64.b64encode(':'.join(credentials).encode('utf-8')).decode('ascii')
+            self.authorization = f"Basic {encoded}"
+
+    @classmethod
+    async def open(cls, host, port, credentials=None, token=None):
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer, credentials, token)
+
+    def send(self, method, path, payload=None):
+        """Enfileira uma requisição (sem esperar a resposta)."""
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b""
+        lines = [f"{method} {path} HTTP/1.1", "Host: localhost", f"Content-Length: {len(body)}"]
+        if body:
+            lines.append("Content-Type: application/json")
+        if self.authorization:
+            lines.append(f"Authorization: {self.authorization}")
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + body)
+
+    async def read_response(self):
+        """Lê a próxima resposta. Returns: (status, corpo decodificado)."""
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("Conexão fechada pelo servidor")
+        status = int(status_line.split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.strip().lower() == 'content-length':
+                length = int(value)
+        body = await self.reader.readexactly(length) if length else b""
+        if body.startswith(b"{"):
+            return status, json.loads(body)
+        return status, body.decode('utf-8')
+
+    async def request(self, method, path, payload=None):
+        self.send(method, path, payload)
+        await self.writer.drain()
+        return await self.read_response()
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def prepare_user(host, port, username, password, use_session=True):
+    """
+    Cria o usuário e seus hábitos (se ainda não existirem).
+
+    Returns:
+        Tupla (IDs dos hábitos, token da sessão ou None)
+    """
+    connection = await HTTPConnection.open(host, port, (username, password))
+    try:
+        await connection.request('POST', '/users', {'username': username, 'password': password})
+        token = None
+        if use_session:
+            status, body = await connection.request('POST', '/sessions', {'username': username, 'password': password})
+            if status != 201:
+                raise RuntimeError(f"Falha ao abrir sessão de '{username}': {body}")
+            token = body['token']
+        status, body = await connection.request('GET', '/habits')
+        if status != 200:
+            raise RuntimeError(f"Falha ao autenticar '{username}': {body}")
+        for i in range(len(body['habits']), HABITS_PER_USER):
+            await connection.request('POST', '/habits', {'name': f"Hábito de carga {i + 1}"})
+        status, body = await connection.request('GET', '/habits')
+        return [habit['id'] for habit in body['habits']], token
+    finally:
+        await connection.close()
+
+
+def next_request(rng, habit_ids, report_ratio):
+    """Sorteia a próxima requisição da mistura. Returns: (rota, método, caminho, corpo)."""
+    roll = rng.random()
+    if roll < report_ratio:
+        return 'GET /reports', 'GET', '/reports', None
+    if roll < report_ratio + (1 - report_ratio) * 0.4:
+        day = (date.today() - timedelta(days=rng.randrange(365))).isoformat()
+        return 'POST /habits/{habit_id}/checkins', 'POST', \
+            f"/habits/{rng.choice(habit_ids)}/checkins", {'date': day}
+    return 'GET /habits', 'GET', '/habits', None
+
+
+async def run_client(args, index, results, statuses):
+    """Uma conexão keep-alive: `args.requests` requisições em lotes de `args.pipeline`."""
+    username = f"{args.user_prefix}{index % args.users:04d}"
+    habit_ids, token = await prepare_user(args.host, args.port, username, args.password, args.auth == 'session')
+    rng = random.Random(args.seed + index)
+    connection = await HTTPConnection.open(args.host, args.port, (username, args.password), token)
+    try:
+        remaining = args.requests
+        while remaining > 0:
+            batch = [next_request(rng, habit_ids, args.report_ratio) for _ in range(min(args.pipeline, remaining))]
+            started = []
+            for route, method, path, payload in batch:
+                connection.send(method, path, payload)
+                started.append(time.perf_counter())
+            await connection.writer.drain()
+            for (route, *_), start in zip(batch, started):
+                status, _ = await connection.read_response()
+                statuses[status] += 1
+                results.observe(route, time.perf_counter() - start, error=_is_error(status))
+            remaining -= len(batch)
+    finally:
+        await connection.close()
+
+
+def _is_error(status):
+    """Erros do servidor; 503 é a recusa esperada quando a fila de relatórios enche."""
+    return status >= 500 and status != 503
+
+
+async def run(args):
+    results = MetricsRegistry()
+    statuses = Counter()
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(*(run_client(args, i, results, statuses) for i in range(args.clients)),
+                                    return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    failures = [outcome for outcome in outcomes if isinstance(outcome, Exception)]
+    return results, statuses, elapsed, failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Teste de carga da API HTTP do Habit Tracker")
+    parser.add_argument("--host", default="127.0.0.1", help="Endereço do servidor")
+    parser.add_argument("--port", type=int, default=8080, help="Porta do servidor")
+    parser.add_argument("--clients", type=int, default=20, help="Conexões simultâneas")
+    parser.add_argument("--requests", type=int, default=100, help="Requisições por conexão")
+    parser.add_argument("--pipeline", type=int, default=1, help="Requisições enviadas antes de ler as respostas")
+    parser.add_argument("--users", type=int, default=None, help="Usuários distintos (padrão: um por conexão)")
+    parser.add_argument("--user-prefix", default="carga_", help="Prefixo dos usuários criados")
+    parser.add_argument("--password", default="senha123", help="Senha dos usuários criados")
+    parser.add_argument("--auth", choices=('session', 'basic'), default='session',
+                        help="Token de sessão (Bearer) ou usuário e senha em cada requisição")
+    parser.add_argument("--report-ratio", type=float, default=0.05, help="Fração de requisições de relatório")
+    parser.add_argument("--seed", type=int, default=42, help="Semente (misturas repetíveis)")
+    parser.add_argument("--json", default=None, help="Salva as métricas neste arquivo JSON")
+    args = parser.parse_args(argv)
+    args.users = args.users or args.clients
+    if min(args.clients, args.requests, args.pipeline, args.users) < 1:
+        parser.error("--clients, --requests, --pipeline e --users devem ser positivos")
+
+    results, statuses, elapsed, failures = asyncio.run(run(args))
+    total = sum(statuses.values())
+
+    print(f"✅ {total} requisições em {elapsed:.2f} s ({total / elapsed:.0f} req/s), "
+          f"{args.clients} conexões, pipeline {args.pipeline}, autenticação {args.auth}")
+    print(f"   Status: {', '.join(f'{status}: {count}' for status, count in sorted(statuses.items()))}")
+    for line in results.summary_lines(top=10):
+        print(f"   {line}")
+    if failures:
+        print(f"❌ {len(failures)} conexão(ões) falharam: {failures[0]!r}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'requests': total, 'seconds': elapsed, 'clients': args.clients,
+                       'pipeline': args.pipeline, 'statuses': dict(statuses),
+                       'routes': results.snapshot()}, f, indent=4, ensure_ascii=False)
+        print(f"   Métricas salvas em: {args.json}")
+    return 1 if failures or any(_is_error(status) for status in statuses) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+LogSetup - Logging do Habit Tracker.
+
+Os módulos pegam seu logger com get_logger(__name__) e registram mensagens
+com formatação preguiçosa (logger.debug("... %s", valor)): abaixo do nível
+configurado a mensagem nem chega a ser montada.
+
+setup_logging() é chamado pelos pontos de entrada. O nível vem do argumento
+ou da variável de ambiente HABITTRACKER_LOG_LEVEL (padrão: WARNING). Com
+async_queue=True (ou HABITTRACKER_LOG_ASYNC=1) a escrita no terminal sai da
+thread que registrou a mensagem e vai para uma thread própria
+(QueueHandler + QueueListener).
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+LOGGER_NAME = "habittracker"
+LOG_LEVEL_ENV = "HABITTRACKER_LOG_LEVEL"
+LOG_ASYNC_ENV = "HABITTRACKER_LOG_ASYNC"
+DEFAULT_LEVEL = "WARNING"
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+_listener = None
+
+
+def get_logger(name):
+    """Logger do módulo `name`, abaixo do logger 'habittracker'."""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+def setup_logging(level=None, async_queue=None, stream=None):
+    """
+    Configura o logger 'habittracker' (pode ser chamado de novo para trocar o nível).
+
+    Args:
+        level: Nome ou número do nível (padrão: HABITTRACKER_LOG_LEVEL ou WARNING)
+        async_queue: Escreve as mensagens em uma thread separada
+        stream: Destino das mensagens (padrão: sys.stderr)
+
+    Returns:
+        O logger configurado
+    """
+    global _listener
+
+    if level is None:
+        level = os.environ.get(LOG_LEVEL_ENV, DEFAULT_LEVEL)
+    if isinstance(level, str):
+        level = level.upper()
+    if async_queue is None:
+        async_queue = os.environ.get(LOG_ASYNC_ENV, "") not in ("", "0")
+
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(level)
+    logger.propagate = False
+    _remove_handlers(logger)
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    if async_queue:
+        log_queue = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(log_queue, handler)
+        _listener.start()
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    else:
+        logger.addHandler(handler)
+    return logger
+
+
+def shutdown_logging():
+    """Esvazia a fila assíncrona (se houver), remove os handlers e volta à configuração padrão."""
+    logger = logging.getLogger(LOGGER_NAME)
+    _remove_handlers(logger)
+    logger.setLevel(logging.NOTSET)
+    logger.propagate = True
+
+
+def _remove_handlers(logger):
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,264 @@
+"""
+Metrics - Registro de métricas de desempenho do processo (Singleton).
+
+Cada operação instrumentada (métodos handle_* do HabitController, geração de
+relatórios, leitura/gravação do armazenamento, exportação de PDF) registra
+duração, bytes gravados e erros. Contagens e totais são exatos; os
+percentis (p50/p95/p99) usam as últimas SAMPLE_WINDOW medições de cada
+operação, para que a memória não cresça com o tempo de uso.
+
+O registro pode ser salvo sob demanda como JSON e como arquivo de texto no
+formato do Prometheus (dump), e resumido em poucas linhas para o menu do
+console e a barra de status da GUI (summary_lines).
+"""
+
+import functools
+import inspect
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+SAMPLE_WINDOW = 1024
+METRICS_JSON_FILE = "metrics.json"
+METRICS_PROMETHEUS_FILE = "metrics.prom"
+PROMETHEUS_PREFIX = "habittracker_operation"
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class _OperationStats:
+    """Estatísticas acumuladas de uma operação."""
+
+    __slots__ = ('count', 'errors', 'total_seconds', 'max_seconds', 'bytes_written', 'samples')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.bytes_written = 0
+        self.samples = deque(maxlen=SAMPLE_WINDOW)
+
+
+class Timer:
+    """
+    Mede um bloco `with`. Quem grava arquivos pode informar o tamanho em
+    `bytes_written` antes do fim do bloco; exceções contam como erro.
+    """
+
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+        self.bytes_written = 0
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.observe(self.name, time.perf_counter() - self._start,
+                              self.bytes_written, error=exc_type is not None)
+        return False
+
+
+class MetricsRegistry:
+    """Registro de métricas em memória, compartilhado pelo processo."""
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._operations = {}
+        self.started_at = datetime.now()
+
+    @classmethod
+    def get_instance(cls):
+        """Retorna o registro único do processo (criado uma vez, mesmo com várias threads)."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def observe(self, name, seconds, bytes_written=0, error=False):
+        """Registra uma execução da operação `name`."""
+        with self._lock:
+            stats = self._operations.get(name)
+            if stats is None:
+                stats = self._operations[name] = _OperationStats()
+            stats.count += 1
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.bytes_written += bytes_written
+            stats.samples.append(seconds)
+            if error:
+                stats.errors += 1
+
+    def timer(self, name):
+        """Context manager que mede o bloco como uma execução de `name`."""
+        return Timer(self, name)
+
+    def reset(self):
+        """Descarta todas as medições."""
+        with self._lock:
+            self._operations.clear()
+            self.started_at = datetime.now()
+
+    def snapshot(self):
+        """
+        Cópia das estatísticas atuais.
+
+        Returns:
+            Dicionário {operação: {count, errors, total_ms, max_ms, p50_ms, p95_ms, p99_ms, bytes_written}}
+        """
+        with self._lock:
+            operations = {name: (stats.count, stats.errors, stats.total_seconds, stats.max_seconds,
+                                 stats.bytes_written, sorted(stats.samples))
+                          for name, stats in self._operations.items()}
+
+        result = {}
+        for name, (count, errors, total, maximum, bytes_written, samples) in sorted(operations.items()):
+            entry = {
+                'count': count,
+                'errors': errors,
+                'total_ms': total * 1000,
+                'max_ms': maximum * 1000,
+                'bytes_written': bytes_written,
+            }
+            for quantile in QUANTILES:
+                entry[_quantile_key(quantile)] = _percentile(samples, quantile) * 1000
+            result[name] = entry
+        return result
+
+    def to_json(self):
+        """Métricas como texto JSON."""
+        return json.dumps({
+            'started_at': self.started_at.isoformat(),
+            'generated_at': datetime.now().isoformat(),
+            'operations': self.snapshot()
+        }, indent=4, ensure_ascii=False)
+
+    def to_prometheus(self):
+        """Métricas no formato de texto do Prometheus (summary + contadores)."""
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {PROMETHEUS_PREFIX}_seconds Duração das operações do Habit Tracker.",
+            f"# TYPE {PROMETHEUS_PREFIX}_seconds summary",
+        ]
+        for name, entry in snapshot.items():
+            label = _prometheus_label(name)
+            for quantile in QUANTILES:
+                lines.append(f'{PROMETHEUS_PREFIX}_seconds{{operation="{label}",quantile="{quantile}"}} '
+                             f'{entry[_quantile_key(quantile)] / 1000:.6f}')
+            lines.append(f'{PROMETHEUS_PREFIX}_seconds_sum{{operation="{label}"}} {entry["total_ms"] / 1000:.6f}')
+            lines.append(f'{PROMETHEUS_PREFIX}_seconds_count{{operation="{label}"}} {entry["count"]}')
+
+        for metric, key, description in (('errors_total', 'errors', "Execuções que terminaram em erro."),
+                                         ('bytes_written_total', 'bytes_written', "Bytes gravados em disco.")):
+            lines.append(f"# HELP {PROMETHEUS_PREFIX}_{metric} {description}")
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{metric} counter")
+            for name, entry in snapshot.items():
+                lines.append(f'{PROMETHEUS_PREFIX}_{metric}{{operation="{_prometheus_label(name)}"}} {entry[key]}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, directory="."):
+        """
+        Grava metrics.json e metrics.prom em `directory`.
+
+        Returns:
+            Lista com os caminhos gravados
+        """
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for filename, content in ((METRICS_JSON_FILE, self.to_json()),
+                                  (METRICS_PROMETHEUS_FILE, self.to_prometheus())):
+            path = os.path.join(directory, filename)
+            # Arquivo temporário + replace: quem coleta nunca lê um arquivo pela metade
+            with open(path + ".tmp", 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(path + ".tmp", path)
+            paths.append(path)
+        return paths
+
+    def summary_lines(self, top=5):
+        """Resumo legível das `top` operações com maior tempo total."""
+        snapshot = self.snapshot()
+        ranked = sorted(snapshot.items(), key=lambda item: item[1]['total_ms'], reverse=True)[:top]
+        return [f"{name}: {entry['count']}x, p50 {entry['p50_ms']:.1f} ms, p95 {entry['p95_ms']:.1f} ms, "
+                f"p99 {entry['p99_ms']:.1f} ms" + (f", {_format_bytes(entry['bytes_written'])}"
+                                                   if entry['bytes_written'] else "")
+                for name, entry in ranked]
+
+    def status_text(self):
+        """Uma linha para a barra de status da GUI."""
+        snapshot = self.snapshot()
+        if not snapshot:
+            return "⏱ Nenhuma operação medida ainda"
+        count = sum(entry['count'] for entry in snapshot.values())
+        slowest_name, slowest = max(snapshot.items(), key=lambda item: item[1]['p95_ms'])
+        return f"⏱ {count} operações | mais lenta (p95): {slowest_name} {slowest['p95_ms']:.1f} ms"
+
+
+def timed(name=None, registry=None, output_arg=None):
+    """
+    Decorador que mede cada chamada da função.
+
+    Args:
+        name: Nome da operação (padrão: nome qualificado da função,
+            ex.: 'HabitController.handle_create_habit_request')
+        registry: Registro usado (padrão: MetricsRegistry.get_instance())
+        output_arg: Parâmetro com o caminho do arquivo gravado pela função;
+            o tamanho do arquivo conta como bytes gravados
+    """
+    def decorator(func):
+        operation = name or func.__qualname__
+        signature = inspect.signature(func) if output_arg else None
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with (registry or MetricsRegistry.get_instance()).timer(operation) as timer:
+                result = func(*args, **kwargs)
+                if signature is not None:
+                    timer.bytes_written = file_size(signature.bind(*args, **kwargs).arguments[output_arg])
+                return result
+        return wrapper
+    return decorator
+
+
+def file_size(path):
+    """Tamanho do arquivo em bytes (0 se não existir)."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _percentile(sorted_samples, quantile):
+    """Percentil pelo método do posto mais próximo (0.0 sem amostras)."""
+    if not sorted_samples:
+        return 0.0
+    index = max(math.ceil(quantile * len(sorted_samples)) - 1, 0)
+    return sorted_samples[index]
+
+
+def _quantile_key(quantile):
+    return f"p{int(round(quantile * 100))}_ms"
+
+
+def _prometheus_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def _format_bytes(size):
+    if size < 1024:
+        return f"{size} B"
+    for unit in ('KB', 'MB'):
+        size /= 1024
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+    return f"{size / 1024:.1f} GB"
@@ -0,0 +1,150 @@
+"""
+Profiler - Captura opcional de perfis (cProfile) das ações do usuário.
+
+Desligado por padrão. Liga com a variável de ambiente HABITTRACKER_PROFILE
+(com o diretório dos perfis, ou '1' para usar PROFILE_DIR) ou com a opção
+--profile do HabitTracker.py. Cada chamada aos controllers e aos
+exportadores (e os callbacks da MainWindow que atualizam a tela) vira um
+arquivo .prof (abrir com `python -m pstats` ou snakeviz) em um diretório
+rotativo que guarda só os `keep` mais recentes; as `top` funções com maior
+tempo acumulado vão para o log em nível INFO. Só o trabalho é perfilado:
+a espera por input() e pelos diálogos fica de fora.
+
+Desligado, profiled()/profile() apenas chamam a função: nenhum custo extra
+além de uma verificação.
+"""
+
+import contextlib
+import functools
+import io
+import itertools
+import logging
+import os
+import re
+import threading
+from datetime import datetime
+
+from utils.LogSetup import get_logger
+
+logger = get_logger(__name__)
+
+PROFILE_ENV = "HABITTRACKER_PROFILE"
+PROFILE_DIR = "profiles"
+PROFILE_KEEP = 50
+PROFILE_TOP = 15
+
+
+class ActionProfiler:
+    """Perfila ações nomeadas e grava um arquivo .prof por ação."""
+
+    def __init__(self, directory=None, keep=PROFILE_KEEP, top=PROFILE_TOP):
+        """
+        Args:
+            directory: Diretório dos perfis (None = desligado)
+            keep: Quantidade de perfis mantidos no diretório (ao menos 1)
+            top: Funções listadas no log para cada ação
+        """
+        self.directory = directory
+        self.keep = max(keep, 1)
+        self.top = top
+        self._sequence = itertools.count(1)
+        # Um perfil por vez: o cProfile não aceita perfis aninhados ou
+        # simultâneos em todas as versões do Python
+        self._active = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.directory is not None
+
+    @contextlib.contextmanager
+    def profile(self, action):
+        """Perfila o bloco `with` como a ação `action` (se ligado e sem outro perfil ativo)."""
+        if not self.enabled or not self._active.acquire(blocking=False):
+            yield
+            return
+
+        # Importados só com o profiler ligado (não atrasam a inicialização)
+        import cProfile
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+            self._save(action, profiler)
+        finally:
+            self._active.release()
+
+    def _save(self, action, profiler):
+        """Grava o perfil, registra as funções mais caras e apaga os perfis antigos."""
+        os.makedirs(self.directory, exist_ok=True)
+        name = re.sub(r'[^A-Za-z0-9_.-]+', '_', action)
+        filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{next(self._sequence):04d}_{name}.prof"
+        path = os.path.join(self.directory, filename)
+        try:
+            profiler.dump_stats(path)
+        except OSError as e:
+            logger.warning("Não foi possível gravar o perfil %s: %s", path, e)
+            return
+
+        if logger.isEnabledFor(logging.INFO):
+            import pstats
+            output = io.StringIO()
+            stats = pstats.Stats(profiler, stream=output)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+            logger.info("Perfil de '%s' (%.3f s) salvo em %s\n%s",
+                        action, stats.total_tt, path, output.getvalue().strip())
+        self._rotate()
+
+    def _rotate(self):
+        """Mantém apenas os `keep` perfis mais recentes."""
+        profiles = sorted(f for f in os.listdir(self.directory) if f.endswith('.prof'))
+        for filename in profiles[:-self.keep]:
+            try:
+                os.remove(os.path.join(self.directory, filename))
+            except OSError:
+                pass
+
+
+_profiler = None
+
+
+def configure_profiler(directory=None, keep=PROFILE_KEEP, top=PROFILE_TOP):
+    """
+    Configura o profiler do processo.
+    Sem `directory`, usa HABITTRACKER_PROFILE ('1' = PROFILE_DIR; vazio ou '0' = desligado).
+    """
+    global _profiler
+    if directory is None:
+        value = os.environ.get(PROFILE_ENV, "")
+        if value not in ("", "0"):
+            directory = PROFILE_DIR if value == "1" else value
+    _profiler = ActionProfiler(directory, keep, top)
+    return _profiler
+
+
+def get_profiler():
+    """Profiler do processo (configurado pelo ambiente na primeira chamada)."""
+    if _profiler is None:
+        return configure_profiler()
+    return _profiler
+
+
+def profiled(action=None):
+    """
+    Decorador que perfila cada chamada como a ação `action`
+    (padrão: nome qualificado da função, ex.: 'MainWindow._refresh_habits').
+    """
+    def decorator(func):
+        name = action or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = get_profiler()
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            with profiler.profile(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
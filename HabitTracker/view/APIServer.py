@@ -0,0 +1,531 @@
+"""
+APIServer - API HTTP/JSON local do Habit Tracker (asyncio, sem dependências).
+
+Mais uma View, ao lado do ConsoleView e da GUI: traduz requisições HTTP em
+chamadas ao HabitController e ao ReportController, para vários clientes ao
+mesmo tempo a partir de um único processo.
+
+- Autenticação por sessão (POST /sessions devolve um token, enviado depois
+  como 'Authorization: Bearer <token>'; validação O(1), expira quando fica
+  ociosa) ou HTTP Basic (usuário e senha em cada requisição). Cada operação
+  roda como o usuário da requisição (UserModel.acting_as), então vários
+  usuários usam as mesmas instâncias dos Models.
+- Keep-alive (HTTP/1.1) com tempo ocioso e número de requisições por conexão
+  limitados.
+- Pipelining: requisições enviadas sem esperar a resposta anterior são
+  processadas em paralelo, no máximo `pipeline_limit` por conexão (acima
+  disso a conexão para de ser lida), e respondidas na ordem de chegada.
+- As operações sobre os Models (thread-safe) rodam em um pool de threads,
+  fora do loop de eventos. Conexões diferentes operam em paralelo (leituras
+  usam snapshots; as escritas se revezam na transação do HabitModel); dentro de
+  uma conexão cada requisição só chega ao model depois da anterior (um POST
+  seguido de um GET em pipeline vê o hábito criado). Relatórios pegam o
+  snapshot imutável dos hábitos e são calculados em um pool limitado de
+  processos; com a fila do pool cheia a resposta é 503.
+
+Rotas (JSON):
+    POST   /users                             cria usuário (sem autenticação)
+    POST   /sessions                          abre sessão {username, password} -> {token}
+    DELETE /sessions                          encerra a sessão do token enviado
+    GET    /habits[?archived=1]               lista os hábitos
+    POST   /habits                            cria hábito {name, description, frequency}
+    PATCH  /habits/<id>                       atualiza {name, description, active, ...}
+    DELETE /habits/<id>                       exclui
+    POST   /habits/<id>/checkins              marca {date} (padrão: hoje)
+    DELETE /habits/<id>/checkins/<data>       desmarca
+    GET    /reports                           relatórios diário, semanal e mensal
+    GET    /reports/custom?start=&end=[&archived=1]
+    GET    /metrics                           métricas no formato do Prometheus
+"""
+
+import asyncio
+import base64
+import binascii
+import json
+import multiprocessing
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qs, unquote
+
+from controller.ReportController import ReportController
+from utils.LogSetup import get_logger
+from utils.Metrics import MetricsRegistry
+
+logger = get_logger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+PIPELINE_LIMIT = 8
+MODEL_WORKERS = 4
+KEEPALIVE_TIMEOUT = 15
+MAX_KEEPALIVE_REQUESTS = 1000
+MAX_HEADER_BYTES = 16 * 1024
+MAX_HEADERS = 100
+MAX_BODY_BYTES = 1024 * 1024
+# Relatórios aguardando ou em execução, por processo do pool
+REPORT_QUEUE_PER_WORKER = 4
+
+
+class HTTPError(Exception):
+    """Erro que vira uma resposta HTTP com a mensagem em JSON."""
+
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+
+class Request:
+    """Requisição HTTP já lida do socket."""
+
+    def __init__(self, method, target, version, headers, body=b""):
+        self.method = method
+        self.version = version
+        self.headers = headers
+        self.body = body
+        # Ordem na conexão: espera `previous` e libera `ordered` ao terminar a etapa no model
+        self.previous = None
+        self.ordered = None
+        url = urlsplit(target)
+        self.path = unquote(url.path)
+        self.query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+    @property
+    def keep_alive(self):
+        """HTTP/1.1 mantém a conexão por padrão; HTTP/1.0 só com 'Connection: keep-alive'."""
+        connection = self.headers.get('connection', '').lower()
+        if self.version == "HTTP/1.0":
+            return connection == 'keep-alive'
+        return connection != 'close'
+
+    def json(self):
+        """Corpo da requisição como dicionário (vazio se não houver corpo)."""
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body)
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Corpo da requisição não é um JSON válido.")
+        if not isinstance(data, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "O corpo da requisição deve ser um objeto JSON.")
+        return data
+
+    def flag(self, name):
+        return self.query.get(name, '').lower() in ('1', 'true', 'sim')
+
+
+class APIServer:
+    """Servidor HTTP/JSON sobre os controllers do Habit Tracker."""
+
+    def __init__(self, habit_controller, user_model, host=DEFAULT_HOST, port=DEFAULT_PORT,
+                 report_workers=None, model_workers=MODEL_WORKERS, pipeline_limit=PIPELINE_LIMIT,
+                 keepalive_timeout=KEEPALIVE_TIMEOUT, max_keepalive_requests=MAX_KEEPALIVE_REQUESTS):
+        """
+        Args:
+            habit_controller: HabitController
+            user_model: UserModel usado na autenticação e nas sessões
+            report_workers: Processos para relatórios (padrão: núcleos da máquina;
+                0 = calcula no pool de threads do model, sem processos)
+            model_workers: Threads para as operações sobre os Models
+            pipeline_limit: Requisições em processamento por conexão
+            keepalive_timeout: Segundos de espera pela próxima requisição
+            max_keepalive_requests: Requisições atendidas por conexão antes de fechá-la
+        """
+        self.habit_controller = habit_controller
+        self.user_model = user_model
+        self.host = host
+        self.port = port
+        self.report_workers = multiprocessing.cpu_count() if report_workers is None else report_workers
+        self.model_workers = max(model_workers, 1)
+        self.pipeline_limit = max(pipeline_limit, 1)
+        self.keepalive_timeout = keepalive_timeout
+        self.max_keepalive_requests = max_keepalive_requests
+        self.metrics = MetricsRegistry.get_instance()
+        self._server = None
+        self._model_pool = None
+        self._report_pool = None
+        self._report_slots = None
+        self._routes = [
+            ('POST', r'/users', self._create_user, False),
+            ('POST', r'/sessions', self._open_session, False),
+            ('DELETE', r'/sessions', self._close_session, True),
+            ('GET', r'/habits', self._list_habits, True),
+            ('POST', r'/habits', self._create_habit, True),
+            ('PATCH', r'/habits/(?P<habit_id>[^/]+)', self._update_habit, True),
+            ('DELETE', r'/habits/(?P<habit_id>[^/]+)', self._delete_habit, True),
+            ('POST', r'/habits/(?P<habit_id>[^/]+)/checkins', self._mark_done, True),
+            ('DELETE', r'/habits/(?P<habit_id>[^/]+)/checkins/(?P<date>[^/]+)', self._unmark_done, True),
+            ('GET', r'/reports', self._standard_reports, True),
+            ('GET', r'/reports/custom', self._custom_report, True),
+            ('GET', r'/metrics', self._metrics, False),
+        ]
+        # Nome da operação nas métricas: '/habits/(?P<habit_id>...)' vira '/habits/{habit_id}'
+        self._routes = [(method, re.compile(pattern + '$'), re.sub(r'\(\?P<(\w+)>[^)]*\)', r'{\1}', pattern),
+                         handler, auth)
+                        for method, pattern, handler, auth in self._routes]
+
+    # --- Ciclo de vida ---
+
+    async def start(self):
+        """Abre o socket e os executores. Com port=0, a porta escolhida fica em `self.port`."""
+        self._model_pool = ThreadPoolExecutor(max_workers=self.model_workers, thread_name_prefix="habittracker-model")
+        if self.report_workers > 0:
+            # spawn: o servidor já tem threads, e fork com threads não é seguro
+            self._report_pool = ProcessPoolExecutor(max_workers=self.report_workers,
+                                                    mp_context=multiprocessing.get_context('spawn'))
+        self._report_slots = asyncio.Semaphore(max(self.report_workers, 1) * REPORT_QUEUE_PER_WORKER)
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port,
+                                                  limit=MAX_HEADER_BYTES)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("API ouvindo em http://%s:%s (%d processos para relatórios)",
+                    self.host, self.port, self.report_workers)
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        """Para de aceitar conexões e encerra os executores."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._report_pool is not None:
+            self._report_pool.shutdown(cancel_futures=True)
+            self._report_pool = None
+        if self._model_pool is not None:
+            self._model_pool.shutdown()
+            self._model_pool = None
+
+    # --- Conexões ---
+
+    async def _handle_connection(self, reader, writer):
+        """Lê as requisições da conexão e as despacha; `_write_responses` responde em ordem."""
+        pending = asyncio.Queue(self.pipeline_limit)
+        responder = asyncio.create_task(self._write_responses(pending, writer))
+        loop = asyncio.get_running_loop()
+        previous = None
+        served = 0
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), self.keepalive_timeout)
+                except asyncio.TimeoutError:
+                    break
+                except HTTPError as e:
+                    # Requisição malformada: responde e fecha (o resto do fluxo não é confiável)
+                    await pending.put((_completed(self._error_response(e)), False))
+                    break
+                if request is None:
+                    break
+
+                served += 1
+                keep_alive = request.keep_alive and served < self.max_keepalive_requests
+                request.previous, request.ordered = previous, loop.create_future()
+                previous = request.ordered
+                # Com a fila cheia, a conexão deixa de ser lida até sair uma resposta
+                await pending.put((asyncio.create_task(self._dispatch(request)), keep_alive))
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            await pending.put(None)
+            await responder
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _write_responses(self, pending, writer):
+        """Escreve as respostas na ordem das requisições, até receber None."""
+        closed = False
+        while True:
+            item = await pending.get()
+            if item is None:
+                return
+            task, keep_alive = item
+            if closed:
+                # Conexão encerrada: a resposta não será mais enviada
+                task.cancel()
+                continue
+            status, headers, body = await task
+            try:
+                writer.write(self._encode_response(status, headers, body, keep_alive))
+                await writer.drain()
+            except ConnectionError:
+                closed = True
+            closed = closed or not keep_alive
+
+    async def _read_request(self, reader):
+        """Lê uma requisição (None quando o cliente fecha a conexão)."""
+        try:
+            line = await reader.readline()
+        except (asyncio.LimitOverrunError, ValueError):
+            raise HTTPError(HTTPStatus.REQUEST_URI_TOO_LONG, "Linha de requisição muito longa.")
+        if not line:
+            return None
+        if line in (b"\r\n", b"\n"):
+            # Linha em branco entre requisições (tolerada pela RFC 9112)
+            return await self._read_request(reader)
+
+        try:
+            method, target, version = line.decode('latin-1').split()
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Linha de requisição inválida.")
+        if version not in ("HTTP/1.0", "HTTP/1.1"):
+            raise HTTPError(HTTPStatus.HTTP_VERSION_NOT_SUPPORTED, "Versão HTTP não suportada.")
+
+        headers = {}
+        total = len(line)
+        while True:
+            try:
+                line = await reader.readline()
+            except (asyncio.LimitOverrunError, ValueError):
+                line = b"x" * (MAX_HEADER_BYTES + 1)
+            total += len(line)
+            if total > MAX_HEADER_BYTES or len(headers) > MAX_HEADERS:
+                raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Cabeçalhos muito grandes.")
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, sep, value = line.decode('latin-1').partition(':')
+            if not sep:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Cabeçalho inválido.")
+            headers[name.strip().lower()] = value.strip()
+
+        if 'transfer-encoding' in headers:
+            raise HTTPError(HTTPStatus.NOT_IMPLEMENTED, "Transfer-Encoding não suportado; use Content-Length.")
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Content-Length inválido.")
+        if length < 0:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Content-Length inválido.")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Corpo da requisição muito grande.")
+        body = await reader.readexactly(length) if length else b""
+        return Request(method.upper(), target, version, headers, body)
+
+    def _encode_response(self, status, headers, body, keep_alive):
+        status = HTTPStatus(status)
+        lines = [f"HTTP/1.1 {status.value} {status.phrase}",
+                 f"Content-Length: {len(body)}"]
+        if keep_alive:
+            lines.append("Connection: keep-alive")
+            lines.append(f"Keep-Alive: timeout={self.keepalive_timeout}, max={self.max_keepalive_requests}")
+        else:
+            lines.append("Connection: close")
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        return ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + body
+
+    # --- Despacho ---
+
+    async def _dispatch(self, request):
+        """Executa a rota da requisição. Returns: (status, cabeçalhos, corpo)."""
+        start = time.perf_counter()
+        operation = f"API {request.method} ?"
+        try:
+            if request.previous is not None:
+                # Etapa no model na ordem de chegada da conexão
+                await request.previous
+            handler, params, auth, operation = self._route(request)
+            user_id = await self._authenticate(request) if auth else None
+            status, payload = await handler(request, user_id, **params)
+            if isinstance(payload, str):
+                response = status, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}, payload.encode('utf-8')
+            else:
+                response = self._json_response(status, payload)
+        except HTTPError as e:
+            response = self._error_response(e)
+        except Exception:
+            logger.exception("Erro ao atender %s %s", request.method, request.path)
+            response = self._json_response(HTTPStatus.INTERNAL_SERVER_ERROR,
+                                           {'success': False, 'message': "Erro interno do servidor."})
+        finally:
+            self._release_order(request)
+        self.metrics.observe(operation, time.perf_counter() - start,
+                             error=response[0] >= HTTPStatus.INTERNAL_SERVER_ERROR)
+        return response
+
+    def _release_order(self, request):
+        """Libera a próxima requisição da conexão para chegar ao model."""
+        if request.ordered is not None and not request.ordered.done():
+            request.ordered.set_result(None)
+
+    def _route(self, request):
+        allowed = []
+        for method, regex, pattern, handler, auth in self._routes:
+            match = regex.match(request.path)
+            if match:
+                if method == request.method:
+                    return handler, match.groupdict(), auth, f"API {method} {pattern}"
+                allowed.append(method)
+        if allowed:
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "Método não permitido.",
+                            headers={'Allow': ", ".join(allowed)})
+        raise HTTPError(HTTPStatus.NOT_FOUND, "Rota não encontrada.")
+
+    def _json_response(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        return status, {'Content-Type': 'application/json; charset=utf-8'}, body
+
+    def _error_response(self, error):
+        status, headers, body = self._json_response(error.status, {'success': False, 'message': error.message})
+        headers.update(error.headers)
+        return status, headers, body
+
+    def _result_response(self, result, created=False):
+        """Converte a tupla (sucesso, mensagem) dos controllers em resposta."""
+        success, message = result
+        if not success:
+            return HTTPStatus.BAD_REQUEST, {'success': False, 'message': message}
+        return (HTTPStatus.CREATED if created else HTTPStatus.OK), {'success': True, 'message': message}
+
+    # --- Thread do model ---
+
+    async def _in_model_pool(self, user_id, func, *args, **kwargs):
+        """Executa `func` no pool de threads do model, operando como o usuário `user_id`."""
+        def call():
+            with self.user_model.acting_as(user_id):
+                return func(*args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self._model_pool, call)
+
+    async def _authenticate(self, request):
+        """Valida o cabeçalho Authorization (Bearer ou Basic). Returns: ID do usuário."""
+        scheme, _, credentials = request.headers.get('authorization', '').partition(' ')
+        scheme = scheme.lower()
+        if scheme == 'bearer':
+            # Sessões têm trava própria: a validação não passa pelo pool do model
+            user_id = self.user_model.validate_session(credentials.strip())
+            if user_id is None:
+                raise self._unauthorized("Sessão inválida ou expirada.")
+            return user_id
+        if scheme != 'basic':
+            raise self._unauthorized("Autenticação necessária.")
+        try:
+            username, _, password = base64.b64decode(credentials, validate=True).decode('utf-8').partition(':')
+        except (binascii.Error, UnicodeDecodeError):
+            raise self._unauthorized("Cabeçalho Authorization inválido.")
+
+        user_id = await self._in_model_pool(None, self.user_model.check_credentials, username, password)
+        if user_id is None:
+            raise self._unauthorized("Credenciais inválidas.")
+        return user_id
+
+    def _unauthorized(self, message):
+        return HTTPError(HTTPStatus.UNAUTHORIZED, message,
+                         headers={'WWW-Authenticate': 'Bearer realm="HabitTracker", Basic realm="HabitTracker"'})
+
+    async def _report(self, func, *args):
+        """Calcula um relatório no pool de processos (503 se a fila estiver cheia)."""
+        if self._report_slots.locked():
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, "Muitos relatórios em andamento. Tente novamente.",
+                            headers={'Retry-After': '1'})
+        async with self._report_slots:
+            if self._report_pool is None:
+                return await asyncio.get_running_loop().run_in_executor(self._model_pool, func, *args)
+            return await asyncio.wrap_future(self._report_pool.submit(func, *args))
+
+    # --- Rotas ---
+
+    async def _create_user(self, request, user_id):
+        data = request.json()
+        result = await self._in_model_pool(None, self.user_model.create_user,
+                                             str(data.get('username', '')), str(data.get('password', '')))
+        return self._result_response(result, created=True)
+
+    async def _open_session(self, request, user_id):
+        data = request.json()
+        success, message, token = await self._in_model_pool(
+            None, self.user_model.open_session, str(data.get('username', '')), str(data.get('password', '')))
+        if not success:
+            raise self._unauthorized(message)
+        return HTTPStatus.CREATED, {'success': True, 'message': message, 'token': token,
+                                    'idle_timeout': self.user_model.session_idle_timeout}
+
+    async def _close_session(self, request, user_id):
+        scheme, _, token = request.headers.get('authorization', '').partition(' ')
+        if scheme.lower() != 'bearer':
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Envie o token da sessão (Authorization: Bearer).")
+        return self._result_response(self.user_model.close_session(token.strip()))
+
+    async def _list_habits(self, request, user_id):
+        habits = await self._in_model_pool(user_id, self.habit_controller.handle_read_habits_request,
+                                           request.flag('archived'))
+        return HTTPStatus.OK, {'success': True, 'habits': habits}
+
+    async def _create_habit(self, request, user_id):
+        data = request.json()
+        result = await self._in_model_pool(user_id, self.habit_controller.handle_create_habit_request,
+                                             str(data.get('name', '')), str(data.get('description', '')),
+                                             data.get('frequency', 'daily'))
+        return self._result_response(result, created=True)
+
+    async def _update_habit(self, request, user_id, habit_id):
+        data = request.json()
+        fields = ('name', 'description', 'active', 'frequency', 'color', 'retention')
+        result = await self._in_model_pool(user_id, self.habit_controller.handle_update_habit_request,
+                                             habit_id, **{field: data.get(field) for field in fields})
+        return self._result_response(result)
+
+    async def _delete_habit(self, request, user_id, habit_id):
+        result = await self._in_model_pool(user_id, self.habit_controller.handle_delete_habit_request, habit_id)
+        return self._result_response(result)
+
+    async def _mark_done(self, request, user_id, habit_id):
+        date = request.json().get('date')
+        result = await self._in_model_pool(user_id, self.habit_controller.handle_mark_done_request,
+                                             habit_id, date)
+        return self._result_response(result, created=True)
+
+    async def _unmark_done(self, request, user_id, habit_id, date):
+        result = await self._in_model_pool(user_id, self.habit_controller.handle_unmark_done_request,
+                                             habit_id, date)
+        return self._result_response(result)
+
+    async def _habits_snapshot(self, request, user_id, include_archived=False):
+        """
+        Snapshot imutável dos hábitos do usuário. Depois dele a próxima
+        requisição da conexão já pode seguir, enquanto o relatório é calculado.
+        """
+        habits = await self._in_model_pool(user_id, self.habit_controller.handle_read_habits_request,
+                                           include_archived)
+        self._release_order(request)
+        return habits
+
+    async def _standard_reports(self, request, user_id):
+        habits = await self._habits_snapshot(request, user_id)
+        reports = await self._report(ReportController.build_report_data, habits)
+        if reports is None:
+            return HTTPStatus.OK, {'success': False, 'message': "⚠️ Nenhum hábito cadastrado ainda.",
+                                   'reports': None}
+        return HTTPStatus.OK, {'success': True, 'reports': reports}
+
+    async def _custom_report(self, request, user_id):
+        start, end = request.query.get('start'), request.query.get('end')
+        if not start or not end:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Informe 'start' e 'end' (YYYY-MM-DD).")
+        include_archived = request.flag('archived')
+        habits = await self._habits_snapshot(request, user_id, include_archived)
+        success, message, data = await self._report(ReportController.build_custom_report,
+                                                    habits, start, end, include_archived)
+        return (HTTPStatus.OK if success else HTTPStatus.BAD_REQUEST), \
+            {'success': success, 'message': message, 'report': data}
+
+    async def _metrics(self, request, user_id):
+        return HTTPStatus.OK, self.metrics.to_prometheus()
+
+
+def _completed(result):
+    """Future já resolvido com `result` (resposta pronta na fila de respostas)."""
+    future = asyncio.get_running_loop().create_future()
+    future.set_result(result)
+    return future
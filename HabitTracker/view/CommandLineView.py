@@ -0,0 +1,436 @@
+"""
+CommandLineView - Linha de comando não interativa (scripts, cron, pipelines).
+
+Cada comando faz uma ação e termina, sem nenhum input():
+
+    python HabitTracker.py habit list [--archived] [--json]
+    python HabitTracker.py habit add "Correr" [--description ...] [--frequency weekly]
+    python HabitTracker.py habit mark Correr [--date 2025-01-31]
+    python HabitTracker.py habit unmark Correr --date 2025-01-31
+    python HabitTracker.py habit delete Correr
+    python HabitTracker.py report weekly --json
+    python HabitTracker.py report custom --start 2025-01-01 --end 2025-01-31
+    python HabitTracker.py export pdf --all [--out relatorios_pdf] [--merged]
+    python HabitTracker.py export csv --content history --out historico.csv
+    python HabitTracker.py token create --user ana
+    python HabitTracker.py batch < comandos.txt
+
+Hábitos são indicados pelo ID ou pelo nome. Autenticação, nesta ordem:
+--token, HABITTRACKER_TOKEN (token de API criado com 'token create') ou
+--user/HABITTRACKER_USER com a senha em HABITTRACKER_PASSWORD. No batch
+vale a autenticação do próprio 'batch' para todas as linhas.
+
+'batch' lê um comando por linha da entrada padrão (sem o 'python
+HabitTracker.py'; '#' inicia comentário) e executa todos com uma única
+inicialização e uma única leitura dos dados.
+
+A saída é texto (uma linha por item, campos separados por TAB) ou, com
+--json, um objeto JSON por comando (NDJSON no batch). Erros vão para o
+stderr e o código de saída é diferente de zero. Para iniciar rápido, o PDF
+(reportlab) e os exportadores só são importados pelo comando que os usa; Tk
+e matplotlib nunca são importados.
+"""
+
+import argparse
+import json
+import os
+import shlex
+import sys
+from datetime import datetime
+
+from controller.HabitController import HabitController
+from controller.ReportController import ReportController
+from model.HabitModel import HabitModel
+from model.UserModel import UserModel
+from utils.LogSetup import get_logger
+
+logger = get_logger(__name__)
+
+TOKEN_ENV = "HABITTRACKER_TOKEN"
+USER_ENV = "HABITTRACKER_USER"
+PASSWORD_ENV = "HABITTRACKER_PASSWORD"
+
+# Primeiras palavras que o HabitTracker.py encaminha para esta interface
+CLI_COMMANDS = ('habit', 'report', 'export', 'token', 'batch')
+
+EXIT_OK = 0
+EXIT_FAILURE = 1
+EXIT_USAGE = 2
+EXIT_AUTH = 3
+
+REPORT_TYPES = ('daily', 'weekly', 'monthly', 'custom')
+DATA_FORMATS = ('csv', 'ndjson', 'html')
+
+
+class CommandError(Exception):
+    """Falha de um comando; a mensagem vai para o stderr."""
+
+
+def _date(value):
+    """Tipo do argparse para datas 'YYYY-MM-DD'."""
+    try:
+        datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"data inválida: '{value}' (use AAAA-MM-DD)")
+    return value
+
+
+def positive_int(value):
+    """Tipo do argparse para inteiros maiores que zero (ex.: número de processos)."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"informe um inteiro maior que zero: '{value}'")
+    return number
+
+
+def build_parser():
+    """Parser de todos os comandos (também usado para cada linha do batch)."""
+    # Opções aceitas depois de qualquer comando (o HabitTracker.py encaminha pela primeira palavra)
+    auth = argparse.ArgumentParser(add_help=False)
+    auth.add_argument("--token", default=None, help=f"Token de API (padrão: ${TOKEN_ENV})")
+    auth.add_argument("--user", default=None,
+                      help=f"Usuário (padrão: ${USER_ENV}); a senha vem de ${PASSWORD_ENV}")
+    output = argparse.ArgumentParser(add_help=False, parents=[auth])
+    output.add_argument("--json", action="store_true", help="Saída em JSON (para scripts)")
+
+    parser = argparse.ArgumentParser(
+        prog="HabitTracker.py",
+        description="Habit Tracker sem menus: um comando por ação (scripts, cron, pipelines)."
+    )
+    commands = parser.add_subparsers(dest="command", required=True, metavar="comando")
+
+    habit = commands.add_parser("habit", help="Lista, cria, marca e remove hábitos")
+    habit_actions = habit.add_subparsers(dest="action", required=True, metavar="ação")
+    habit_list = habit_actions.add_parser("list", parents=[output], help="Lista os hábitos")
+    habit_list.add_argument("--archived", action="store_true", help="Inclui os hábitos arquivados")
+    habit_add = habit_actions.add_parser("add", parents=[output], help="Cria um hábito")
+    habit_add.add_argument("name", help="Nome do hábito")
+    habit_add.add_argument("--description", default="", help="Descrição")
+    habit_add.add_argument("--frequency", choices=('daily', 'weekly', 'monthly'), default='daily',
+                           help="Frequência (padrão: daily)")
+    habit_mark = habit_actions.add_parser("mark", parents=[output], help="Marca o hábito como concluído")
+    habit_mark.add_argument("habit", help="ID ou nome do hábito")
+    habit_mark.add_argument("--date", type=_date, default=None, help="Data AAAA-MM-DD (padrão: hoje)")
+    habit_unmark = habit_actions.add_parser("unmark", parents=[output], help="Desmarca a conclusão em uma data")
+    habit_unmark.add_argument("habit", help="ID ou nome do hábito")
+    habit_unmark.add_argument("--date", type=_date, required=True, help="Data AAAA-MM-DD")
+    habit_delete = habit_actions.add_parser("delete", parents=[output], help="Remove o hábito")
+    habit_delete.add_argument("habit", help="ID ou nome do hábito")
+
+    report = commands.add_parser("report", parents=[output], help="Gera um relatório")
+    report.add_argument("kind", choices=REPORT_TYPES, help="Tipo do relatório")
+    report.add_argument("--start", type=_date, default=None, help="Início (custom)")
+    report.add_argument("--end", type=_date, default=None, help="Fim (custom)")
+    report.add_argument("--archived", action="store_true", help="Inclui os hábitos arquivados (custom)")
+
+    export = commands.add_parser("export", parents=[output], help="Exporta PDF, CSV, NDJSON ou HTML")
+    export.add_argument("format", choices=('pdf',) + DATA_FORMATS, help="Formato")
+    export.add_argument("habit", nargs="?", default=None, help="ID ou nome do hábito (pdf)")
+    export.add_argument("--all", action="store_true", help="Todos os hábitos, um PDF por hábito (pdf)")
+    export.add_argument("--merged", action="store_true", help="Com --all: um único PDF")
+    export.add_argument("--full-history", action="store_true", help="Histórico completo em cada PDF")
+    export.add_argument("--workers", type=positive_int, default=None, help="Processos para --all (padrão: núcleos)")
+    export.add_argument("--content", choices=('reports', 'history'), default='reports',
+                        help="Relatórios padrão ou histórico completo (csv/ndjson/html)")
+    export.add_argument("--out", default=None, help="Arquivo (ou diretório, com --all) de saída")
+
+    token = commands.add_parser("token", parents=[output], help="Cria ou revoga tokens de API")
+    token.add_argument("action", choices=('create', 'revoke'), help="Ação")
+
+    batch = commands.add_parser("batch", parents=[auth], help="Executa os comandos lidos da entrada padrão, um por linha")
+    batch.add_argument("--stop-on-error", action="store_true", help="Para no primeiro comando com erro")
+    return parser
+
+
+class CommandLineView:
+    """View: executa os comandos já interpretados pelo argparse e escreve o resultado."""
+
+    def __init__(self, habit_controller, user_model, stdout=None, stderr=None):
+        self.habit_controller = habit_controller
+        self.user_model = user_model
+        self.stdout = stdout or sys.stdout
+        self.stderr = stderr or sys.stderr
+        self._handlers = {
+            ('habit', 'list'): self._habit_list,
+            ('habit', 'add'): self._habit_add,
+            ('habit', 'mark'): self._habit_mark,
+            ('habit', 'unmark'): self._habit_unmark,
+            ('habit', 'delete'): self._habit_delete,
+            ('report', None): self._report,
+            ('export', None): self._export,
+        }
+
+    def execute(self, args):
+        """Executa um comando. Returns: código de saída."""
+        handler = self._handlers[(args.command, getattr(args, 'action', None))]
+        try:
+            return handler(args)
+        except CommandError as e:
+            return self._fail(args, str(e))
+
+    def run_batch(self, parser, lines, stop_on_error=False):
+        """
+        Executa um comando por linha (mesmos Models para todos).
+
+        Returns:
+            EXIT_OK se todos deram certo, EXIT_FAILURE caso contrário
+        """
+        failures = 0
+        for number, line in enumerate(lines, start=1):
+            try:
+                words = shlex.split(line, comments=True)
+            except ValueError as error:
+                # Ex.: aspas sem fechamento; só esta linha falha
+                self.stderr.write(f"Linha {number}: {error}\n")
+                status = EXIT_USAGE
+            else:
+                if not words:
+                    continue
+                status = self._run_batch_line(parser, number, words)
+            if status is None:
+                continue
+            if status != EXIT_OK:
+                failures += 1
+                logger.info("Lote: linha %d falhou (%d)", number, status)
+                if stop_on_error:
+                    break
+        return EXIT_OK if not failures else EXIT_FAILURE
+
+    def _run_batch_line(self, parser, number, words):
+        """Executa uma linha do lote. Returns: código de saída (None se só pediu ajuda)."""
+        try:
+            args = parser.parse_args(words)
+        except SystemExit as exit_:
+            # O argparse já escreveu a ajuda (código 0) ou o erro no stderr
+            return None if not exit_.code else EXIT_USAGE
+        if args.command in ('batch', 'token'):
+            self.stderr.write(f"Linha {number}: '{args.command}' não é permitido em lote\n")
+            return EXIT_USAGE
+        return self.execute(args)
+
+    # --- Hábitos ---
+
+    def _habit_list(self, args):
+        habits = self.habit_controller.handle_read_habits_request(args.archived)
+        if args.json:
+            return self._write_json({'success': True, 'habits': habits})
+        for habit in habits:
+            status = "ativo" if habit.get('active', True) else "inativo"
+            done = sum(1 for value in habit.get('history', {}).values() if value)
+            self._write(f"{habit['id']}\t{habit['name']}\t{habit.get('frequency', 'daily')}\t{status}\t{done}")
+        return EXIT_OK
+
+    def _habit_add(self, args):
+        return self._result(args, *self.habit_controller.handle_create_habit_request(
+            args.name, args.description, args.frequency))
+
+    def _habit_mark(self, args):
+        habit = self._find_habit(args.habit)
+        return self._result(args, *self.habit_controller.handle_mark_done_request(habit['id'], args.date))
+
+    def _habit_unmark(self, args):
+        habit = self._find_habit(args.habit)
+        return self._result(args, *self.habit_controller.handle_unmark_done_request(habit['id'], args.date))
+
+    def _habit_delete(self, args):
+        habit = self._find_habit(args.habit)
+        return self._result(args, *self.habit_controller.handle_delete_habit_request(habit['id']))
+
+    def _find_habit(self, reference):
+        """Hábito pelo ID ou, se não houver, pelo nome (sem diferenciar maiúsculas)."""
+        habits = self.habit_controller.handle_read_habits_request()
+        for habit in habits:
+            if habit['id'] == reference:
+                return habit
+        matches = [habit for habit in habits if habit['name'].casefold() == reference.casefold()]
+        if not matches:
+            raise CommandError(f"Hábito não encontrado: '{reference}'")
+        if len(matches) > 1:
+            raise CommandError(f"Há {len(matches)} hábitos chamados '{reference}'; use o ID")
+        return matches[0]
+
+    # --- Relatórios ---
+
+    def _report(self, args):
+        from model.ReportFactory import ReportFactory
+
+        if args.kind == 'custom':
+            if not (args.start and args.end):
+                raise CommandError("O relatório custom precisa de --start e --end")
+            habits = self.habit_controller.handle_read_habits_request(args.archived)
+            success, message, data = ReportController.build_custom_report(habits, args.start, args.end,
+                                                                          args.archived)
+            if not success:
+                raise CommandError(message)
+        else:
+            habits = self.habit_controller.handle_read_habits_request()
+            if not habits:
+                raise CommandError("Nenhum hábito cadastrado ainda.")
+            # Só o relatório pedido é gerado
+            data = ReportFactory.create_report(args.kind, habits).generate_visualization_data()
+
+        if args.json:
+            return self._write_json({'success': True, 'report': args.kind, 'data': data})
+        for key, value in data.items():
+            # Listas e tabelas (detalhes por dia/semana/hábito) só no --json
+            if not isinstance(value, (dict, list)):
+                self._write(f"{key}\t{value}")
+        return EXIT_OK
+
+    # --- Exportação ---
+
+    def _export(self, args):
+        if args.format == 'pdf':
+            return self._export_pdf(args)
+        from view.ReportExporters import ReportExporter, FORMATS
+
+        filename = args.out or ("relatorios" if args.content == 'reports' else "historico") + FORMATS[args.format]
+        habits = self.habit_controller.handle_read_habits_request()
+        if not habits:
+            raise CommandError("Não há hábitos para exportar.")
+        exporter = ReportExporter()
+        try:
+            if args.content == 'reports':
+                rows = exporter.export_reports(ReportController.build_report_data(habits), filename, args.format)
+            else:
+                rows = exporter.export_histories(habits, filename, args.format)
+        except OSError as e:
+            raise CommandError(f"Erro ao exportar dados: {e}")
+        return self._result(args, True, f"{rows} linhas exportadas para: {filename}", files=[filename])
+
+    def _export_pdf(self, args):
+        if args.all == bool(args.habit):
+            raise CommandError("Informe o hábito ou --all")
+        # reportlab só é importado aqui
+        from view.PDFBatchExporter import PDFBatchExporter, safe_filename
+
+        if args.all:
+            habits = self.habit_controller.handle_read_habits_request()
+            if not habits:
+                raise CommandError("Não há hábitos para exportar.")
+            username = self.user_model.get_logged_in_username()
+            try:
+                stats = PDFBatchExporter(args.workers).export_all({username: habits}, args.out or 'relatorios_pdf',
+                                                                  merged=args.merged, full_history=args.full_history)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Erro ao exportar PDF: {e}")
+            for name, error in stats['failures']:
+                self.stderr.write(f"Falha ao exportar '{name}': {error}\n")
+            return self._result(args, not stats['failures'],
+                                f"{len(stats['files'])} PDF(s), {stats['pages']} páginas, "
+                                f"{stats['wall_seconds']:.2f} s", files=stats['files'])
+
+        from view.PDFExporter import PDFExporter
+
+        habit = self._find_habit(args.habit)
+        filename = args.out or f"relatorio_{safe_filename(habit['name'])}.pdf"
+        try:
+            pages = PDFExporter.get_instance().export_habit_report(habit, filename, args.full_history)
+        except Exception as e:
+            raise CommandError(f"Erro ao exportar PDF: {e}")
+        return self._result(args, True, f"{pages} página(s) exportada(s) para: {filename}", files=[filename])
+
+    # --- Saída ---
+
+    def _result(self, args, success, message, **payload):
+        """Escreve o resultado (sucesso, mensagem) de uma ação. Returns: código de saída."""
+        if not success:
+            return self._fail(args, message, **payload)
+        if args.json:
+            return self._write_json({'success': True, 'message': message, **payload})
+        self._write(message)
+        for filename in payload.get('files', ()):
+            self._write(filename)
+        return EXIT_OK
+
+    def _fail(self, args, message, **payload):
+        if args.json:
+            self._write_json({'success': False, 'message': message, **payload})
+        self.stderr.write(f"Erro: {message}\n")
+        return EXIT_FAILURE
+
+    def _write(self, line):
+        self.stdout.write(line + "\n")
+
+    def _write_json(self, payload):
+        # Uma linha por comando: o batch produz NDJSON
+        self._write(json.dumps(payload, ensure_ascii=False))
+        return EXIT_OK
+
+
+def run_cli(argv, stdin=None, stdout=None, stderr=None, environ=None):
+    """
+    Interpreta e executa um comando (ou um lote, com 'batch').
+
+    Args:
+        argv: Argumentos, começando pelo comando (ex.: ['habit', 'list'])
+        environ: Variáveis de ambiente (padrão: os.environ)
+
+    Returns:
+        Código de saída (EXIT_OK, EXIT_FAILURE, EXIT_USAGE ou EXIT_AUTH)
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    environ = os.environ if environ is None else environ
+
+    parser = build_parser()
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        return e.code
+
+    user_model = UserModel()
+    if args.command == 'token':
+        return _run_token(args, user_model, stdin, stdout, stderr, environ)
+
+    success, message = _authenticate(args, user_model, environ)
+    if not success:
+        stderr.write(f"{message}\n")
+        return EXIT_AUTH
+
+    view = CommandLineView(HabitController(HabitModel(user_model)), user_model, stdout, stderr)
+    if args.command == 'batch':
+        return view.run_batch(parser, stdin, args.stop_on_error)
+    return view.execute(args)
+
+
+def _authenticate(args, user_model, environ):
+    """Autentica pelo token de API ou por usuário e senha do ambiente. Returns: (sucesso, mensagem)."""
+    token = args.token or environ.get(TOKEN_ENV)
+    if token:
+        return user_model.authenticate_token(token)
+    username = args.user or environ.get(USER_ENV)
+    password = environ.get(PASSWORD_ENV)
+    if username and password:
+        return user_model.authenticate(username, password)
+    return False, (f"Erro: informe --token ou ${TOKEN_ENV} "
+                   f"(ou --user/${USER_ENV} com a senha em ${PASSWORD_ENV}).")
+
+
+def _run_token(args, user_model, stdin, stdout, stderr, environ):
+    """'token create' / 'token revoke' (exigem usuário e senha; nunca o próprio token)."""
+    username = args.user or environ.get(USER_ENV)
+    password = environ.get(PASSWORD_ENV)
+    if username and not password and stdin.isatty():
+        import getpass
+        password = getpass.getpass(f"Senha de {username}: ")
+    if not (username and password):
+        stderr.write(f"Erro: informe --user/${USER_ENV} e a senha em ${PASSWORD_ENV}.\n")
+        return EXIT_AUTH
+
+    view = CommandLineView(None, user_model, stdout, stderr)
+    if args.action == 'create':
+        success, message, token = user_model.create_api_token(username, password)
+        if success and not args.json:
+            # Só o token no stdout: TOKEN=$(HabitTracker.py token create)
+            stderr.write(f"{message} Guarde-o: ele não será mostrado de novo.\n")
+            stdout.write(f"{token}\n")
+            return EXIT_OK
+        payload = {'token': token} if success else {}
+        return view._result(args, success, message, **payload)
+    success, message = user_model.revoke_api_tokens(username, password)
+    return view._result(args, success, message)
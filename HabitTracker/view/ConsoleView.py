@@ -87,9 +87,11 @@ class ConsoleView:
         desc = input("Nova Descrição (deixe vazio para manter): ") or None
         active_input = input("Status Ativo (S/N, deixe vazio para manter): ")
         active = {'S': True, 'N': False}.get(active_input.upper(), None)
+        retention_input = input("Guardar só o resumo mensal do histórico antigo? (S/N, deixe vazio para manter): ")
+        retention = {'S': 'summary', 'N': 'full'}.get(retention_input.upper(), None)
 
         success, message = self.habit_controller.handle_update_habit_request(
-            habit_id, name, desc, active
+            habit_id, name, desc, active, retention=retention
         )
         if success:
             self.show_message(message)
@@ -112,6 +114,25 @@ class ConsoleView:
         else:
             self.show_error(message)
 
+    def handle_archived_habits_input(self):
+        """Exibe os hábitos arquivados e permite restaurar um deles."""
+        habits = self.habit_controller.handle_read_archived_habits_request()
+        print("\n--- HÁBITOS ARQUIVADOS ---")
+        if not habits:
+            print("Nenhum hábito arquivado.")
+            return
+
+        self.display_habits(habits)
+        habit_id = input("Digite o ID do hábito a restaurar (Enter para voltar): ").strip()
+        if not habit_id:
+            return
+
+        success, message = self.habit_controller.handle_restore_habit_request(habit_id)
+        if success:
+            self.show_message(message)
+        else:
+            self.show_error(message)
+
     # --- R2: Registro de Progresso ---
 
     def handle_mark_done_input(self):
@@ -174,6 +195,7 @@ class ConsoleView:
             try:
                 start_date = input("Data Inicial (YYYY-MM-DD): ").strip()
                 end_date = input("Data Final (YYYY-MM-DD): ").strip()
+                include_archived = input("Incluir hábitos arquivados? (S/N): ").strip().upper() == 'S'
                 
                 # Validar formato de data
                 from datetime import datetime
@@ -181,7 +203,9 @@ class ConsoleView:
                 datetime.strptime(end_date, '%Y-%m-%d')
                 
                 # Tentar gerar o relatório
-                success, message, report_data = report_controller.generate_custom_report(start_date, end_date)
+                success, message, report_data = report_controller.generate_custom_report(
+                    start_date, end_date, include_archived
+                )
                 
                 if success:
                     self.show_message(message)
@@ -199,6 +223,35 @@ class ConsoleView:
                 if retry != 'S':
                     return
     
+    # --- Manutenção: Compactação de dados ---
+
+    def handle_vacuum_input(self):
+        """Captura opções e executa a compactação dos dados de hábitos."""
+        print("\n--- COMPACTAR DADOS ---")
+        days_input = input("Arquivar hábitos inativos há mais de N dias (Enter para não arquivar): ").strip()
+
+        archive_after_days = None
+        if days_input:
+            try:
+                archive_after_days = int(days_input)
+            except ValueError:
+                self.show_error("Por favor, digite um número válido.")
+                return
+
+        stats = self.habit_controller.handle_vacuum_request(archive_after_days)
+        self.display_vacuum_stats(stats)
+
+    def display_vacuum_stats(self, stats):
+        """Exibe as estatísticas da compactação."""
+        print("\n--- RESULTADO DA COMPACTAÇÃO ---")
+        print(f"Registros removidos do histórico: {stats['entries_removed']}")
+        print(f"Hábitos arquivados: {stats['habits_archived']}")
+        print(f"Tamanho do arquivo: {stats['bytes_before']} -> {stats['bytes_after']} bytes "
+              f"({stats['bytes_reclaimed']} bytes recuperados)")
+        print(f"Tempo de carregamento: {stats['load_seconds_before'] * 1000:.2f} ms -> "
+              f"{stats['load_seconds_after'] * 1000:.2f} ms")
+        print("--------------------------------")
+
     # --- Exportação de PDF ---
     
     def handle_export_pdf_input(self):
@@ -214,7 +267,12 @@ class ConsoleView:
         self.display_habits(habits)
         
         try:
-            habit_index = int(input("Digite o número do hábito para exportar (1-{}): ".format(len(habits)))) - 1
+            choice = input("Digite o número do hábito para exportar (1-{}) ou T para todos: ".format(len(habits))).strip()
+            if choice.upper() == 'T':
+                self.handle_export_all_pdf_input(habits)
+                return
+            
+            habit_index = int(choice) - 1
             
             if habit_index < 0 or habit_index >= len(habits):
                 self.show_error("Número inválido.")
@@ -232,13 +290,109 @@ class ConsoleView:
             if not filename.endswith('.pdf'):
                 filename += '.pdf'
             
+            full_history = input("Incluir histórico completo? (S/N): ").strip().upper() == 'S'
+            
             # Exportar usando Singleton
             exporter = PDFExporter.get_instance()
-            exporter.export_habit_report(selected_habit, filename)
+            exporter.export_habit_report(selected_habit, filename, full_history)
             
             self.show_message(f"✅ Relatório exportado com sucesso!\nArquivo salvo em: {filename}")
             
         except ValueError:
             self.show_error("Por favor, digite um número válido.")
         except Exception as e:
-            self.show_error(f"Erro ao exportar PDF: {str(e)}")
\ No newline at end of file
+            self.show_error(f"Erro ao exportar PDF: {str(e)}")
+    
+    def handle_export_all_pdf_input(self, habits):
+        """Exporta todos os hábitos do usuário em lote (um PDF por hábito ou documento único)."""
+        from view.PDFBatchExporter import PDFBatchExporter
+        
+        output_dir = input("Diretório de saída (Enter para 'relatorios_pdf'): ").strip() or 'relatorios_pdf'
+        merged = input("Gerar um único documento? (S/N): ").strip().upper() == 'S'
+        full_history = False
+        if not merged:
+            full_history = input("Incluir histórico completo? (S/N): ").strip().upper() == 'S'
+        
+        username = self.user_model.get_logged_in_username()
+        stats = PDFBatchExporter().export_all({username: habits}, output_dir, merged=merged,
+                                              full_history=full_history)
+        self.display_batch_export_stats(stats)
+    
+    def handle_export_data_input(self, report_controller):
+        """Exporta relatórios ou históricos em CSV, NDJSON ou HTML (sem gerar PDF)."""
+        from view.ReportExporters import ReportExporter, FORMATS
+        
+        print("\n--- EXPORTAR DADOS (CSV / NDJSON / HTML) ---")
+        print("1. Relatórios Padrão (Diário, Semanal, Mensal)")
+        print("2. Histórico Completo dos Hábitos")
+        content = input("Escolha o conteúdo (1-2): ").strip()
+        if content not in ('1', '2'):
+            self.show_error("Opção inválida.")
+            return
+        
+        fmt = input(f"Formato ({'/'.join(FORMATS)}): ").strip().lower()
+        if fmt not in FORMATS:
+            self.show_error(f"Formato inválido. Use: {', '.join(FORMATS)}")
+            return
+        
+        default_filename = ("relatorios" if content == '1' else "historico") + FORMATS[fmt]
+        filename = input(f"Nome do arquivo (Enter para '{default_filename}'): ").strip() or default_filename
+        
+        exporter = ReportExporter()
+        try:
+            if content == '1':
+                report_data = report_controller.generate_report_data()
+                if report_data is None:
+                    self.show_error("Não há hábitos para exportar.")
+                    return
+                rows = exporter.export_reports(report_data, filename, fmt)
+            else:
+                habits = self.habit_controller.handle_read_habits_request()
+                if not habits:
+                    self.show_error("Não há hábitos para exportar.")
+                    return
+                rows = exporter.export_histories(habits, filename, fmt)
+        except OSError as e:
+            self.show_error(f"Erro ao exportar dados: {str(e)}")
+            return
+        
+        self.show_message(f"✅ {rows} linhas exportadas para: {filename}")
+    
+    # --- Métricas de desempenho ---
+    
+    def handle_metrics_input(self):
+        """Exibe o resumo das métricas e permite salvá-las (JSON e Prometheus)."""
+        from utils.Metrics import MetricsRegistry
+        
+        registry = MetricsRegistry.get_instance()
+        lines = registry.summary_lines(top=10)
+        print("\n--- MÉTRICAS DE DESEMPENHO ---")
+        if not lines:
+            print("Nenhuma operação medida ainda.")
+            return
+        for line in lines:
+            print(f"  {line}")
+        print("------------------------------")
+        
+        if input("Salvar métricas em arquivo (JSON e Prometheus)? (S/N): ").strip().upper() != 'S':
+            return
+        directory = input("Diretório (Enter para o atual): ").strip() or "."
+        try:
+            paths = registry.dump(directory)
+        except OSError as e:
+            self.show_error(f"Erro ao salvar métricas: {str(e)}")
+            return
+        self.show_message(f"✅ Métricas salvas em: {', '.join(paths)}")
+    
+    def display_batch_export_stats(self, stats):
+        """Exibe o resultado de uma exportação em lote."""
+        print("\n--- EXPORTAÇÃO EM LOTE ---")
+        print(f"Arquivos gerados: {len(stats['files'])}")
+        print(f"Páginas: {stats['pages']}")
+        print(f"Tempo total: {stats['wall_seconds']:.2f} s ({stats['pages_per_second']:.1f} páginas/s, "
+              f"{stats['workers']} processos)")
+        if stats['failures']:
+            print(f"Falhas: {len(stats['failures'])}")
+            for name, error in stats['failures']:
+                print(f"  - {name}: {error}")
+        print("--------------------------")
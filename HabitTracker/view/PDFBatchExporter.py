@@ -0,0 +1,167 @@
+"""
+PDFBatchExporter - Exportação em lote de relatórios PDF.
+Distribui os hábitos entre processos (ProcessPoolExecutor), cada um usando
+o Singleton PDFExporter do próprio processo.
+"""
+
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from utils.Profiler import profiled
+from view.PDFExporter import PDFExporter
+
+
+def _export_one(habit, filename, full_history=False):
+    """Exporta um hábito (executado no processo de trabalho)."""
+    start = time.perf_counter()
+    try:
+        pages = PDFExporter.get_instance().export_habit_report(habit, filename, full_history)
+        error = None
+    except Exception as e:
+        pages = 0
+        error = str(e)
+    return {
+        'habit': habit.get('name', ''),
+        'filename': filename,
+        'pages': pages,
+        'seconds': time.perf_counter() - start,
+        'error': error
+    }
+
+
+def safe_filename(text):
+    """Converte um nome de hábito/usuário em nome de arquivo seguro."""
+    cleaned = re.sub(r'[^\w\-]+', '_', text.strip(), flags=re.UNICODE).strip('_')
+    return cleaned or 'habito'
+
+
+class PDFBatchExporter:
+    """Exportador em lote: um PDF por hábito (em paralelo) ou um documento único."""
+
+    def __init__(self, max_workers=None, mp_context=None):
+        """
+        Args:
+            max_workers: Número de processos (padrão: núcleos da máquina)
+            mp_context: Contexto do multiprocessing (ex.: 'spawn' quando chamado
+                a partir de uma thread da GUI, onde fork não é seguro)
+
+        Raises:
+            ValueError: Se max_workers for menor que 1
+        """
+        if max_workers is not None and max_workers < 1:
+            raise ValueError(f"max_workers deve ser maior que zero (recebido: {max_workers})")
+        self.max_workers = max_workers
+        self.mp_context = mp_context
+
+    def build_jobs(self, habits_by_user, output_dir):
+        """
+        Monta a lista de (hábito, arquivo) para exportação.
+
+        Args:
+            habits_by_user: Dicionário {username: [hábitos]}
+            output_dir: Diretório de saída (um subdiretório por usuário)
+        """
+        jobs = []
+        for username, habits in habits_by_user.items():
+            user_dir = os.path.join(output_dir, safe_filename(username))
+            os.makedirs(user_dir, exist_ok=True)
+            used = set()
+            for habit in habits:
+                base = f"relatorio_{safe_filename(habit.get('name', ''))}"
+                if base in used:
+                    base = f"{base}_{habit.get('id', '')[:8]}"
+                used.add(base)
+                jobs.append((habit, os.path.join(user_dir, base + '.pdf')))
+        return jobs
+
+    @profiled()
+    def export_all(self, habits_by_user, output_dir, merged=False, full_history=False,
+                   progress_callback=None):
+        """
+        Exporta os hábitos de todos os usuários informados.
+
+        Args:
+            habits_by_user: Dicionário {username: [hábitos]}
+            output_dir: Diretório de saída
+            merged: Se True, gera um único PDF por usuário em vez de um por hábito
+            full_history: Se True, cada PDF individual traz o histórico completo
+                (não se aplica ao documento único)
+            progress_callback: Opcional, chamado como (concluídos, total) a cada arquivo;
+                uma exceção lançada nele cancela os arquivos ainda não iniciados
+
+        Returns:
+            Dicionário com arquivos, falhas, páginas, tempo total e páginas/s
+        """
+        start = time.perf_counter()
+        os.makedirs(output_dir, exist_ok=True)
+
+        if merged:
+            results = self._export_merged(habits_by_user, output_dir, progress_callback)
+        else:
+            results = self._export_parallel(self.build_jobs(habits_by_user, output_dir), full_history,
+                                            progress_callback)
+
+        wall = time.perf_counter() - start
+        pages = sum(r['pages'] for r in results)
+        return {
+            'files': [r['filename'] for r in results if r['error'] is None],
+            'failures': [(r['habit'], r['error']) for r in results if r['error'] is not None],
+            'pages': pages,
+            'wall_seconds': wall,
+            'pages_per_second': pages / wall if wall > 0 else 0.0,
+            'workers': 1 if merged else (self.max_workers or os.cpu_count() or 1)
+        }
+
+    def _export_parallel(self, jobs, full_history=False, progress_callback=None):
+        """Distribui os jobs entre processos (ou roda direto se houver só um)."""
+        results = []
+        if len(jobs) <= 1 or self.max_workers == 1:
+            for habit, filename in jobs:
+                results.append(_export_one(habit, filename, full_history))
+                if progress_callback:
+                    progress_callback(len(results), len(jobs))
+            return results
+
+        with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self.mp_context) as pool:
+            futures = {pool.submit(_export_one, habit, filename, full_history): (habit, filename)
+                       for habit, filename in jobs}
+            try:
+                for future in as_completed(futures):
+                    habit, filename = futures[future]
+                    try:
+                        results.append(future.result())
+                    except Exception as e:
+                        # Falha do próprio processo de trabalho (ex.: processo encerrado)
+                        results.append({'habit': habit.get('name', ''), 'filename': filename,
+                                        'pages': 0, 'seconds': 0.0, 'error': str(e)})
+                    if progress_callback:
+                        progress_callback(len(results), len(jobs))
+            except BaseException:
+                # Cancelamento: descarta o que ainda não começou
+                for future in futures:
+                    future.cancel()
+                raise
+        return results
+
+    def _export_merged(self, habits_by_user, output_dir, progress_callback=None):
+        """Gera um documento único por usuário com todos os hábitos."""
+        exporter = PDFExporter.get_instance()
+        results = []
+        users = [username for username, habits in habits_by_user.items() if habits]
+        for username in users:
+            habits = habits_by_user[username]
+            filename = os.path.join(output_dir, f"relatorio_{safe_filename(username)}.pdf")
+            start = time.perf_counter()
+            try:
+                pages = exporter.export_habits_report(habits, filename)
+                error = None
+            except Exception as e:
+                pages = 0
+                error = str(e)
+            results.append({'habit': username, 'filename': filename, 'pages': pages,
+                            'seconds': time.perf_counter() - start, 'error': error})
+            if progress_callback:
+                progress_callback(len(results), len(users))
+        return results
@@ -0,0 +1,145 @@
+"""
+PDFCache - Cache em disco de relatórios PDF já gerados.
+A chave é um hash do conteúdo (campos e histórico do hábito, janela de datas
+do relatório e versão do exportador): se nada mudou, o PDF anterior é copiado
+em vez de ser montado novamente.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+
+from utils.LogSetup import get_logger
+
+logger = get_logger(__name__)
+
+PDF_CACHE_DIR = ".cache_pdf"
+PDF_CACHE_MAX_BYTES = 100 * 1024 * 1024
+PDF_CACHE_MAX_AGE_DAYS = 30
+
+
+class PDFCache:
+    """Armazena um PDF por chave (<chave>.pdf) com metadados em <chave>.json."""
+
+    def __init__(self, directory=PDF_CACHE_DIR, max_bytes=PDF_CACHE_MAX_BYTES,
+                 max_age_days=PDF_CACHE_MAX_AGE_DAYS):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+
+    @staticmethod
+    def make_key(habits, variant, version, today=None):
+        """
+        Calcula a chave de cache.
+
+        Args:
+            habits: Lista de hábitos incluídos no documento
+            variant: Tipo de relatório (ex.: 'habit', 'habit-full', 'merged')
+            version: Versão do exportador (muda quando o layout muda)
+            today: Data de referência; os relatórios dependem dos últimos dias
+                até hoje, então a chave muda a cada dia
+        """
+        today = today or datetime.now()
+        payload = {
+            'habits': habits,
+            'variant': variant,
+            'window': today.strftime('%Y-%m-%d'),
+            'version': version
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    def _paths(self, key):
+        base = os.path.join(self.directory, key)
+        return base + '.pdf', base + '.json'
+
+    def fetch(self, key, filename):
+        """
+        Copia o PDF em cache para `filename`.
+
+        Returns:
+            Número de páginas do PDF, ou None se não houver entrada válida
+        """
+        pdf_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            shutil.copyfile(pdf_path, filename)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+        # Atualiza o horário de acesso usado na remoção por tamanho (LRU)
+        now = time.time()
+        try:
+            os.utime(pdf_path, (now, now))
+        except OSError:
+            pass
+        return meta.get('pages', 0)
+
+    def store(self, key, filename, pages):
+        """Guarda uma cópia do PDF gerado e aplica a política de remoção."""
+        os.makedirs(self.directory, exist_ok=True)
+        pdf_path, meta_path = self._paths(key)
+
+        # Grava em arquivos temporários e troca atomicamente (vários processos podem exportar juntos)
+        suffix = f".{os.getpid()}.tmp"
+        try:
+            shutil.copyfile(filename, pdf_path + suffix)
+            with open(meta_path + suffix, 'w', encoding='utf-8') as f:
+                json.dump({'pages': pages, 'created_at': datetime.now().isoformat()}, f)
+            os.replace(pdf_path + suffix, pdf_path)
+            os.replace(meta_path + suffix, meta_path)
+        except OSError as e:
+            logger.warning("Não foi possível gravar o cache de PDF: %s", e)
+            return
+
+        self.evict()
+
+    def evict(self):
+        """
+        Remove entradas mais antigas que `max_age_days` e, se o cache ainda
+        exceder `max_bytes`, as menos usadas recentemente.
+
+        Returns:
+            Número de entradas removidas
+        """
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return 0
+
+        entries = []
+        for name in names:
+            if not name.endswith('.pdf'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name[:-4]))
+
+        cutoff = time.time() - self.max_age_days * 86400
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for mtime, size, key in entries:
+            if mtime >= cutoff and total <= self.max_bytes:
+                break
+            self._remove(key)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        """Remove todas as entradas do cache."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _remove(self, key):
+        for path in self._paths(key):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,181 @@
+"""
+PDFCharts - Gráficos vetoriais para os relatórios PDF.
+Construídos com reportlab.graphics (Drawing é um flowable), sem depender do
+matplotlib: o PDF fica pequeno, a exportação rápida e funciona sem display.
+"""
+
+import calendar
+from datetime import datetime, timedelta
+
+from reportlab.graphics.shapes import Drawing, Line, Path, Rect, String
+from reportlab.lib import colors
+
+CHART_WIDTH = 450
+
+COLOR_DONE = colors.HexColor('#27ae60')
+COLOR_PENDING = colors.HexColor('#ecf0f1')
+COLOR_AXIS = colors.HexColor('#7f8c8d')
+COLOR_TEXT = colors.HexColor('#2c3e50')
+
+MONTH_ABBR_PT = ('Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
+                 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez')
+
+
+def _last_months(n, today):
+    """Lista os últimos `n` meses (ano, mês), do mais antigo ao atual."""
+    year, month = today.year, today.month
+    months = []
+    for _ in range(n):
+        months.append((year, month))
+        month -= 1
+        if month == 0:
+            year, month = year - 1, 12
+    return list(reversed(months))
+
+
+def _title(drawing, text, y):
+    drawing.add(String(0, y, text, fontName='Helvetica-Bold', fontSize=11, fillColor=COLOR_TEXT))
+
+
+def monthly_completion_rates(habit, months=12, today=None):
+    """
+    Taxa de conclusão (%) de cada um dos últimos `months` meses.
+    Meses resumidos (retenção 'summary') usam a contagem do resumo mensal.
+    """
+    today = today or datetime.now()
+    history = habit.get('history', {})
+    rollups = habit.get('rollups', {}) if habit.get('retention') == 'summary' else {}
+
+    done_by_month = {}
+    for date_str, done in history.items():
+        if done:
+            done_by_month[date_str[:7]] = done_by_month.get(date_str[:7], 0) + 1
+    for month_key, rollup in rollups.items():
+        done_by_month[month_key] = done_by_month.get(month_key, 0) + rollup.get('count', 0)
+
+    rates = []
+    for year, month in _last_months(months, today):
+        days = calendar.monthrange(year, month)[1]
+        if (year, month) == (today.year, today.month):
+            days = today.day
+        done = done_by_month.get(f"{year:04d}-{month:02d}", 0)
+        rates.append(((year, month), min(done / days * 100, 100.0)))
+    return rates
+
+
+def completion_bar_chart(habit, months=12, today=None):
+    """Gráfico de barras com a taxa de conclusão mensal."""
+    rates = monthly_completion_rates(habit, months, today)
+
+    drawing = Drawing(CHART_WIDTH, 190)
+    _title(drawing, "Taxa de conclusão mensal (%)", 175)
+
+    # Desenhado com shapes simples: o VerticalBarChart custa mais que o resto do relatório
+    left, bottom, width, height = 30, 25, CHART_WIDTH - 40, 135
+    for value in (0, 25, 50, 75, 100):
+        y = bottom + height * value / 100
+        drawing.add(Line(left, y, left + width, y, strokeColor=COLOR_PENDING, strokeWidth=0.5))
+        drawing.add(String(left - 4, y - 2.5, str(value), fontSize=7,
+                           fillColor=COLOR_AXIS, textAnchor='end'))
+
+    slot = width / len(rates)
+    bar_width = slot * 0.6
+    for i, ((_, month), rate) in enumerate(rates):
+        x = left + i * slot + (slot - bar_width) / 2
+        if rate > 0:
+            drawing.add(Rect(x, bottom, bar_width, height * rate / 100,
+                             fillColor=COLOR_DONE, strokeColor=None))
+        drawing.add(String(x + bar_width / 2, bottom - 11, MONTH_ABBR_PT[month - 1], fontSize=7,
+                           fillColor=COLOR_AXIS, textAnchor='middle'))
+
+    drawing.add(Line(left, bottom, left + width, bottom, strokeColor=COLOR_AXIS, strokeWidth=0.5))
+    return drawing
+
+
+def streak_segments(history, start, end):
+    """Sequências de dias concluídos consecutivos entre `start` e `end` (datas)."""
+    segments = []
+    run_start = None
+    day = start
+    while day <= end:
+        done = history.get(day.strftime('%Y-%m-%d'), False)
+        if done and run_start is None:
+            run_start = day
+        elif not done and run_start is not None:
+            segments.append((run_start, day - timedelta(days=1)))
+            run_start = None
+        day += timedelta(days=1)
+    if run_start is not None:
+        segments.append((run_start, end))
+    return segments
+
+
+def streak_timeline(habit, days=90, today=None):
+    """Linha do tempo dos últimos `days` dias, destacando as sequências."""
+    end = (today or datetime.now()).date()
+    start = end - timedelta(days=days - 1)
+    segments = streak_segments(habit.get('history', {}), start, end)
+
+    drawing = Drawing(CHART_WIDTH, 80)
+    _title(drawing, f"Sequências nos últimos {days} dias", 65)
+
+    left, width, y, height = 10, CHART_WIDTH - 20, 25, 22
+    day_width = width / days
+    drawing.add(Rect(left, y, width, height, fillColor=COLOR_PENDING, strokeColor=None))
+    for seg_start, seg_end in segments:
+        x = left + (seg_start - start).days * day_width
+        length = ((seg_end - seg_start).days + 1) * day_width
+        drawing.add(Rect(x, y, length, height, fillColor=COLOR_DONE, strokeColor=None))
+        if (seg_end - seg_start).days + 1 >= 3:
+            drawing.add(String(x + length / 2, y + height / 2 - 3, str((seg_end - seg_start).days + 1),
+                               fontSize=7, fillColor=colors.white, textAnchor='middle'))
+
+    drawing.add(Line(left, y - 2, left + width, y - 2, strokeColor=COLOR_AXIS, strokeWidth=0.5))
+    drawing.add(String(left, y - 12, start.strftime('%d/%m/%Y'), fontSize=7, fillColor=COLOR_AXIS))
+    drawing.add(String(left + width, y - 12, end.strftime('%d/%m/%Y'), fontSize=7,
+                       fillColor=COLOR_AXIS, textAnchor='end'))
+    return drawing
+
+
+def monthly_heatmap(habit, months=12, today=None):
+    """Mapa de calor: uma linha por mês, uma célula por dia (concluído ou não)."""
+    today = today or datetime.now()
+    history = habit.get('history', {})
+    month_list = _last_months(months, today)
+
+    cell, gap, label_width = 10, 2, 50
+    top = 18
+    height = top + len(month_list) * (cell + gap) + 18
+    drawing = Drawing(CHART_WIDTH, height)
+    _title(drawing, "Mapa de calor mensal", height - 12)
+
+    # Números dos dias (1, 5, 10, ...)
+    for day in (1, 5, 10, 15, 20, 25, 30):
+        x = label_width + (day - 1) * (cell + gap) + cell / 2
+        drawing.add(String(x, height - top - 8, str(day), fontSize=6,
+                           fillColor=COLOR_AXIS, textAnchor='middle'))
+
+    # Uma única Path por cor em vez de uma Rect por dia (centenas de shapes deixam a renderização lenta)
+    done_path = Path(fillColor=COLOR_DONE, strokeColor=None)
+    pending_path = Path(fillColor=COLOR_PENDING, strokeColor=None)
+
+    today_str = today.strftime('%Y-%m-%d')
+    for row, (year, month) in enumerate(month_list):
+        y = height - top - 12 - (row + 1) * (cell + gap)
+        drawing.add(String(0, y + 3, f"{MONTH_ABBR_PT[month - 1]}/{year % 100:02d}",
+                           fontSize=7, fillColor=COLOR_TEXT))
+        for day in range(1, calendar.monthrange(year, month)[1] + 1):
+            date_str = f"{year:04d}-{month:02d}-{day:02d}"
+            if date_str > today_str:
+                break
+            path = done_path if history.get(date_str, False) else pending_path
+            x = label_width + (day - 1) * (cell + gap)
+            path.moveTo(x, y)
+            path.lineTo(x + cell, y)
+            path.lineTo(x + cell, y + cell)
+            path.lineTo(x, y + cell)
+            path.closePath()
+
+    drawing.add(pending_path)
+    drawing.add(done_path)
+    return drawing
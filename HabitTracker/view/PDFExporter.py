@@ -9,7 +9,47 @@ from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, date as date_cls
+from itertools import chain
+
+from utils.LogSetup import get_logger
+from utils.Metrics import timed
+from utils.Profiler import profiled
+from view.PDFCache import PDFCache
+from view.PDFCharts import completion_bar_chart, streak_timeline, monthly_heatmap
+
+logger = get_logger(__name__)
+
+
+class _StreamingStory(list):
+    """
+    Lista de flowables abastecida sob demanda a partir de um gerador.
+    O reportlab consome o story pela frente (story[0] / del story[0]), então
+    apenas alguns flowables ficam em memória por vez, independente do tamanho
+    do histórico.
+    """
+    
+    def __init__(self, flowables, estimated_size=0, prefetch=8):
+        super().__init__()
+        self._source = iter(flowables)
+        self._prefetch = prefetch
+        # Quantidade total estimada de flowables (usada no progresso)
+        self.estimated_size = estimated_size
+    
+    def _fill(self):
+        while self._source is not None and list.__len__(self) < self._prefetch:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+    
+    def __len__(self):
+        self._fill()
+        return list.__len__(self)
+    
+    def __getitem__(self, index):
+        self._fill()
+        return list.__getitem__(self, index)
 
 
 class PDFExporter:
@@ -21,6 +61,29 @@ class PDFExporter:
     _instance = None
     _initialized = False
     
+    # Incrementar sempre que o layout dos relatórios mudar (invalida o cache de PDFs)
+    EXPORTER_VERSION = '4'
+    
+    # Tradução dos dias da semana (imutável, compartilhada entre exportações)
+    DAY_TRANSLATION = {
+        'Monday': 'Segunda-feira',
+        'Tuesday': 'Terça-feira',
+        'Wednesday': 'Quarta-feira',
+        'Thursday': 'Quinta-feira',
+        'Friday': 'Sexta-feira',
+        'Saturday': 'Sábado',
+        'Sunday': 'Domingo'
+    }
+    # Indexado por date.weekday() (0 = segunda-feira)
+    WEEKDAYS_PT = tuple(DAY_TRANSLATION.values())
+    
+    MONTHS_PT = ('Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho', 'Julho',
+                 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro')
+    
+    HISTORY_HEADER = ['Data', 'Dia da Semana', 'Status']
+    STATUS_DONE = '✅ Concluído'
+    STATUS_PENDING = '⏳ Pendente'
+    
     def __new__(cls):
         """Implementação do padrão Singleton."""
         if cls._instance is None:
@@ -32,8 +95,10 @@ class PDFExporter:
         if not PDFExporter._initialized:
             self.styles = getSampleStyleSheet()
             self._create_custom_styles()
+            self._create_table_styles()
+            self.cache = PDFCache()
             PDFExporter._initialized = True
-            print("✅ PDFExporter inicializado (Singleton)")
+            logger.debug("PDFExporter inicializado (Singleton)")
     
     @classmethod
     def get_instance(cls):
@@ -74,18 +139,167 @@ class PDFExporter:
             alignment=TA_LEFT
         ))
     
-    def export_habit_report(self, habit, filename):
+    def _create_table_styles(self):
+        """Pré-compila os estilos de tabela (imutáveis) usados em todas as exportações."""
+        self.info_table_style = TableStyle(self._key_value_style_commands('#3498db'))
+        self.summary_table_style = TableStyle(self._key_value_style_commands('#27ae60'))
+        
+        self.history_style_commands = (
+            # Header
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 11),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            
+            # Body
+            ('FONTSIZE', (0, 1), (-1, -1), 9),
+            ('ALIGN', (0, 1), (0, -1), 'CENTER'),
+            ('ALIGN', (2, 1), (2, -1), 'CENTER'),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 8),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+            ('TOPPADDING', (0, 0), (-1, -1), 6),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+            
+            # Alternar cores das linhas (linhas pares com fundo cinza)
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')]),
+        )
+        self.done_text_color = colors.HexColor('#27ae60')
+    
+    def _key_value_style_commands(self, header_color):
+        """Comandos de estilo das tabelas de duas colunas (rótulo/valor)."""
+        return [
+            # Header
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(header_color)),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('SPAN', (0, 0), (-1, 0)),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            
+            # Body
+            ('BACKGROUND', (0, 1), (0, -1), colors.HexColor('#ecf0f1')),
+            ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 1), (-1, -1), 10),
+            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 12),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 12),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ]
+    
+    @profiled()
+    @timed(output_arg='filename')
+    def export_habit_report(self, habit, filename, full_history=False, progress_callback=None,
+                            use_cache=True):
         """
         Exporta um relatório detalhado de um hábito específico.
         
         Args:
             habit (dict): Dados do hábito
             filename (str): Caminho do arquivo PDF a ser gerado
+            full_history (bool): Se True, inclui todo o histórico (uma tabela por mês)
+                em vez de apenas os últimos 30 dias
+            progress_callback (callable): Opcional, chamado como (concluídos, total)
+                durante a montagem; uma exceção lançada nele interrompe a exportação
+            use_cache (bool): Se True, reaproveita o PDF já gerado para o mesmo conteúdo
+        
+        Returns:
+            int: Número de páginas geradas
         """
-        print(f"📄 Exportando relatório PDF para: {filename}")
+        logger.info("Exportando relatório PDF para: %s", filename)
+        
+        key = self._cache_key([habit], 'habit-full' if full_history else 'habit', use_cache)
+        pages = self._fetch_cached(key, filename, progress_callback)
+        if pages is not None:
+            return pages
         
         # Criar documento
-        doc = SimpleDocTemplate(
+        doc = self._create_document(filename)
+        
+        if full_history:
+            # Flowables gerados mês a mês durante a montagem (memória limitada)
+            story = self._full_history_story(habit)
+        else:
+            # Container para os elementos do PDF
+            story = []
+            
+            # Adicionar conteúdo
+            self._add_habit_story(story, habit)
+            self._add_footer(story)
+        
+        self._attach_progress(doc, story, progress_callback)
+        
+        # Gerar PDF
+        doc.build(story)
+        logger.info("PDF gerado: %s (%d páginas)", filename, doc.page)
+        
+        if key is not None:
+            self.cache.store(key, filename, doc.page)
+        return doc.page
+    
+    @profiled()
+    @timed(output_arg='filename')
+    def export_habits_report(self, habits, filename, progress_callback=None, use_cache=True):
+        """
+        Exporta vários hábitos em um único documento (um hábito por seção).
+        
+        Args:
+            habits (list): Lista de hábitos
+            filename (str): Caminho do arquivo PDF a ser gerado
+            progress_callback (callable): Opcional, chamado como (concluídos, total)
+            use_cache (bool): Se True, reaproveita o PDF já gerado para o mesmo conteúdo
+        
+        Returns:
+            int: Número de páginas geradas
+        """
+        logger.info("Exportando %d hábitos para: %s", len(habits), filename)
+        
+        key = self._cache_key(habits, 'merged', use_cache)
+        pages = self._fetch_cached(key, filename, progress_callback)
+        if pages is not None:
+            return pages
+        
+        doc = self._create_document(filename)
+        story = []
+        
+        for i, habit in enumerate(habits):
+            if i > 0:
+                story.append(PageBreak())
+            self._add_habit_story(story, habit)
+        self._add_footer(story)
+        
+        self._attach_progress(doc, story, progress_callback)
+        doc.build(story)
+        logger.info("PDF gerado: %s (%d páginas)", filename, doc.page)
+        
+        if key is not None:
+            self.cache.store(key, filename, doc.page)
+        return doc.page
+    
+    def _cache_key(self, habits, variant, use_cache):
+        """Chave de cache do documento (None se o cache não deve ser usado)."""
+        if not use_cache or self.cache is None:
+            return None
+        return self.cache.make_key(habits, variant, self.EXPORTER_VERSION)
+    
+    def _fetch_cached(self, key, filename, progress_callback):
+        """Copia o PDF do cache, se existir. Retorna o número de páginas ou None."""
+        if key is None:
+            return None
+        pages = self.cache.fetch(key, filename)
+        if pages is not None:
+            if progress_callback:
+                progress_callback(1, 1)
+            logger.info("PDF reaproveitado do cache: %s", filename)
+        return pages
+    
+    def _create_document(self, filename):
+        """Cria o documento base com as margens padrão."""
+        return SimpleDocTemplate(
             filename,
             pagesize=A4,
             rightMargin=72,
@@ -93,20 +307,32 @@ class PDFExporter:
             topMargin=72,
             bottomMargin=18
         )
+    
+    def _attach_progress(self, doc, story, progress_callback):
+        """Repassa o progresso da montagem do documento como (concluídos, total)."""
+        if progress_callback is None:
+            return
         
-        # Container para os elementos do PDF
-        story = []
+        total = max(getattr(story, 'estimated_size', 0) or len(story), 1)
+        handled = [0]
         
-        # Adicionar conteúdo
+        def on_progress(kind, value):
+            if kind == 'PROGRESS':
+                handled[0] += 1
+                # Tabelas quebradas entre páginas contam mais de uma vez
+                progress_callback(min(handled[0], total - 1), total)
+            elif kind == 'FINISHED':
+                progress_callback(total, total)
+        
+        doc.setProgressCallBack(on_progress)
+    
+    def _add_habit_story(self, story, habit):
+        """Adiciona todas as seções de um hábito ao documento."""
         self._add_header(story, habit)
         self._add_habit_info(story, habit)
         self._add_progress_summary(story, habit)
+        self._add_charts(story, habit)
         self._add_history_table(story, habit)
-        self._add_footer(story)
-        
-        # Gerar PDF
-        doc.build(story)
-        print(f"✅ PDF gerado com sucesso: {filename}")
     
     def _add_header(self, story, habit):
         """Adiciona cabeçalho do relatório."""
@@ -136,26 +362,7 @@ class PDFExporter:
         ]
         
         table = Table(info_data, colWidths=[2.5*inch, 4*inch])
-        table.setStyle(TableStyle([
-            # Header
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('SPAN', (0, 0), (-1, 0)),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            
-            # Body
-            ('BACKGROUND', (0, 1), (0, -1), colors.HexColor('#ecf0f1')),
-            ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 12),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 12),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ]))
+        table.setStyle(self.info_table_style)
         
         story.append(table)
         story.append(Spacer(1, 0.3 * inch))
@@ -185,30 +392,22 @@ class PDFExporter:
         ]
         
         table = Table(summary_data, colWidths=[2.5*inch, 4*inch])
-        table.setStyle(TableStyle([
-            # Header
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#27ae60')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('SPAN', (0, 0), (-1, 0)),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            
-            # Body
-            ('BACKGROUND', (0, 1), (0, -1), colors.HexColor('#ecf0f1')),
-            ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 12),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 12),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ]))
+        table.setStyle(self.summary_table_style)
         
         story.append(table)
         story.append(Spacer(1, 0.3 * inch))
     
+    def _add_charts(self, story, habit):
+        """Adiciona os gráficos vetoriais (conclusão mensal, sequências e mapa de calor)."""
+        if not habit.get('history') and not habit.get('rollups'):
+            return
+        
+        story.append(Paragraph("Gráficos", self.styles['CustomHeading']))
+        for chart in (completion_bar_chart(habit), streak_timeline(habit), monthly_heatmap(habit)):
+            story.append(chart)
+            story.append(Spacer(1, 0.2 * inch))
+        story.append(Spacer(1, 0.1 * inch))
+    
     def _add_history_table(self, story, habit):
         """Adiciona tabela com histórico detalhado."""
         history = habit.get('history', {})
@@ -223,74 +422,117 @@ class PDFExporter:
         story.append(title)
         story.append(Spacer(1, 0.1 * inch))
         
-        # Preparar dados da tabela
-        table_data = [['Data', 'Dia da Semana', 'Status']]
-        
-        # Últimos 30 dias
+        # Preparar dados da tabela (últimos 30 dias)
         today = datetime.now()
+        table_data = [self.HISTORY_HEADER]
+        done_rows = []
         for i in range(29, -1, -1):
             date = today - timedelta(days=i)
             date_str = date.strftime('%Y-%m-%d')
-            day_name = date.strftime('%A')
-            
-            # Traduzir dia da semana
-            day_translation = {
-                'Monday': 'Segunda-feira',
-                'Tuesday': 'Terça-feira',
-                'Wednesday': 'Quarta-feira',
-                'Thursday': 'Quinta-feira',
-                'Friday': 'Sexta-feira',
-                'Saturday': 'Sábado',
-                'Sunday': 'Domingo'
-            }
-            day_name_pt = day_translation.get(day_name, day_name)
-            
-            status = '✅ Concluído' if history.get(date_str, False) else '⏳ Pendente'
-            
-            table_data.append([date_str, day_name_pt, status])
+            done = history.get(date_str, False)
+            if done:
+                done_rows.append(len(table_data))
+            table_data.append([
+                date_str,
+                self.WEEKDAYS_PT[date.weekday()],
+                self.STATUS_DONE if done else self.STATUS_PENDING
+            ])
         
         # Criar tabela
         table = Table(table_data, colWidths=[1.8*inch, 2.5*inch, 2.2*inch])
+        table.setStyle(TableStyle(self._history_style(done_rows)))
+        story.append(table)
+    
+    def _full_history_story(self, habit):
+        """Monta o story do histórico completo, gerado sob demanda."""
+        head = []
+        self._add_header(head, habit)
+        self._add_habit_info(head, habit)
+        self._add_progress_summary(head, habit)
+        self._add_charts(head, habit)
         
-        # Aplicar estilo
-        style_commands = [
-            # Header
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            
-            # Body
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('ALIGN', (0, 1), (0, -1), 'CENTER'),
-            ('ALIGN', (2, 1), (2, -1), 'CENTER'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 8),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ]
+        footer = []
+        self._add_footer(footer)
+        
+        rollups = habit.get('rollups', {}) if habit.get('retention') == 'summary' else {}
+        first_month = min(chain((d[:7] for d in habit.get('history', {})), rollups), default=None)
+        
+        # Cada mês gera 4 flowables (quebra, título, espaço e tabela/resumo)
+        sections_size = 1
+        if first_month is not None:
+            today = datetime.now().date()
+            months = (today.year - int(first_month[:4])) * 12 + today.month - int(first_month[5:7]) + 1
+            sections_size = 4 * max(months, 0)
+        
+        sections = self._iter_month_sections(habit, rollups, first_month)
+        return _StreamingStory(chain(head, sections, footer),
+                               estimated_size=len(head) + sections_size + len(footer))
+    
+    def _iter_month_sections(self, habit, rollups, first_month):
+        """Gera uma seção (título + tabela) por mês, do primeiro registro até hoje."""
+        history = habit.get('history', {})
         
-        # Alternar cores das linhas
-        for i in range(1, len(table_data)):
-            if i % 2 == 0:
-                style_commands.append(
-                    ('BACKGROUND', (0, i), (-1, i), colors.HexColor('#f8f9fa'))
-                )
+        if first_month is None:
+            yield Paragraph("Nenhum registro de progresso disponível.", self.styles['CustomBody'])
+            return
+        
+        today = datetime.now().date()
+        year, month = int(first_month[:4]), int(first_month[5:7])
+        while (year, month) <= (today.year, today.month):
+            month_key = f"{year:04d}-{month:02d}"
+            yield PageBreak()
+            yield Paragraph(
+                f"Histórico de {self.MONTHS_PT[month - 1]} de {year}",
+                self.styles['CustomHeading']
+            )
+            yield Spacer(1, 0.1 * inch)
             
-            # Destacar dias concluídos
-            if '✅' in table_data[i][2]:
-                style_commands.append(
-                    ('TEXTCOLOR', (2, i), (2, i), colors.HexColor('#27ae60'))
-                )
-                style_commands.append(
-                    ('FONTNAME', (2, i), (2, i), 'Helvetica-Bold')
-                )
-        
-        table.setStyle(TableStyle(style_commands))
-        story.append(table)
+            if month_key in rollups:
+                yield self._month_rollup_paragraph(rollups[month_key])
+            else:
+                yield self._month_history_table(history, year, month, today)
+            
+            month += 1
+            if month > 12:
+                year, month = year + 1, 1
+    
+    def _month_history_table(self, history, year, month, today):
+        """Tabela diária de um mês (até a data de hoje)."""
+        table_data = [self.HISTORY_HEADER]
+        done_rows = []
+        day = date_cls(year, month, 1)
+        while day.month == month and day <= today:
+            date_str = day.isoformat()
+            done = history.get(date_str, False)
+            if done:
+                done_rows.append(len(table_data))
+            table_data.append([
+                date_str,
+                self.WEEKDAYS_PT[day.weekday()],
+                self.STATUS_DONE if done else self.STATUS_PENDING
+            ])
+            day += timedelta(days=1)
+        
+        table = Table(table_data, colWidths=[1.8*inch, 2.5*inch, 2.2*inch], repeatRows=1)
+        table.setStyle(TableStyle(self._history_style(done_rows)))
+        return table
+    
+    def _month_rollup_paragraph(self, rollup):
+        """Resumo de um mês cujo detalhe diário foi descartado."""
+        text = (
+            f"Histórico resumido: <b>{rollup.get('count', 0)}</b> dias concluídos, "
+            f"maior sequência de <b>{rollup.get('longest_streak', 0)}</b> dias "
+            f"(de {rollup.get('first') or 'N/A'} a {rollup.get('last') or 'N/A'})."
+        )
+        return Paragraph(text, self.styles['CustomBody'])
+    
+    def _history_style(self, done_rows):
+        """Estilo da tabela de histórico: base pré-compilada + destaque dos dias concluídos."""
+        color = self.done_text_color
+        commands = list(self.history_style_commands)
+        commands.extend(('TEXTCOLOR', (2, row), (2, row), color) for row in done_rows)
+        commands.extend(('FONTNAME', (2, row), (2, row), 'Helvetica-Bold') for row in done_rows)
+        return commands
     
     def _add_footer(self, story):
         """Adiciona rodapé ao relatório."""
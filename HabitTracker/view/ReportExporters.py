@@ -0,0 +1,185 @@
+"""
+ReportExporters - Exportação leve dos dados de relatório (CSV, NDJSON e HTML).
+Alternativa rápida ao PDF para quem só quer os números: as linhas são
+produzidas por geradores e gravadas uma a uma, sem montar o conjunto inteiro
+em memória.
+"""
+
+import csv
+import html
+import json
+from datetime import datetime
+
+from utils.Metrics import timed
+from utils.Profiler import profiled
+
+FORMATS = {
+    'csv': '.csv',
+    'ndjson': '.ndjson',
+    'html': '.html'
+}
+
+REPORT_FIELDS = ('relatorio', 'secao', 'item', 'campo', 'valor')
+HISTORY_FIELDS = ('habito_id', 'habito', 'data', 'concluido')
+
+
+# --- Geradores de linhas ---
+
+def _format_value(value):
+    """Listas viram texto separado por ';' (ex.: datas de uma semana)."""
+    if isinstance(value, (list, tuple)):
+        return ';'.join(str(v) for v in value)
+    return value
+
+
+def iter_report_rows(report_name, payload):
+    """
+    Achata o resultado de generate_visualization_data em linhas
+    (relatorio, secao, item, campo, valor).
+
+    Valores simples vão para a seção 'resumo'; listas de dicionários
+    (habits_detail, weekly_summary) e dicionários aninhados (daily_data,
+    monthly_rollups) geram uma linha por campo de cada item.
+    """
+    for key, value in payload.items():
+        if isinstance(value, dict):
+            for item_key in sorted(value):
+                item = value[item_key]
+                if isinstance(item, dict):
+                    for field, field_value in item.items():
+                        yield dict(zip(REPORT_FIELDS, (report_name, key, item_key, field,
+                                                       _format_value(field_value))))
+                else:
+                    yield dict(zip(REPORT_FIELDS, (report_name, key, item_key, '', _format_value(item))))
+        elif isinstance(value, list):
+            for index, item in enumerate(value, start=1):
+                if isinstance(item, dict):
+                    label = item.get('name') or item.get('week') or str(index)
+                    for field, field_value in item.items():
+                        yield dict(zip(REPORT_FIELDS, (report_name, key, label, field,
+                                                       _format_value(field_value))))
+                else:
+                    yield dict(zip(REPORT_FIELDS, (report_name, key, str(index), '', _format_value(item))))
+        else:
+            yield dict(zip(REPORT_FIELDS, (report_name, 'resumo', '', key, value)))
+
+
+def iter_reports_rows(report_data):
+    """Linhas de vários relatórios ({nome: payload}) em sequência."""
+    for report_name, payload in report_data.items():
+        if payload:
+            yield from iter_report_rows(report_name, payload)
+
+
+def iter_history_rows(habits):
+    """Uma linha por dia registrado de cada hábito, em ordem de data."""
+    for habit in habits:
+        history = habit.get('history', {})
+        for date_str in sorted(history):
+            yield {
+                'habito_id': habit.get('id', ''),
+                'habito': habit.get('name', ''),
+                'data': date_str,
+                'concluido': bool(history[date_str])
+            }
+
+
+# --- Escritores ---
+
+def write_csv(rows, filename, fieldnames):
+    """Grava as linhas em CSV. Retorna a quantidade de linhas."""
+    count = 0
+    with open(filename, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def write_ndjson(rows, filename):
+    """Grava uma linha JSON por registro. Retorna a quantidade de linhas."""
+    count = 0
+    with open(filename, 'w', encoding='utf-8') as f:
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False))
+            f.write('\n')
+            count += 1
+    return count
+
+
+_HTML_HEAD = """<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: Arial, sans-serif; color: #2c3e50; margin: 2em; }}
+h1 {{ color: #2c3e50; }}
+table {{ border-collapse: collapse; width: 100%; margin-bottom: 2em; }}
+th {{ background: #3498db; color: white; text-align: left; padding: 6px; }}
+td {{ border-bottom: 1px solid #ecf0f1; padding: 4px 6px; }}
+tr:nth-child(even) td {{ background: #f8f9fa; }}
+footer {{ color: #7f8c8d; font-size: 0.85em; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+"""
+
+
+def write_html(rows, filename, fieldnames, title):
+    """Grava as linhas como uma página HTML estática com uma tabela. Retorna a quantidade de linhas."""
+    count = 0
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write(_HTML_HEAD.format(title=html.escape(title)))
+        f.write('<table>\n<tr>')
+        f.write(''.join(f'<th>{html.escape(name)}</th>' for name in fieldnames))
+        f.write('</tr>\n')
+        for row in rows:
+            f.write('<tr>')
+            f.write(''.join(f'<td>{html.escape(str(row.get(name, "")))}</td>' for name in fieldnames))
+            f.write('</tr>\n')
+            count += 1
+        f.write('</table>\n')
+        f.write(f"<footer>Gerado em {datetime.now().strftime('%d/%m/%Y %H:%M:%S')} pelo Habit Tracker.</footer>\n")
+        f.write('</body>\n</html>\n')
+    return count
+
+
+class ReportExporter:
+    """Exporta relatórios e históricos em CSV, NDJSON ou HTML."""
+
+    @profiled()
+    @timed(output_arg='filename')
+    def export_reports(self, report_data, filename, fmt):
+        """
+        Exporta os dados de relatório.
+
+        Args:
+            report_data: Dicionário {nome: payload de generate_visualization_data}
+            filename: Arquivo de saída
+            fmt: 'csv', 'ndjson' ou 'html'
+
+        Returns:
+            Quantidade de linhas gravadas
+        """
+        return self._write(iter_reports_rows(report_data), filename, fmt,
+                           REPORT_FIELDS, "Relatórios do Habit Tracker")
+
+    @profiled()
+    @timed(output_arg='filename')
+    def export_histories(self, habits, filename, fmt):
+        """Exporta o histórico diário bruto dos hábitos. Retorna a quantidade de linhas."""
+        return self._write(iter_history_rows(habits), filename, fmt,
+                           HISTORY_FIELDS, "Histórico de Hábitos")
+
+    def _write(self, rows, filename, fmt, fieldnames, title):
+        if fmt == 'csv':
+            return write_csv(rows, filename, fieldnames)
+        if fmt == 'ndjson':
+            return write_ndjson(rows, filename)
+        if fmt == 'html':
+            return write_html(rows, filename, fieldnames, title)
+        raise ValueError(f"Formato de exportação inválido: {fmt}. Use: {', '.join(FORMATS)}")
@@ -0,0 +1,188 @@
+import itertools
+import os
+import queue
+import threading
+
+from utils.Profiler import get_profiler
+
+
+class ExportCancelled(Exception):
+    """Lançada dentro do job quando o usuário cancela a exportação."""
+
+
+class ExportJob:
+    """Uma exportação enfileirada, com status e progresso."""
+
+    PENDING = 'pendente'
+    RUNNING = 'exportando'
+    DONE = 'concluído'
+    CANCELLED = 'cancelado'
+    FAILED = 'erro'
+
+    FINISHED_STATES = (DONE, CANCELLED, FAILED)
+
+    def __init__(self, job_id, label, task, output=None):
+        self.id = job_id
+        self.label = label
+        self.output = output
+        self.status = self.PENDING
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self._task = task
+        self._cancel_event = threading.Event()
+
+    def is_finished(self):
+        return self.status in self.FINISHED_STATES
+
+    def cancel_requested(self):
+        return self._cancel_event.is_set()
+
+    def report_progress(self, done, total):
+        """Callback de progresso repassado ao exportador (roda na thread de trabalho)."""
+        if self._cancel_event.is_set():
+            raise ExportCancelled()
+        self.progress = done / total if total else 0.0
+
+
+class ExportJobQueue:
+    """
+    Fila de exportações da GUI.
+    Uma thread de trabalho executa os jobs em ordem; a thread do Tk apenas
+    consulta o estado dos jobs via root.after, então a janela continua
+    responsiva e os widgets nunca são tocados fora da thread principal.
+    """
+
+    POLL_MS = 150
+
+    def __init__(self, root, on_update=None):
+        """
+        Args:
+            root: Janela raiz do Tk (usada para agendar as consultas)
+            on_update: Callback on_update(job) chamado na thread do Tk a cada
+                mudança de status ou progresso
+        """
+        self.root = root
+        self.on_update = on_update
+        self._jobs = []
+        self._ids = itertools.count(1)
+        self._pending = queue.Queue()
+        self._reported = {}
+        self._poll_id = None
+
+        self._worker = threading.Thread(target=self._run, name="pdf-export", daemon=True)
+        self._worker.start()
+
+    def submit(self, label, task, output=None):
+        """
+        Enfileira uma exportação.
+
+        Args:
+            label: Descrição exibida ao usuário
+            task: Função task(progress_callback) que realiza a exportação e
+                retorna seu resultado
+            output: Arquivo/diretório gerado (removido se um arquivo for cancelado)
+
+        Returns:
+            O ExportJob criado
+        """
+        job = ExportJob(next(self._ids), label, task, output)
+        self._jobs.append(job)
+        self._pending.put(job)
+        self._schedule_poll()
+        return job
+
+    def cancel(self, job_id):
+        """Solicita o cancelamento de um job pendente ou em execução."""
+        for job in self._jobs:
+            if job.id == job_id and not job.is_finished():
+                job._cancel_event.set()
+                self._schedule_poll()
+                return True
+        return False
+
+    def jobs(self):
+        """Lista de todos os jobs (mais recentes por último)."""
+        return list(self._jobs)
+
+    def active_jobs(self):
+        """Jobs ainda não finalizados."""
+        return [job for job in self._jobs if not job.is_finished()]
+
+    def clear_finished(self):
+        """Remove da lista os jobs já finalizados."""
+        self._jobs = self.active_jobs()
+        active_ids = {job.id for job in self._jobs}
+        self._reported = {job_id: state for job_id, state in self._reported.items() if job_id in active_ids}
+
+    def shutdown(self):
+        """Cancela tudo e encerra a thread de trabalho (ao fechar a aplicação)."""
+        for job in self.active_jobs():
+            job._cancel_event.set()
+        self._pending.put(None)
+        if self._poll_id is not None:
+            try:
+                self.root.after_cancel(self._poll_id)
+            except Exception:
+                pass
+            self._poll_id = None
+
+    # --- Thread de trabalho ---
+
+    def _run(self):
+        while True:
+            job = self._pending.get()
+            if job is None:
+                return
+            if job.cancel_requested():
+                job.status = ExportJob.CANCELLED
+                continue
+
+            job.status = ExportJob.RUNNING
+            try:
+                # O cProfile mede só a thread atual: o perfil da exportação é feito aqui
+                with get_profiler().profile(f"export_{job.id}"):
+                    job.result = job._task(job.report_progress)
+                job.progress = 1.0
+                job.status = ExportJob.DONE
+            except ExportCancelled:
+                job.status = ExportJob.CANCELLED
+                self._remove_partial(job)
+            except Exception as e:
+                job.error = str(e)
+                job.status = ExportJob.FAILED
+
+    def _remove_partial(self, job):
+        """Remove o arquivo incompleto de uma exportação cancelada."""
+        if job.output and os.path.isfile(job.output):
+            try:
+                os.remove(job.output)
+            except OSError:
+                pass
+
+    # --- Thread do Tk ---
+
+    def _schedule_poll(self):
+        if self._poll_id is None:
+            self._poll_id = self.root.after(self.POLL_MS, self._poll)
+
+    def _poll(self):
+        """Entrega ao callback da interface os jobs cujo status ou progresso mudou."""
+        self._poll_id = None
+
+        for job in self.jobs():
+            state = self._state(job)
+            if self._reported.get(job.id) == state:
+                continue
+            self._reported[job.id] = state
+            if self.on_update:
+                self.on_update(job)
+
+        # Continua consultando enquanto houver job em andamento ou mudança não entregue
+        if any(not job.is_finished() or self._reported.get(job.id) != self._state(job)
+               for job in self._jobs):
+            self._schedule_poll()
+
+    @staticmethod
+    def _state(job):
+        return (job.status, round(job.progress, 2))
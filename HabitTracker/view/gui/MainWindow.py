@@ -1,7 +1,21 @@
+import multiprocessing
+import queue
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime, timedelta
 from model.ReportFactory import ReportFactory
+from view.gui.Tooltip import TooltipManager
+from view.gui.ExportJobQueue import ExportJobQueue, ExportJob
+from utils.LogSetup import get_logger
+from utils.Metrics import MetricsRegistry
+from utils.Profiler import profiled
+
+logger = get_logger(__name__)
+
+# Intervalo de atualização da barra de status com as métricas
+METRICS_REFRESH_MS = 2000
+# Intervalo em que a thread do Tk aplica as alterações feitas por outros processos
+EXTERNAL_CHANGES_MS = 250
 
 class GUIReportView:
     """View de relatórios para a GUI."""
@@ -25,7 +39,7 @@ class HabitCard(tk.Frame):
             'pink':  "#ef56dd",
     }
     
-    def __init__(self, parent, habit, on_edit, on_delete, on_mark_done, on_refresh):
+    def __init__(self, parent, habit, on_edit, on_delete, on_mark_done, on_unmark_done, on_refresh):
         # Obter cor do hábito ou usar padrão
         card_color = self.CARD_COLORS.get(habit.get('color', 'blue'), '#ecf0f1')
         
@@ -35,6 +49,7 @@ class HabitCard(tk.Frame):
         self.on_edit = on_edit
         self.on_delete = on_delete
         self.on_mark_done = on_mark_done
+        self.on_unmark_done = on_unmark_done
         self.on_refresh = on_refresh
         self.card_color = card_color
         
@@ -256,44 +271,10 @@ class HabitCard(tk.Frame):
         btn.bind('<Enter>', on_enter)
         btn.bind('<Leave>', on_leave)
         
-        # Tooltip
-        self._create_tooltip(btn, f"{'✅ Concluído' if is_completed else '⏳ Não concluído'} em {date_str}")
-    
-    def _create_tooltip(self, widget, text):
-        """Cria um tooltip (dica) ao passar o mouse."""
-        tooltip = None
-        
-        def show_tooltip(event):
-            nonlocal tooltip
-            x, y, _, _ = widget.bbox("insert")
-            x += widget.winfo_rootx() + 25
-            y += widget.winfo_rooty() + 25
-            
-            tooltip = tk.Toplevel(widget)
-            tooltip.wm_overrideredirect(True)
-            tooltip.wm_geometry(f"+{x}+{y}")
-            
-            label = tk.Label(
-                tooltip,
-                text=text,
-                background="#2c3e50",
-                foreground="white",
-                relief='solid',
-                borderwidth=1,
-                font=('Arial', 8),
-                padx=5,
-                pady=3
-            )
-            label.pack()
-        
-        def hide_tooltip(event):
-            nonlocal tooltip
-            if tooltip:
-                tooltip.destroy()
-                tooltip = None
-        
-        widget.bind('<Enter>', show_tooltip)
-        widget.bind('<Leave>', hide_tooltip)
+        # Tooltip (gerenciador compartilhado; não sobrescreve o hover acima)
+        TooltipManager.get_instance(btn).register(
+            btn, f"{'✅ Concluído' if is_completed else '⏳ Não concluído'} em {date_str}"
+        )
     
     def _toggle_day(self, date_str, current_status):
         """Marca ou desmarca o dia (toggle)."""
@@ -311,11 +292,8 @@ class HabitCard(tk.Frame):
                     messagebox.showerror("Erro", message)
         else:
             # Marcar
-            print(f"📅 Marcando hábito '{self.habit['name']}' como concluído em {date_str}")
             success, message = self.on_mark_done(self.habit['id'], date_str)
             
-            print(f"   Resultado: {'✅' if success else '❌'} {message}")
-            
             if success:
                 messagebox.showinfo("Sucesso", message)
                 self.on_refresh()
@@ -323,34 +301,90 @@ class HabitCard(tk.Frame):
                 messagebox.showwarning("Aviso", message)
     
     def _unmark_day(self, date_str):
-        """Desmarca um dia como concluído."""
-        # Atualizar o histórico localmente
-        if 'history' in self.habit and date_str in self.habit['history']:
-            self.habit['history'][date_str] = False
-            
-            # Salvar via controller (você precisará adicionar esse método)
-            # Por enquanto, vamos atualizar diretamente
-            return True, f"Hábito '{self.habit['name']}' desmarcado em {date_str}!"
-        
-        return False, "Data não encontrada no histórico."
+        """Desmarca um dia como concluído (persistido via controller)."""
+        return self.on_unmark_done(self.habit['id'], date_str)
 
 
 class MainWindow:
-    """Janela principal da aplicação GUI."""
+    """
+    Janela principal da aplicação GUI.
+
+    Também é Observer do HabitModel: alterações feitas por outro processo
+    (eventos externos, ver HabitModel.reload_external_changes) atualizam só os
+    cards afetados e a janela de relatórios aberta.
+    """
     
     def __init__(self, habit_controller, user_model):
         self.habit_controller = habit_controller
         self.user_model = user_model
+        self._cards = {}
+        self._reports_modal = None
+        # Eventos chegam na thread do watcher; o Tk só é tocado na thread principal
+        self._external_events = queue.SimpleQueue()
         
         self.root = tk.Tk()
         self.root.title("Habit Tracker - Sistema de Gerenciamento de Hábitos")
         self.root.geometry("1200x800")
         self.root.configure(bg='#ecf0f1')
         
-        print(f"🪟 GUI: Usuário logado: {self.user_model.get_logged_in_username()}")
+        # Exportações de PDF rodam em segundo plano
+        self.export_queue = ExportJobQueue(self.root, on_update=self._on_export_job_update)
+        self._jobs_window = None
+        
+        logger.debug("GUI: usuário logado: %s", self.user_model.get_logged_in_username())
         
         self._setup_ui()
+        self.habit_controller.model.attach(self)
+        self.root.after(EXTERNAL_CHANGES_MS, self._apply_external_changes)
     
+    def update(self, subject, event=None):
+        """Observer: guarda as alterações externas do usuário logado para a thread do Tk."""
+        if event and event.get('external') and event['username'] == self.user_model.get_logged_in_username():
+            self._external_events.put(event)
+
+    def _apply_external_changes(self):
+        """Aplica (na thread do Tk) as alterações externas recebidas desde a última chamada."""
+        events = []
+        while True:
+            try:
+                events.append(self._external_events.get_nowait())
+            except queue.Empty:
+                break
+        if events:
+            logger.debug("Aplicando %d alterações externas", len(events))
+            # Um card por hábito, mesmo que vários dias tenham mudado
+            changes = {}
+            for event in events:
+                changes.setdefault(event['habit_id'], set()).add(event['type'])
+            if not self._cards:
+                # Lista vazia (mensagem de boas-vindas): monta tudo
+                self._refresh_habits()
+            else:
+                for habit_id, types in changes.items():
+                    self._refresh_card(habit_id, deleted='delete' in types)
+            self._refresh_open_reports()
+        self.root.after(EXTERNAL_CHANGES_MS, self._apply_external_changes)
+
+    def _refresh_card(self, habit_id, deleted=False):
+        """Recria apenas o card do hábito (remove se foi excluído, cria se é novo)."""
+        habit = None
+        if not deleted:
+            habit = next((h for h in self.habit_controller.handle_read_habits_request() if h['id'] == habit_id), None)
+        old_card = self._cards.pop(habit_id, None)
+        if habit is not None:
+            self._add_card(habit, after=old_card)
+        if old_card is not None:
+            old_card.destroy()
+        if not self._cards:
+            self._refresh_habits()
+
+    def _refresh_open_reports(self):
+        """Reabre a janela de relatórios, se estiver aberta, com os dados atuais."""
+        if self._reports_modal is not None and self._reports_modal.winfo_exists():
+            self._reports_modal.destroy()
+            self._reports_modal = None
+            self._show_reports()
+
     def _setup_ui(self):
         """Configura toda a interface."""
         # Header
@@ -376,6 +410,48 @@ class MainWindow:
             fg='#ecf0f1'
         ).pack(side='right', padx=30)
         
+        # Status das exportações em segundo plano
+        self.export_status_label = tk.Label(
+            header_frame,
+            text="",
+            font=('Arial', 10),
+            bg='#2c3e50',
+            fg='#f1c40f',
+            cursor='hand2'
+        )
+        self.export_status_label.pack(side='right', padx=10)
+        self.export_status_label.bind('<Button-1>', lambda e: self._show_export_jobs())
+        
+        # Barra de status com as métricas de desempenho (empacotada antes do container para ficar visível)
+        status_bar = tk.Frame(self.root, bg='#bdc3c7')
+        status_bar.pack(side='bottom', fill='x')
+        
+        self.metrics_status_label = tk.Label(
+            status_bar,
+            text="",
+            font=('Arial', 9),
+            bg='#bdc3c7',
+            fg='#2c3e50',
+            anchor='w',
+            cursor='hand2'
+        )
+        self.metrics_status_label.pack(side='left', fill='x', expand=True, padx=10, pady=2)
+        self.metrics_status_label.bind('<Button-1>', lambda e: self._show_metrics())
+        
+        tk.Button(
+            status_bar,
+            text="💾 Salvar Métricas",
+            command=self._save_metrics,
+            bg='#95a5a6',
+            fg='white',
+            font=('Arial', 9),
+            bd=0,
+            padx=10,
+            cursor='hand2'
+        ).pack(side='right', padx=5, pady=2)
+        
+        self._update_metrics_status()
+        
         # Container principal
         main_container = tk.Frame(self.root, bg='#ecf0f1')
         main_container.pack(fill='both', expand=True, padx=30, pady=20)
@@ -423,6 +499,19 @@ class MainWindow:
             cursor='hand2'
         ).pack(side='left', padx=5)
         
+        tk.Button(
+            action_bar,
+            text="📋 Exportações",
+            command=self._show_export_jobs,
+            bg='#8e44ad',
+            fg='white',
+            font=('Arial', 11, 'bold'),
+            bd=0,
+            padx=20,
+            pady=10,
+            cursor='hand2'
+        ).pack(side='left', padx=5)
+        
         tk.Button(
             action_bar,
             text="🔄 Atualizar",
@@ -473,15 +562,15 @@ class MainWindow:
         
         self._refresh_habits()
     
+    @profiled()
     def _refresh_habits(self):
         """Atualiza a lista de hábitos com cards."""
-        print("🔄 Atualizando lista de hábitos...")
-        
         for widget in self.cards_frame.winfo_children():
             widget.destroy()
+        self._cards = {}
         
         habits = self.habit_controller.handle_read_habits_request()
-        print(f"📋 Hábitos recebidos: {len(habits)}")
+        logger.debug("Atualizando lista de hábitos: %d recebidos", len(habits))
         
         if not habits:
             empty_label = tk.Label(
@@ -494,26 +583,35 @@ class MainWindow:
             )
             empty_label.pack(fill='both', expand=True)
         else:
-            for i, habit in enumerate(habits):
-                print(f"   {i+1}. {habit.get('name', 'SEM NOME')} (ID: {habit.get('id', 'SEM ID')})")
-                card = HabitCard(
-                    self.cards_frame,
-                    habit,
-                    on_edit=self._edit_habit,
-                    on_delete=self._delete_habit_card,
-                    on_mark_done=self._mark_done_with_date,
-                    on_refresh=self._refresh_habits
-                )
-                card.pack(fill='x', pady=8)
-        
-        print("✅ Atualização concluída!")
+            for habit in habits:
+                self._add_card(habit)
+
+    def _add_card(self, habit, after=None):
+        """Cria o card do hábito (no fim da lista ou logo após o card `after`)."""
+        card = HabitCard(
+            self.cards_frame,
+            habit,
+            on_edit=self._edit_habit,
+            on_delete=self._delete_habit_card,
+            on_mark_done=self._mark_done_with_date,
+            on_unmark_done=self._unmark_done_with_date,
+            on_refresh=self._refresh_habits
+        )
+        if after is not None:
+            card.pack(fill='x', pady=8, after=after)
+        else:
+            card.pack(fill='x', pady=8)
+        self._cards[habit['id']] = card
     
+    @profiled()
     def _mark_done_with_date(self, habit_id, date=None):
         """Marca hábito como concluído em uma data específica."""
-        print(f"🔧 MainWindow: Chamando controller para marcar hábito {habit_id} em {date}")
-        result = self.habit_controller.handle_mark_done_request(habit_id, date)
-        print(f"🔧 MainWindow: Resultado = {result}")
-        return result
+        return self.habit_controller.handle_mark_done_request(habit_id, date)
+
+    @profiled()
+    def _unmark_done_with_date(self, habit_id, date):
+        """Desmarca a conclusão de um hábito em uma data específica."""
+        return self.habit_controller.handle_unmark_done_request(habit_id, date)
     
     def _create_habit(self):
         """Cria novo hábito."""
@@ -578,11 +676,11 @@ class MainWindow:
     
     def _edit_habit(self, habit):
         """Edita hábito."""
-        print(f"✏️ Editando hábito: {habit.get('name')} (ID: {habit.get('id')})")
-        
+        logger.debug("Editando hábito %s", habit.get('id'))
+
         dialog = tk.Toplevel(self.root)
         dialog.title("Editar Hábito")
-        dialog.geometry("500x750")
+        dialog.geometry("500x790")
         dialog.configure(bg='white')
         dialog.resizable(False, False)
         
@@ -671,40 +769,38 @@ class MainWindow:
             bg='white'
         ).pack(pady=15)
         
+        # Retenção do histórico antigo (apenas resumo mensal)
+        summary_var = tk.BooleanVar(value=habit.get('retention', 'full') == 'summary')
+        tk.Checkbutton(
+            dialog,
+            text="Guardar só o resumo mensal do histórico antigo",
+            variable=summary_var,
+            font=('Arial', 10),
+            bg='white'
+        ).pack()
+        
         def save():
             name = name_entry.get().strip()
             desc = desc_entry.get("1.0", "end-1c").strip()
             active = active_var.get()
             freq = freq_var.get()
             color = color_var.get()
-            
-            print(f"💾 Salvando edição:")
-            print(f"   - Habit ID: {habit['id']}")
-            print(f"   - Nome: '{name}'")
-            print(f"   - Descrição: '{desc}'")
-            print(f"   - Ativo: {active}")
-            print(f"   - Frequência: {freq}")
-            print(f"   - Cor: {color}")
+            retention = 'summary' if summary_var.get() else 'full'
             
             if not name:
                 messagebox.showwarning("Atenção", "O nome do hábito é obrigatório!")
                 return
             
-            # Atualizar cor no habit antes de salvar
-            habit['color'] = color
-            
             success, message = self.habit_controller.handle_update_habit_request(
                 habit['id'], 
                 name=name, 
                 description=desc, 
                 active=active, 
                 frequency=freq,
-                color=color
+                color=color,
+                retention=retention
             )
             
-            print(f"   - Resultado: {'✅ Sucesso' if success else '❌ Falha'}")
-            print(f"   - Mensagem: {message}")
-            
             if success:
                 messagebox.showinfo("Sucesso", message)
                 self._refresh_habits()
@@ -752,6 +848,7 @@ class MainWindow:
             else:
                 messagebox.showerror("Erro", message)
     
+    @profiled()
     def _show_reports(self):
         """Exibe relatórios com gráficos."""
         # Gera os dados de relatório a partir dos hábitos atuais
@@ -769,6 +866,7 @@ class MainWindow:
 
         # Janela modal para exibir relatórios
         modal = tk.Toplevel(self.root)
+        self._reports_modal = modal
         modal.title("Relatórios de Progresso")
         modal.geometry("900x600")
         modal.transient(self.root)
@@ -914,6 +1012,16 @@ class MainWindow:
         end_entry.insert(0, datetime.now().strftime('%Y-%m-%d'))
         end_entry.pack(anchor='w', pady=(0, 15))
         
+        # Hábitos arquivados (carregados do arquivo frio apenas se marcado)
+        include_archived_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            input_frame,
+            text="Incluir hábitos arquivados",
+            variable=include_archived_var,
+            font=('Arial', 10),
+            bg='white'
+        ).pack(anchor='w')
+        
         # Frame para resultado
         result_frame = tk.Frame(main_frame, bg='white')
         result_frame.pack(fill='both', expand=True, padx=10, pady=10)
@@ -933,7 +1041,13 @@ class MainWindow:
             
             # Gerar relatório
             try:
-                custom_report = ReportFactory.create_report('custom', raw_data, start_date, end_date)
+                include_archived = include_archived_var.get()
+                report_habits = raw_data
+                if include_archived:
+                    report_habits = self.habit_controller.handle_read_habits_request(include_archived=True)
+                custom_report = ReportFactory.create_report(
+                    'custom', report_habits, start_date, end_date, include_inactive=include_archived
+                )
                 custom_data = custom_report.generate_visualization_data()
                 
                 # Limpar resultado anterior
@@ -1027,7 +1141,7 @@ class MainWindow:
         # Dialog para selecionar hábito
         dialog = tk.Toplevel(self.root)
         dialog.title("Exportar Relatório em PDF")
-        dialog.geometry("500x400")
+        dialog.geometry("500x500")
         dialog.configure(bg='white')
         dialog.resizable(False, False)
         dialog.transient(self.root)
@@ -1061,6 +1175,15 @@ class MainWindow:
         for habit in habits:
             listbox.insert('end', f"{habit['name']} ({habit.get('frequency', 'daily')})")
         
+        full_history_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            dialog,
+            text="Incluir histórico completo (uma tabela por mês)",
+            variable=full_history_var,
+            font=('Arial', 10),
+            bg='white'
+        ).pack(pady=(5, 0))
+        
         def export():
             selection = listbox.curselection()
             if not selection:
@@ -1077,13 +1200,37 @@ class MainWindow:
             )
             
             if filename:
-                try:
-                    exporter = PDFExporter.get_instance()
-                    exporter.export_habit_report(selected_habit, filename)
-                    messagebox.showinfo("Sucesso", f"Relatório exportado para:\n{filename}")
-                    dialog.destroy()
-                except Exception as e:
-                    messagebox.showerror("Erro", f"Erro ao exportar PDF:\n{str(e)}")
+                # Snapshot do model: não muda durante a exportação (escritas são copy-on-write)
+                habit = selected_habit
+                full_history = full_history_var.get()
+                self.export_queue.submit(
+                    f"PDF: {habit['name']}",
+                    lambda progress: PDFExporter.get_instance().export_habit_report(
+                        habit, filename, full_history, progress),
+                    output=filename
+                )
+                dialog.destroy()
+        
+        def export_all():
+            from view.PDFBatchExporter import PDFBatchExporter
+            
+            output_dir = filedialog.askdirectory(title="Diretório para os PDFs")
+            if not output_dir:
+                return
+            
+            username = self.user_model.get_logged_in_username()
+            habits_by_user = {username: habits}
+            full_history = full_history_var.get()
+            # 'spawn': criar processos via fork a partir de uma thread com o Tk ativo não é seguro
+            exporter = PDFBatchExporter(mp_context=multiprocessing.get_context('spawn'))
+            self.export_queue.submit(
+                f"Todos os hábitos ({len(habits)})",
+                lambda progress: exporter.export_all(habits_by_user, output_dir,
+                                                     full_history=full_history,
+                                                     progress_callback=progress),
+                output=output_dir
+            )
+            dialog.destroy()
         
         # Botões
         btn_frame = tk.Frame(dialog, bg='white')
@@ -1102,6 +1249,19 @@ class MainWindow:
             cursor='hand2'
         ).pack(side='left', padx=10)
         
+        tk.Button(
+            btn_frame,
+            text="📚 Exportar Todos",
+            command=export_all,
+            bg='#8e44ad',
+            fg='white',
+            font=('Arial', 11, 'bold'),
+            bd=0,
+            padx=20,
+            pady=10,
+            cursor='hand2'
+        ).pack(side='left', padx=10)
+        
         tk.Button(
             btn_frame,
             text="Cancelar",
@@ -1114,10 +1274,217 @@ class MainWindow:
             pady=10,
             cursor='hand2'
         ).pack(side='left', padx=10)
+        
+        tk.Button(
+            dialog,
+            text="📑 Exportar Dados (CSV / NDJSON / HTML)",
+            command=lambda: (dialog.destroy(), self._export_data()),
+            bg='#16a085',
+            fg='white',
+            font=('Arial', 10, 'bold'),
+            bd=0,
+            padx=15,
+            pady=8,
+            cursor='hand2'
+        ).pack(pady=(0, 15))
+    
+    def _export_data(self):
+        """Exporta relatórios ou históricos em CSV, NDJSON ou HTML."""
+        from tkinter import filedialog
+        from view.ReportExporters import ReportExporter, FORMATS
+        
+        habits = self.habit_controller.handle_read_habits_request()
+        if not habits:
+            messagebox.showinfo("Exportar Dados", "Nenhum hábito cadastrado para exportar.")
+            return
+        
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Exportar Dados")
+        dialog.geometry("380x300")
+        dialog.configure(bg='white')
+        dialog.resizable(False, False)
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        content_var = tk.StringVar(value='reports')
+        fmt_var = tk.StringVar(value='csv')
+        
+        tk.Label(dialog, text="Conteúdo:", font=('Arial', 11, 'bold'), bg='white').pack(anchor='w', padx=25, pady=(20, 5))
+        for value, text in (('reports', "Relatórios (Diário, Semanal, Mensal)"),
+                            ('history', "Histórico completo dos hábitos")):
+            tk.Radiobutton(dialog, text=text, variable=content_var, value=value,
+                           font=('Arial', 10), bg='white').pack(anchor='w', padx=35)
+        
+        tk.Label(dialog, text="Formato:", font=('Arial', 11, 'bold'), bg='white').pack(anchor='w', padx=25, pady=(15, 5))
+        fmt_frame = tk.Frame(dialog, bg='white')
+        fmt_frame.pack(anchor='w', padx=35)
+        for fmt in FORMATS:
+            tk.Radiobutton(fmt_frame, text=fmt.upper(), variable=fmt_var, value=fmt,
+                           font=('Arial', 10), bg='white').pack(side='left', padx=(0, 15))
+        
+        def export():
+            content, fmt = content_var.get(), fmt_var.get()
+            filename = filedialog.asksaveasfilename(
+                defaultextension=FORMATS[fmt],
+                filetypes=[(fmt.upper(), f"*{FORMATS[fmt]}")],
+                initialfile=("relatorios" if content == 'reports' else "historico") + FORMATS[fmt]
+            )
+            if not filename:
+                return
+            
+            exporter = ReportExporter()
+            if content == 'reports':
+                report_data = {
+                    'daily': ReportFactory.create_report('daily', habits).generate_visualization_data(),
+                    'weekly': ReportFactory.create_report('weekly', habits).generate_visualization_data(),
+                    'monthly': ReportFactory.create_report('monthly', habits).generate_visualization_data(),
+                }
+                task = lambda progress: exporter.export_reports(report_data, filename, fmt)
+            else:
+                task = lambda progress: exporter.export_histories(habits, filename, fmt)
+            
+            self.export_queue.submit(f"Dados ({fmt.upper()})", task, output=filename)
+            dialog.destroy()
+        
+        btn_frame = tk.Frame(dialog, bg='white')
+        btn_frame.pack(pady=20)
+        
+        tk.Button(btn_frame, text="📑 Exportar", command=export, bg='#16a085', fg='white',
+                  font=('Arial', 11, 'bold'), bd=0, padx=20, pady=8, cursor='hand2').pack(side='left', padx=10)
+        tk.Button(btn_frame, text="Cancelar", command=dialog.destroy, bg='#95a5a6', fg='white',
+                  font=('Arial', 11, 'bold'), bd=0, padx=20, pady=8, cursor='hand2').pack(side='left', padx=10)
+    
+    def _on_export_job_update(self, job):
+        """Atualiza a interface quando uma exportação muda de status (thread do Tk)."""
+        active = self.export_queue.active_jobs()
+        if active:
+            running = next((j for j in active if j.status == ExportJob.RUNNING), active[0])
+            text = f"⏳ {running.label} ({running.progress:.0%})"
+            if len(active) > 1:
+                text += f" +{len(active) - 1} na fila"
+            self.export_status_label.config(text=text)
+        else:
+            self.export_status_label.config(text="")
+        
+        self._refresh_export_jobs_window()
+        
+        if job.status == ExportJob.DONE:
+            summary = f"{job.label}\nExportado para:\n{job.output}"
+            if isinstance(job.result, dict):
+                summary = (f"{len(job.result['files'])} PDFs gerados em {job.result['wall_seconds']:.1f} s "
+                           f"({job.result['pages_per_second']:.1f} páginas/s)\nDiretório: {job.output}")
+                if job.result['failures']:
+                    failures = "\n".join(f"- {name}: {error}" for name, error in job.result['failures'])
+                    messagebox.showwarning("Exportação em lote", f"{summary}\n\nFalhas:\n{failures}")
+                    return
+            messagebox.showinfo("Exportação concluída", summary)
+        elif job.status == ExportJob.FAILED:
+            messagebox.showerror("Erro", f"Erro ao exportar PDF ({job.label}):\n{job.error}")
+    
+    def _show_export_jobs(self):
+        """Exibe a fila de exportações, com progresso e opção de cancelar."""
+        if self._jobs_window is not None and self._jobs_window.winfo_exists():
+            self._jobs_window.lift()
+            return
+        
+        window = tk.Toplevel(self.root)
+        window.title("Exportações")
+        window.geometry("560x320")
+        window.configure(bg='white')
+        window.transient(self.root)
+        self._jobs_window = window
+        
+        tree = ttk.Treeview(window, columns=('label', 'status', 'progress'), show='headings', height=8)
+        tree.heading('label', text='Exportação')
+        tree.heading('status', text='Status')
+        tree.heading('progress', text='Progresso')
+        tree.column('label', width=300)
+        tree.column('status', width=120)
+        tree.column('progress', width=100, anchor='center')
+        tree.pack(fill='both', expand=True, padx=15, pady=15)
+        window.jobs_tree = tree
+        
+        def cancel_selected():
+            for item in tree.selection():
+                self.export_queue.cancel(int(item))
+        
+        def clear_finished():
+            self.export_queue.clear_finished()
+            self._refresh_export_jobs_window()
+        
+        btn_frame = tk.Frame(window, bg='white')
+        btn_frame.pack(pady=(0, 15))
+        
+        for text, command, color in (("⛔ Cancelar", cancel_selected, '#e74c3c'),
+                                     ("🧹 Limpar Concluídas", clear_finished, '#95a5a6'),
+                                     ("Fechar", window.destroy, '#7f8c8d')):
+            tk.Button(
+                btn_frame,
+                text=text,
+                command=command,
+                bg=color,
+                fg='white',
+                font=('Arial', 10, 'bold'),
+                bd=0,
+                padx=15,
+                pady=8,
+                cursor='hand2'
+            ).pack(side='left', padx=5)
+        
+        self._refresh_export_jobs_window()
+    
+    def _refresh_export_jobs_window(self):
+        """Sincroniza a lista da janela de exportações com a fila."""
+        window = self._jobs_window
+        if window is None or not window.winfo_exists():
+            return
+        
+        tree = window.jobs_tree
+        jobs = self.export_queue.jobs()
+        current = {str(job.id) for job in jobs}
+        for item in tree.get_children():
+            if item not in current:
+                tree.delete(item)
+        
+        for job in jobs:
+            values = (job.label, job.status, f"{job.progress:.0%}")
+            if tree.exists(str(job.id)):
+                tree.item(str(job.id), values=values)
+            else:
+                tree.insert('', 'end', iid=str(job.id), values=values)
+    
+    def _update_metrics_status(self):
+        """Atualiza a barra de status com o resumo das métricas (periodicamente)."""
+        self.metrics_status_label.config(text=MetricsRegistry.get_instance().status_text())
+        self.root.after(METRICS_REFRESH_MS, self._update_metrics_status)
+    
+    def _show_metrics(self):
+        """Exibe as operações com maior tempo total."""
+        lines = MetricsRegistry.get_instance().summary_lines(top=10)
+        messagebox.showinfo("Métricas de desempenho", "\n".join(lines) or "Nenhuma operação medida ainda.")
+    
+    def _save_metrics(self):
+        """Salva as métricas em JSON e no formato do Prometheus."""
+        from tkinter import filedialog
+        
+        directory = filedialog.askdirectory(title="Diretório para as métricas")
+        if not directory:
+            return
+        try:
+            paths = MetricsRegistry.get_instance().dump(directory)
+        except OSError as e:
+            messagebox.showerror("Erro", f"Erro ao salvar métricas:\n{str(e)}")
+            return
+        messagebox.showinfo("Métricas salvas", "\n".join(paths))
     
     def _quit(self):
         """Fecha a aplicação."""
-        if messagebox.askyesno("Sair", "Deseja realmente sair?"):
+        question = "Deseja realmente sair?"
+        if self.export_queue.active_jobs():
+            question = "Há exportações em andamento que serão canceladas.\nDeseja realmente sair?"
+        if messagebox.askyesno("Sair", question):
+            self.habit_controller.model.detach(self)
+            self.export_queue.shutdown()
             self.root.quit()
     
     def run(self):
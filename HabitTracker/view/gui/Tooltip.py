@@ -0,0 +1,107 @@
+import tkinter as tk
+
+
+class TooltipManager:
+    """
+    Gerenciador único de tooltips da aplicação.
+    Reaproveita uma única Toplevel oculta (withdraw) em vez de criar e
+    destruir uma janela a cada passagem do mouse.
+    """
+
+    _instance = None
+
+    DELAY_MS = 500
+    OFFSET = 25
+
+    def __init__(self, root):
+        self.root = root
+        self._pending = None
+        self._current = None
+
+        self.window = tk.Toplevel(root)
+        self.window.withdraw()
+        self.window.wm_overrideredirect(True)
+
+        self.label = tk.Label(
+            self.window,
+            text="",
+            background="#2c3e50",
+            foreground="white",
+            relief='solid',
+            borderwidth=1,
+            font=('Arial', 8),
+            padx=5,
+            pady=3
+        )
+        self.label.pack()
+
+    @classmethod
+    def get_instance(cls, widget):
+        """Retorna a instância associada à raiz Tk do widget (recria se a raiz mudou)."""
+        root = widget._root()
+        instance = cls._instance
+        if instance is None or instance.root is not root or not instance._alive():
+            cls._instance = cls(root)
+        return cls._instance
+
+    def _alive(self):
+        """Verifica se a janela do tooltip ainda existe."""
+        try:
+            return bool(self.window.winfo_exists())
+        except tk.TclError:
+            return False
+
+    def register(self, widget, text):
+        """
+        Associa um texto de tooltip ao widget.
+        Usa add='+' para não sobrescrever outros bindings (ex.: efeito hover).
+        """
+        widget.bind('<Enter>', lambda e: self._schedule(widget, text), add='+')
+        widget.bind('<Leave>', lambda e: self.hide(), add='+')
+        widget.bind('<ButtonPress>', lambda e: self.hide(), add='+')
+        widget.bind('<Destroy>', lambda e: self._forget(widget), add='+')
+
+    def _schedule(self, widget, text):
+        """Agenda a exibição do tooltip após o atraso configurado."""
+        self._cancel()
+        self._current = widget
+        self._pending = self.root.after(self.DELAY_MS, lambda: self._show(widget, text))
+
+    def _show(self, widget, text):
+        """Posiciona e exibe a janela compartilhada."""
+        self._pending = None
+        try:
+            if not widget.winfo_exists():
+                return
+            x = widget.winfo_rootx() + self.OFFSET
+            y = widget.winfo_rooty() + self.OFFSET
+            self.label.config(text=text)
+            self.window.wm_geometry(f"+{x}+{y}")
+            self.window.deiconify()
+            self.window.lift()
+        except tk.TclError:
+            # Widget destruído entre o agendamento e a exibição
+            self.hide()
+
+    def _cancel(self):
+        """Cancela uma exibição pendente."""
+        if self._pending is not None:
+            try:
+                self.root.after_cancel(self._pending)
+            except tk.TclError:
+                pass
+            self._pending = None
+
+    def _forget(self, widget):
+        """Esconde o tooltip se o widget atual for destruído (ex.: refresh dos cards)."""
+        if self._current is widget:
+            self.hide()
+
+    def hide(self):
+        """Esconde o tooltip sem destruir a janela."""
+        self._cancel()
+        self._current = None
+        try:
+            self.window.withdraw()
+        except tk.TclError:
+            pass